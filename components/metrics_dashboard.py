@@ -40,6 +40,16 @@ def render_metrics_dashboard(metrics):
         color_name="blue-green",
     )
 
+    # Metrics skipped when the analysis ran out of time
+    if metrics.get("pending_metrics"):
+        st.info(
+            emoji_label(
+                "⏳",
+                f"{len(metrics['pending_metrics'])} métrica(s) pendente(s): o limite "
+                "de tempo do plano foi atingido antes de calculá-las.",
+            )
+        )
+
     # Calculate dimension scores
     dimension_scores = {}
     for dim_key, dim_metrics in metrics["dimensions"].items():
@@ -108,7 +118,11 @@ def render_metrics_dashboard(metrics):
             all_metrics = []
             for dim_key, dim_metrics in metrics["dimensions"].items():
                 for metric_key, metric_info in dim_metrics.items():
-                    if isinstance(metric_info, dict) and "score" in metric_info:
+                    if (
+                        isinstance(metric_info, dict)
+                        and "score" in metric_info
+                        and not metric_info.get("pending")
+                    ):
                         all_metrics.append(
                             {
                                 "dimension": dim_key,
@@ -355,7 +369,7 @@ def render_metrics_dashboard(metrics):
                 doc = st.session_state.analysis_results.get("doc")
                 if doc:
                     # Create and display text heat map
-                    text_heatmap = create_text_heatmap(doc, metrics)
+                    text_heatmap = create_text_heatmap(doc)
                     st.plotly_chart(text_heatmap, use_container_width=True)
 
                     # Add explanation
@@ -692,7 +706,12 @@ def render_dimension_metrics(dimension_key, dimension_metrics):
                 expected_range = metric_info.get("expected_range", (50, 80))
 
                 # Determine status
-                if score < expected_range[0]:
+                if metric_info.get("pending"):
+                    # Skipped by the time budget; the score is a placeholder
+                    status_icon = "⏳"
+                    status_text = "Pendente"
+                    status_color = "#97DDD4"
+                elif score < expected_range[0]:
                     status_icon = "⚠️"
                     status_text = "Abaixo do esperado"
                     status_color = "#ff7f7f"
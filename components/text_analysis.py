@@ -82,7 +82,9 @@ def render_text_input():
             "Profundidade da análise",
             options=["Básica", "Padrão", "Profunda"],
             value="Padrão",
-            help="A profundidade afeta o nível de detalhe da análise linguística.",
+            help="A profundidade afeta o nível de detalhe da análise linguística. "
+            "A análise básica dispensa o reconhecimento de entidades e é mais rápida.",
+            key="analysis_depth",
         )
 
     with col2:
@@ -91,6 +93,13 @@ def render_text_input():
             value=True,
             help="Compara os resultados com textos de referência no mesmo domínio e gênero.",
         )
+        _ = st.checkbox(
+            "Reanálise incremental",
+            value=True,
+            help="Ao reenviar um texto editado, reprocessa apenas os parágrafos "
+            "alterados.",
+            key="incremental_analysis",
+        )
 
     # Analysis button
     analyze_button = st.button(
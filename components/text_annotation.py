@@ -1,6 +1,13 @@
 import streamlit as st
 import pandas as pd
 from config import SEVERITY_LEVELS
+from utils.annotations import AnnotationBuilder
+from utils.doc_index import get_doc_index
+from utils.highlight import SEVERITY_COLORS, page_bounds
+from utils.lazy_results import PARAMETERS_KEY, memoized
+from utils.metrics import get_metric_evidence
+from utils.profiling import profiled
+from utils.recommendations import get_recommendations
 from utils.visualization import highlight_text
 
 
@@ -39,32 +46,41 @@ def render_text_annotation(text, analysis_results):
             help="Selecione dimensões específicas para filtrar as anotações",
         )
 
-    # Generate annotations from analysis results
-    annotations = generate_annotations(text, analysis_results)
+    # Generate annotations from analysis results on the first view
+    annotations = get_annotations(text, analysis_results)
 
     # Filter annotations based on user selection
-    filtered_annotations = []
-    for ann in annotations:
-        severity = ann.get("severity", "low")
-        severity_name = SEVERITY_LEVELS.get(severity, SEVERITY_LEVELS["low"])["name"]
-
-        dimension = ann.get("dimension", "")
-
-        # Apply filters
-        if severity_name not in highlight_options:
-            continue
-
-        if dimension_filter and dimension not in dimension_filter:
-            continue
-
-        filtered_annotations.append(ann)
+    filtered_annotations = annotations.filter(
+        severities=[
+            severity
+            for severity, level in SEVERITY_LEVELS.items()
+            if level["name"] in highlight_options
+        ],
+        dimensions=dimension_filter,
+    )
 
     # Display the annotated text
     st.markdown("### Texto com Anotações")
 
-    if filtered_annotations:
-        # Highlight text with annotations
-        highlighted_text = highlight_text(text, filtered_annotations)
+    # Long texts are rendered one page at a time
+    pages = page_bounds(text)
+    page_start, page_end = pages[0]
+    if len(pages) > 1:
+        page = st.number_input(
+            "Página do texto",
+            min_value=1,
+            max_value=len(pages),
+            value=1,
+            help="Textos longos são exibidos em páginas",
+        )
+        page_start, page_end = pages[int(page) - 1]
+        st.caption(f"Caracteres {page_start + 1}–{page_end} de {len(text)}")
+
+    if len(filtered_annotations):
+        # Highlight the page with annotations
+        highlighted_text = highlight_text(
+            text, filtered_annotations, page_start, page_end
+        )
 
         # Display highlighted text
         st.markdown(
@@ -95,12 +111,13 @@ def render_text_annotation(text, analysis_results):
                 unsafe_allow_html=True,
             )
 
-        # Display annotation details in a table
+        # Display the details of the annotations on the page in a table
         st.markdown("### Detalhes das Anotações")
 
         # Create DataFrame for annotations
         ann_data = []
-        for i, ann in enumerate(filtered_annotations):
+        page_annotations = filtered_annotations.between(page_start, page_end)
+        for i, ann in enumerate(page_annotations.to_dicts()):
             severity = ann.get("severity", "low")
             severity_name = SEVERITY_LEVELS.get(severity, SEVERITY_LEVELS["low"])[
                 "name"
@@ -125,33 +142,74 @@ def render_text_annotation(text, analysis_results):
             st.info("Nenhuma anotação corresponde aos filtros selecionados.")
     else:
         st.info("Nenhuma anotação encontrada com os filtros selecionados.")
-        # Display the plain text
+        # Display the plain text of the page
+        plain_text = highlight_text(text, [], page_start, page_end)
         st.markdown(
-            f'<div style="padding: 1rem; border-radius: 0.5rem; border: 1px solid #ccc; background-color: white; font-size: 1rem; line-height: 1.5; white-space: pre-wrap;">{text}</div>',
+            f'<div style="padding: 1rem; border-radius: 0.5rem; border: 1px solid #ccc; background-color: white; font-size: 1rem; line-height: 1.5; white-space: pre-wrap;">{plain_text}</div>',
             unsafe_allow_html=True,
         )
 
 
+def get_annotations(text, analysis_results):
+    """
+    Return the annotations of an analysis, generating them on first use.
+
+    They are memoized in ``analysis_results`` for its analysis id, so
+    reruns of the annotations tab (e.g. when a filter changes) reuse them.
+
+    Args:
+        text (str): The original text
+        analysis_results (dict): The analysis results
+
+    Returns:
+        AnnotationTable: Annotations sorted by position
+    """
+    return memoized(
+        analysis_results,
+        "annotations",
+        lambda: generate_annotations(text, analysis_results),
+    )
+
+
+@profiled("annotations")
 def generate_annotations(text, analysis_results):
     """
     Generate text annotations from analysis results.
 
+    Problem spans come from the evidence recorded by the metrics and the
+    offsets of the document index (see ``utils.doc_index``), so the Doc
+    is not walked again; a metric with no specific annotation gets one
+    on the first paragraph.
+
     Args:
         text (str): The original text
         analysis_results (dict): The analysis results
 
     Returns:
-        list: List of annotation dictionaries
+        AnnotationTable: Annotations sorted by position
     """
-    annotations = []
+    annotations = AnnotationBuilder()
 
     # Check if we have a proper doc object to work with
     if "doc" not in analysis_results:
-        return annotations
+        return annotations.build()
 
     doc = analysis_results["doc"]
     metrics = analysis_results.get("metrics", {})
-    recommendations = analysis_results.get("recommendations", [])
+    parameters = analysis_results.get(PARAMETERS_KEY, {})
+    recommendations = analysis_results.get("recommendations")
+    if recommendations is None:
+        recommendations = get_recommendations(analysis_results)
+
+    index = get_doc_index(doc)
+    first_paragraph = index.paragraph_spans[0] if index.paragraph_spans else None
+
+    # Recommendations with affected segments, by (dimension, metric)
+    recommended_segments = {
+        (rec.get("dimension"), rec.get("metric"))
+        for rec in recommendations
+        if rec.get("affected_segments")
+    }
 
     # Helper to map dimension keys to names
     dimension_map = {
@@ -180,120 +238,79 @@ def generate_annotations(text, analysis_results):
 
             if score < expected_range[0]:
                 # This metric needs improvement
-                # Find the relevant segments based on recommendations
-                related_recs = [
-                    r
-                    for r in recommendations
-                    if r.get("dimension") == dim_key and r.get("metric") == metric_key
-                ]
-
-                # Get affected segments from recommendations
-                segments = []
-                for rec in related_recs:
-                    segments.extend(rec.get("affected_segments", []))
-
-                # If no specific segments, try to find issues in the text
-                if not segments:
-                    # Add annotations based on the specific metric type
-                    if dim_key == "coesao" and metric_key == "referencial":
-                        # Look for potential referential issues
-                        for sent_idx, sent in enumerate(doc.sents):
-                            for token in sent:
-                                if token.pos_ in ("PRON", "DET") and token.dep_ not in (
-                                    "ROOT"
-                                ):
-                                    potential_referents = [
-                                        t
-                                        for t in token.ancestors
-                                        if t.pos_ in ("NOUN", "PROPN")
-                                    ]
-                                    if not potential_referents:
-                                        # Add annotation for possible ambiguous reference
-                                        annotations.append(
-                                            {
-                                                "span_start": token.idx,
-                                                "span_end": token.idx + len(token.text),
-                                                "severity": get_severity_level(score),
-                                                "dimension": dimension_name,
-                                                "metric": metric_info.get(
-                                                    "name", metric_key
-                                                ),
-                                                "issue_type": "Referência ambígua",
-                                                "description": "Possível referência ambígua ou vaga sem antecedente claro.",
-                                            }
-                                        )
-
-                    elif dim_key == "coerencia" and metric_key == "continuidade":
-                        # Look for potential topic discontinuities
-                        sentences = list(doc.sents)
-                        for i in range(len(sentences) - 1):
-                            # Simplified check for semantic similarity
-                            if (
-                                sentences[i].vector.dot(sentences[i + 1].vector)
-                                / (
-                                    sentences[i].vector_norm
-                                    * sentences[i + 1].vector_norm
-                                )
-                                < 0.3
-                            ):
-                                # Add annotation for potential topic shift
-                                annotations.append(
-                                    {
-                                        "span_start": sentences[i + 1].start_char,
-                                        "span_end": sentences[i + 1].end_char,
-                                        "severity": get_severity_level(score),
-                                        "dimension": dimension_name,
-                                        "metric": metric_info.get("name", metric_key),
-                                        "issue_type": "Descontinuidade tópica",
-                                        "description": "Possível mudança abrupta de tópico sem transição adequada.",
-                                    }
-                                )
-
-                    elif dim_key == "precisao" and metric_key == "estrutural":
-                        # Look for complex sentence structures
-                        for sent_idx, sent in enumerate(doc.sents):
-                            # Simplified check for syntactic complexity
-                            tokens = [
-                                t for t in sent if not t.is_punct and not t.is_space
-                            ]
-                            verbs = [t for t in sent if t.pos_ == "VERB"]
-
-                            if len(tokens) > 25 and len(verbs) > 3:
-                                # Add annotation for complex sentence
-                                annotations.append(
-                                    {
-                                        "span_start": sent.start_char,
-                                        "span_end": sent.end_char,
-                                        "severity": get_severity_level(score),
-                                        "dimension": dimension_name,
-                                        "metric": metric_info.get("name", metric_key),
-                                        "issue_type": "Estrutura complexa",
-                                        "description": "Sentença com estrutura sintática complexa que pode dificultar a compreensão.",
-                                    }
-                                )
-
-                # If we still don't have annotations for this metric, add a general one
-                if not any(
-                    a["metric"] == metric_info.get("name", metric_key)
-                    for a in annotations
-                ):
-                    # Find first paragraph
-                    paragraphs = [p for p in text.split("\n") if p.strip()]
-                    if paragraphs:
-                        first_para = paragraphs[0]
-                        annotations.append(
-                            {
-                                "span_start": text.find(first_para),
-                                "span_end": text.find(first_para) + len(first_para),
-                                "severity": get_severity_level(score),
-                                "dimension": dimension_name,
-                                "metric": metric_info.get("name", metric_key),
-                                "issue_type": f"{metric_info.get('name', metric_key)} abaixo do esperado",
-                                "description": f"A pontuação em {metric_info.get('name', metric_key)} está abaixo do esperado para o gênero e domínio.",
-                            }
+                key = (dim_key, metric_key)
+                severity = get_severity_level(score)
+                metric_name = metric_info.get("name", metric_key)
+
+                # If no recommendation points at specific segments, locate
+                # the issues from the metric's evidence
+                if key not in recommended_segments and key in _EVIDENCE_ANNOTATIONS:
+                    evidence = metric_info.get("evidence")
+                    if evidence is None:
+                        evidence = get_metric_evidence(
+                            doc,
+                            key,
+                            domain=parameters.get("domain", "Acadêmico"),
+                            genre=parameters.get("genre", "Artigo Científico"),
+                            audience=parameters.get("audience", "Acadêmico"),
+                        )
+                    issue_type, description, locate = _EVIDENCE_ANNOTATIONS[key]
+                    starts, ends = locate(doc, index, evidence)
+                    if len(starts):
+                        code = annotations.issue(
+                            dimension_name, metric_name, issue_type, description
                         )
+                        annotations.add(starts, ends, severity, code)
 
-    return annotations
+                # If we still don't have annotations for this metric, add a general one
+                if not annotations.has_metric(metric_name) and first_paragraph:
+                    code = annotations.issue(
+                        dimension_name,
+                        metric_name,
+                        f"{metric_name} abaixo do esperado",
+                        f"A pontuação em {metric_name} está abaixo do esperado para o gênero e domínio.",
+                    )
+                    annotations.add(*first_paragraph, severity, code)
+
+    return annotations.build()
+
+
+def _reference_spans(doc, index, evidence):
+    """Spans of the references without a clear antecedent."""
+    spans = [index.token_span(i) for i in evidence.get("token_ids", [])]
+    return [start for start, _ in spans], [end for _, end in spans]
+
+
+def _topic_shift_spans(doc, index, evidence):
+    """Spans of the sentences that shift topic from the previous one."""
+    spans = [index.sent_spans[i + 1] for i in evidence.get("topic_shifts", [])]
+    return [start for start, _ in spans], [end for _, end in spans]
+
+
+def _complex_sentence_spans(doc, index, evidence):
+    """Spans of the sentences with more than 25 words and 3 verbs."""
+    spans = [index.sent_spans[i] for i in evidence.get("long_sentences", [])]
+    return [start for start, _ in spans], [end for _, end in spans]
+
+
+# Metrics annotated span by span: issue type, description, span locator
+_EVIDENCE_ANNOTATIONS = {
+    ("coesao", "referencial"): (
+        "Referência ambígua",
+        "Possível referência ambígua ou vaga sem antecedente claro.",
+        _reference_spans,
+    ),
+    ("coerencia", "continuidade"): (
+        "Descontinuidade tópica",
+        "Possível mudança abrupta de tópico sem transição adequada.",
+        _topic_shift_spans,
+    ),
+    ("precisao", "estrutural"): (
+        "Estrutura complexa",
+        "Sentença com estrutura sintática complexa que pode dificultar a compreensão.",
+        _complex_sentence_spans,
+    ),
+}
 
 
 def get_severity_level(score):
@@ -324,10 +341,5 @@ def get_severity_color(severity):
     Returns:
         str: Color code
     """
-    severity_colors = {
-        "high": "#b91c1c",  # Dark red for better contrast
-        "medium": "#b45309",  # Dark orange for better contrast
-        "low": "#047857",  # Dark green for better contrast
-    }
-
-    return severity_colors.get(severity, "#f3f4f6")
+    # Same colours as the highlighted text (see ``utils.highlight``)
+    return SEVERITY_COLORS.get(severity, "#f3f4f6")
@@ -82,6 +82,11 @@ AUDIENCE_LEVELS = [
 # Character limits per subscription plan
 PLANS = {"free": 5000, "pro": 50000, "enterprise": 200000}
 
+# Latency budget (seconds) for scoring and recommendations per plan; metrics
+# that do not fit are reported as pending, and recommendations get what the
+# metrics leave
+PLAN_TIME_BUDGETS = {"free": 10.0, "pro": 30.0, "enterprise": 120.0}
+
 # Metric dimensions - Versão expandida conforme as 8 dimensões especificadas
 METRIC_DIMENSIONS = {
     "macro_estrutura": {
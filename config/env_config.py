@@ -13,6 +13,14 @@ class ProductionNLPConfig:
     redis_url: str = os.getenv("REDIS_URL", "redis://localhost:6379")
     redis_ssl: bool = os.getenv("REDIS_SSL", "false").lower() == "true"
     redis_password: Optional[str] = os.getenv("REDIS_PASSWORD")
+    doc_cache_size: int = int(os.getenv("DOC_CACHE_SIZE", "16"))
+    doc_cache_dir: Optional[str] = os.getenv("DOC_CACHE_DIR", "data/doc_cache")
+    doc_cache_max_mb: int = int(os.getenv("DOC_CACHE_MAX_MB", "512"))
+    paragraph_cache_size: int = int(os.getenv("PARAGRAPH_CACHE_SIZE", "4096"))
+    chunk_chars: int = int(os.getenv("CHUNK_CHARS", "20000"))
+    chunk_memory_mb: int = int(os.getenv("CHUNK_MEMORY_MB", "512"))
+    profile_memory: bool = os.getenv("PROFILE_MEMORY", "false").lower() == "true"
+    profile_trace_dir: Optional[str] = os.getenv("PROFILE_TRACE_DIR")
 
     def __post_init__(self) -> None:
         if self.redis_ssl and not self.redis_password:
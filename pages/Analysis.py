@@ -6,13 +6,16 @@ import plotly.express as px
 from pathlib import Path
 import base64
 
-from config import APP_TITLE, PLANS
+from config import APP_TITLE, PLANS, PLAN_TIME_BUDGETS
 from database import SessionLocal, init_db
 from models.text import Text, save_text
 from models.user import User as DBUser
+from config.env_config import ProductionNLPConfig
 from utils.processing import process_text, ensure_nltk_data
-from utils.metrics import calculate_metrics
-from utils.recommendations import generate_recommendations
+from utils.profiling import Profiler, save_chrome_trace
+from utils.lazy_results import ANALYSIS_ID_KEY, PARAMETERS_KEY, make_analysis_id
+from utils.metrics import calculate_metrics, get_required_annotations
+from utils.recommendations import get_recommendations
 from utils.user import User as GuestUser
 from components.auth import render_auth
 from components.sidebar import render_sidebar
@@ -189,11 +192,13 @@ def _persist_text(content: str, language: str, domain: str) -> None:
 init_db()
 ensure_nltk_data()
 
+# Profiling options (PROFILE_MEMORY, PROFILE_TRACE_DIR)
+_env_config = ProductionNLPConfig()
+
 # Initialize session state
 st.session_state.setdefault("analyzed_text", None)
 st.session_state.setdefault("analysis_results", None)
 st.session_state.setdefault("metrics", None)
-st.session_state.setdefault("recommendations", None)
 st.session_state.setdefault("active_tab", "text_input")
 st.session_state.setdefault("user", GuestUser())
 
@@ -243,39 +248,63 @@ with tabs[0]:
             st.warning("⚠️ Limite de caracteres do plano atingido.")
         else:
             with st.spinner("🔍 Processando análise linguística..."):
-                # NLP processing
-                doc = process_text(text, language)
+                profiler = Profiler(trace_memory=_env_config.profile_memory)
+                with profiler:
+                    # NLP processing
+                    # The basic depth skips NER for a faster parse
+                    fast = st.session_state.get("analysis_depth") == "Básica"
+                    doc = process_text(
+                        text,
+                        language,
+                        annotations=get_required_annotations(fast=fast),
+                        incremental=st.session_state.get("incremental_analysis", True),
+                    )
                 
-                # Update user quota
-                user.char_usage += char_count
-                if isinstance(user, DBUser):
-                    _persist_user(user)
+                    # Update user quota
+                    user.char_usage += char_count
+                    if isinstance(user, DBUser):
+                        _persist_user(user)
                 
-                # Calculate metrics
-                t0 = time.perf_counter()
-                metrics = calculate_metrics(
-                    doc, domain=domain, genre=genre or "Acadêmico", audience=audience
-                )
-                metrics_time = time.perf_counter() - t0
+                    # Calculate metrics within the plan's latency budget
+                    budget = PLAN_TIME_BUDGETS.get(getattr(user, "plan", "free"))
+                    t0 = time.perf_counter()
+                    metrics = calculate_metrics(
+                        doc,
+                        domain=domain,
+                        genre=genre or "Acadêmico",
+                        audience=audience,
+                        time_budget=budget,
+                    )
+                    metrics_time = time.perf_counter() - t0
                 
-                # Generate recommendations
-                t0 = time.perf_counter()
-                recommendations = generate_recommendations(
-                    doc, metrics, domain=domain, genre=genre or "Acadêmico"
+                # Recommendations and annotations are generated when their tabs
+                # are rendered, after the metrics tab (see utils.lazy_results);
+                # recommendations get what is left of the plan's time budget
+                parameters = {
+                    "language": language,
+                    "domain": domain,
+                    "genre": genre or "Acadêmico",
+                    "audience": audience,
+                    "fast": fast,
+                }
+                analysis_id = make_analysis_id(text, **parameters)
+                parameters["time_budget"] = (
+                    None if budget is None else max(0.0, budget - metrics_time)
                 )
-                rec_time = time.perf_counter() - t0
+                
+                # Optional Chrome-trace dump
+                save_chrome_trace(profiler, _env_config.profile_trace_dir)
                 
                 # Store results
                 st.session_state.update({
                     "analyzed_text": text,
                     "analysis_results": {
+                        ANALYSIS_ID_KEY: analysis_id,
+                        PARAMETERS_KEY: parameters,
                         "doc": doc,
                         "metrics": metrics,
-                        "recommendations": recommendations,
-                        "processing_time": {
-                            "metrics": metrics_time,
-                            "recommendations": rec_time,
-                        },
+                        "processing_time": {"metrics": metrics_time},
+                        "profile": profiler.summary(),
                     },
                 })
                 
@@ -409,9 +438,9 @@ with tabs[2]:
 # Tab 4: Recommendations
 with tabs[3]:
     st.session_state.active_tab = "recommendations"
-    if st.session_state.recommendations:
+    if st.session_state.analysis_results:
         st.markdown("### 💡 Recomendações de Melhoria")
-        render_recommendations(st.session_state.recommendations)
+        render_recommendations(get_recommendations(st.session_state.analysis_results))
     else:
         st.info("📄 Realize uma análise na aba 'Entrada de Texto' para gerar recomendações.")
 
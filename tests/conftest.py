@@ -0,0 +1,60 @@
+import importlib
+import importlib.util
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+root = Path(__file__).resolve().parents[1]
+if str(root) not in sys.path:
+    sys.path.insert(0, str(root))
+
+
+def _utils_modules():
+    return {name for name in sys.modules if name.split(".")[0] == "utils"}
+
+
+@pytest.fixture(autouse=True)
+def isolate_utils_modules():
+    """
+    Forget the ``utils`` modules first imported by a test.
+
+    Several tests stub heavy dependencies (numpy, spacy, ...) in
+    ``sys.modules`` before importing the module under test; the imported
+    modules keep references to the stubs, so they must not be served to
+    later tests.
+    """
+    before = _utils_modules()
+    yield
+    for name in _utils_modules() - before:
+        del sys.modules[name]
+
+
+@pytest.fixture
+def processing(monkeypatch):
+    """``utils.processing`` with a blank Portuguese pipeline and fresh caches."""
+    spacy = pytest.importorskip("spacy")
+    fake_st = types.ModuleType("streamlit")
+    fake_st.warning = lambda *args, **kwargs: None
+    monkeypatch.setitem(sys.modules, "streamlit", fake_st)
+
+    # ``config.py`` shadows the ``config/`` directory; register its module
+    spec = importlib.util.spec_from_file_location(
+        "config.env_config", root / "config" / "env_config.py"
+    )
+    env_config = importlib.util.module_from_spec(spec)
+    monkeypatch.setitem(sys.modules, "config.env_config", env_config)
+    spec.loader.exec_module(env_config)
+    monkeypatch.setattr(
+        importlib.import_module("config"), "env_config", env_config, raising=False
+    )
+
+    monkeypatch.delitem(sys.modules, "utils.processing", raising=False)
+    module = importlib.import_module("utils.processing")
+
+    nlp = spacy.blank("pt")
+    nlp.add_pipe("sentencizer")
+    monkeypatch.setitem(module._nlp_models, "pt", nlp)
+    monkeypatch.setattr(module, "_doc_cache", module.DocCache(max_entries=8))
+    return module
@@ -0,0 +1,94 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+root = Path(__file__).resolve().parents[1]
+if str(root) not in sys.path:
+    sys.path.insert(0, str(root))
+
+spacy = pytest.importorskip("spacy")
+pd = pytest.importorskip("pandas")
+pytest.importorskip("sklearn")
+
+from utils.academic_metrics import (  # noqa: E402
+    CORPUS_COLUMNS,
+    DIMENSION_DETAILS,
+    AcademicMetricsCalculator,
+)
+
+
+@pytest.fixture
+def calculator(monkeypatch):
+    calculator = AcademicMetricsCalculator()
+    nlp = spacy.blank("pt")
+    monkeypatch.setattr(calculator, "_nlp", nlp)
+    monkeypatch.setattr(calculator, "_nlp_loaded", True)
+
+    def fake_all_dimensions(text, domain="academic", level="graduacao", doc=None):
+        assert doc is not None and doc.text == text
+        if not text:
+            return calculator._empty_results()
+        score = len(doc) / 10
+        return {
+            "coesao_coerencia": {
+                "score": score,
+                "details": {"densidade_conectores": len(doc), "lista": [1, 2]},
+            },
+            "overall_score": {"score": score, "performance_level": "intermediário"},
+        }
+
+    monkeypatch.setattr(calculator, "calculate_all_dimensions", fake_all_dimensions)
+    return calculator
+
+
+TEXTS = ["Um texto curto.", "", "Outro texto um pouco mais longo."]
+
+
+def test_corpus_table_has_one_row_per_text(calculator):
+    table = calculator.calculate_corpus(TEXTS, batch_size=2)
+
+    assert table["index"].tolist() == [0, 1, 2]
+    assert table["coesao_coerencia"].tolist() == pytest.approx([0.4, 0.05, 0.7])
+    assert table["coesao_coerencia.densidade_conectores"].iloc[2] == 7
+    # Non-scalar details are not turned into columns
+    assert "coesao_coerencia.lista" not in table.columns
+    assert table["performance_level"].iloc[0] == "intermediário"
+
+
+def test_corpus_streams_to_csv(calculator, tmp_path):
+    path = tmp_path / "corpus.csv"
+    # The first batch (the empty text) reports no details at all
+    texts = [TEXTS[1], TEXTS[0], TEXTS[2]]
+    result = calculator.calculate_corpus(texts, batch_size=1, output_path=str(path))
+    assert result == str(path)
+
+    table = pd.read_csv(path)
+    assert table["index"].tolist() == [0, 1, 2]
+    # The header is the declared schema, not the columns of the first batch
+    assert table.columns.tolist() == CORPUS_COLUMNS
+    assert table["coesao_coerencia.densidade_conectores"].dropna().tolist() == [4, 7]
+
+
+def test_corpus_columns_cover_every_dimension(calculator):
+    dimensions = set(calculator._empty_results()) - {"overall_score"}
+    assert set(DIMENSION_DETAILS) == dimensions
+    assert calculator.calculate_corpus([]).columns.tolist() == CORPUS_COLUMNS
+
+
+def test_fallback_markers_use_whole_words():
+    from utils.text_view import TextView
+
+    calculator = AcademicMetricsCalculator()
+    view = TextView.build(
+        "Este estudo mostra que isso funciona.\n\n"
+        "Contudo, a amostra é pequena. Contudo, ela basta.\n\n"
+        "Os dados assimilados confirmam o modelo."
+    )
+
+    assert calculator._detect_introduction(view)
+    # "assimilados" is not the conclusion marker "assim"
+    assert not calculator._detect_conclusion(view)
+    assert calculator._count_argumentative_markers(view) == 2
+    assert calculator._calculate_connector_density(view) == pytest.approx(10.0)
+    assert calculator._calculate_referential_cohesion(view, None) == pytest.approx(2 / 20)
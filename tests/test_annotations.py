@@ -0,0 +1,45 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from utils import annotations  # noqa: E402
+
+
+def test_builder_sorts_and_deduplicates():
+    builder = annotations.AnnotationBuilder()
+    ref = builder.issue("Coesão", "Referencial", "Referência ambígua", "...")
+    general = builder.issue("Precisão", "Clareza", "Clareza abaixo", "...")
+    assert builder.issue("Coesão", "Referencial", "Referência ambígua", "...") == ref
+
+    builder.add([30, 4, 4], [34, 7, 7], "high", ref)
+    builder.add(0, 50, "low", general)
+
+    assert builder.has_metric("Referencial")
+    assert not builder.has_metric("Lexical")
+
+    table = builder.build()
+    assert table.records.tolist() == [(0, 50, 0, 1), (4, 7, 2, 0), (30, 34, 2, 0)]
+    assert table.to_dicts()[1] == {
+        "span_start": 4,
+        "span_end": 7,
+        "severity": "high",
+        "dimension": "Coesão",
+        "metric": "Referencial",
+        "issue_type": "Referência ambígua",
+        "description": "...",
+    }
+
+
+def test_table_filters_by_severity_and_dimension():
+    builder = annotations.AnnotationBuilder()
+    ref = builder.issue("Coesão", "Referencial", "Referência ambígua", "...")
+    general = builder.issue("Precisão", "Clareza", "Clareza abaixo", "...")
+    builder.add(np.arange(0, 3000, 3), np.arange(2, 3002, 3), "high", ref)
+    builder.add(0, 50, "low", general)
+    table = builder.build()
+
+    assert len(table) == 1001
+    assert len(table.filter(severities=["high"])) == 1000
+    assert len(table.filter(dimensions=["Precisão"])) == 1
+    assert len(table.filter(severities=["medium"], dimensions=[])) == 0
+    assert len(annotations.AnnotationBuilder().build()) == 0
@@ -0,0 +1,57 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+root = Path(__file__).resolve().parents[1]
+if str(root) not in sys.path:
+    sys.path.insert(0, str(root))
+
+spacy = pytest.importorskip("spacy")
+
+from utils.chunking import (  # noqa: E402
+    parse_in_chunks,
+    split_into_chunks,
+    split_into_paragraphs,
+)
+
+TEXT = (
+    "A pesquisa analisa textos longos.\n"
+    "O segundo parágrafo continua o tema. Ele tem duas frases.\n\n"
+    "Um parágrafo final bem mais comprido que os outros, sem quebra alguma "
+    "e com muitas palavras seguidas.\n"
+)
+
+
+@pytest.mark.parametrize("max_chars", [1, 10, 40, 1000])
+def test_chunks_concatenate_to_text(max_chars):
+    chunks = split_into_chunks(TEXT, max_chars)
+    assert "".join(chunks) == TEXT
+    assert all(chunks)
+
+
+def test_chunks_follow_paragraph_boundaries():
+    chunks = split_into_chunks(TEXT, 60)
+    assert chunks[0] == "A pesquisa analisa textos longos."
+    assert chunks[1].startswith("\nO segundo parágrafo")
+
+
+def test_parse_in_chunks_preserves_offsets():
+    nlp = spacy.blank("pt")
+    nlp.add_pipe("sentencizer")
+    doc = parse_in_chunks(nlp, TEXT, chunk_chars=40, memory_mb=1)
+    reference = nlp(TEXT)
+
+    assert doc.text == TEXT
+    assert [(t.idx, t.text) for t in doc] == [(t.idx, t.text) for t in reference]
+    for sent in doc.sents:
+        assert TEXT[sent.start_char : sent.end_char] == sent.text
+
+
+def test_paragraph_segments_skip_blank_lines():
+    segments = split_into_paragraphs(TEXT)
+    assert "".join(segments) == TEXT
+    assert len(segments) == 3
+    assert segments[2].startswith("\n\nUm parágrafo final")
+    assert split_into_paragraphs("") == [""]
+    assert split_into_paragraphs("\n\nA.\n\n") == ["\n\nA.\n\n"]
@@ -0,0 +1,73 @@
+import importlib
+import multiprocessing
+import os
+import sys
+
+import pytest
+
+# Pipeline loads recorded by the stubbed ``get_nlp_model`` (per process)
+LOADED = []
+
+
+@pytest.fixture
+def corpus(processing, monkeypatch):
+    monkeypatch.delitem(sys.modules, "utils.corpus", raising=False)
+    module = importlib.import_module("utils.corpus")
+    calls = {"annotations": [], "metrics": []}
+
+    def fake_process_texts(texts, language, batch_size, annotations):
+        calls["annotations"].append(annotations)
+        for text in texts:
+            yield {"text": text, "pid": os.getpid(), "loads": len(LOADED)}
+
+    def fake_calculate_metrics(doc, domain, genre, audience, metrics):
+        calls["metrics"].append(metrics)
+        return {"dimensions": {"coesao": 1.0}, "doc": doc}
+
+    monkeypatch.setattr(module, "get_nlp_model", LOADED.append)
+    monkeypatch.setattr(module, "process_texts", fake_process_texts)
+    monkeypatch.setattr(module, "calculate_metrics", fake_calculate_metrics)
+    monkeypatch.setattr(
+        module,
+        "generate_recommendations",
+        lambda doc, metrics, domain, genre, audience: [doc["text"]],
+    )
+    module.calls = calls
+    return module
+
+
+TEXTS = [f"Texto {i}." for i in range(7)]
+
+
+def test_results_keep_input_order_across_batches(corpus):
+    results = list(corpus.analyze_corpus(TEXTS, batch_size=3))
+
+    assert [r["index"] for r in results] == list(range(7))
+    assert [r["metrics"]["doc"]["text"] for r in results] == TEXTS
+    assert [r["recommendations"] for r in results] == [[t] for t in TEXTS]
+    assert len(corpus.calls["annotations"]) == 3
+
+
+@pytest.mark.skipif(
+    multiprocessing.get_start_method() != "fork",
+    reason="stubs reach the workers only through fork",
+)
+def test_worker_processes_load_pipeline_once(corpus):
+    results = list(corpus.analyze_corpus(TEXTS, batch_size=2, n_process=2))
+
+    assert [r["metrics"]["doc"]["text"] for r in results] == TEXTS
+    docs = [r["metrics"]["doc"] for r in results]
+    assert all(doc["pid"] != os.getpid() for doc in docs)
+    # The initializer loaded the pipeline exactly once in every worker
+    assert all(doc["loads"] == 1 for doc in docs)
+
+
+def test_selected_metrics_reach_parse_and_scoring(corpus):
+    metrics = importlib.import_module("utils.metrics")
+    selected = metrics.select_metrics(["coesao"])
+
+    results = list(corpus.analyze_corpus(TEXTS[:2], dimensions=["coesao"]))
+
+    assert len(results) == 2
+    assert corpus.calls["metrics"] == [selected, selected]
+    assert corpus.calls["annotations"] == [metrics.get_required_annotations(selected)]
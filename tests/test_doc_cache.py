@@ -0,0 +1,59 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+root = Path(__file__).resolve().parents[1]
+if str(root) not in sys.path:
+    sys.path.insert(0, str(root))
+
+spacy = pytest.importorskip("spacy")
+
+from utils.doc_cache import DocCache  # noqa: E402
+
+
+@pytest.fixture
+def nlp():
+    return spacy.blank("pt")
+
+
+def test_make_key_depends_on_text_and_model(nlp):
+    key = DocCache.make_key("Um texto.", "pt", nlp)
+    assert key == DocCache.make_key("Um texto.", "pt", nlp)
+    assert key != DocCache.make_key("Outro texto.", "pt", nlp)
+    assert key != DocCache.make_key("Um texto.", "pt", nlp, ["parser"])
+    assert key != DocCache.make_key("Um texto.", "pt", nlp, mode="incremental")
+
+
+def test_lru_spills_to_disk_and_restores(tmp_path, nlp):
+    cache = DocCache(max_entries=1, cache_dir=tmp_path)
+    first, second = nlp("Primeiro texto."), nlp("Segundo texto.")
+
+    cache.put("a", first)
+    cache.put("b", second)
+
+    assert (tmp_path / "a.spacy").exists()
+    assert cache.get("b", nlp.vocab) is second
+
+    restored = cache.get("a", nlp.vocab)
+    assert restored is not None
+    assert restored.text == "Primeiro texto."
+
+
+def test_disk_store_is_capped(tmp_path, nlp):
+    cache = DocCache(max_entries=1, cache_dir=tmp_path, max_disk_bytes=0)
+    cache.put("a", nlp("Primeiro texto."))
+    cache.put("b", nlp("Segundo texto."))
+
+    assert not list(tmp_path.glob("*.spacy"))
+    assert cache.get("a", nlp.vocab) is None
+
+
+def test_corrupt_spill_file_is_a_miss(tmp_path, nlp):
+    cache = DocCache(max_entries=1, cache_dir=tmp_path)
+    cache.put("a", nlp("Primeiro texto."))
+    cache.put("b", nlp("Segundo texto."))
+    (tmp_path / "a.spacy").write_bytes(b"\x00 not a DocBin")
+
+    assert cache.get("a", nlp.vocab) is None
+    assert not (tmp_path / "a.spacy").exists()
@@ -0,0 +1,59 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+root = Path(__file__).resolve().parents[1]
+if str(root) not in sys.path:
+    sys.path.insert(0, str(root))
+
+from utils.doc_index import (  # noqa: E402
+    assign_sentences,
+    build_doc_index,
+    find_paragraph_spans,
+)
+
+
+def test_find_paragraph_spans_skips_blank_lines():
+    text = "Primeiro.\n\n  \nSegundo.\nTerceiro."
+    spans = find_paragraph_spans(text)
+    assert [text[s:e] for s, e in spans] == ["Primeiro.", "Segundo.", "Terceiro."]
+
+
+def test_assign_sentences_by_offset():
+    paragraphs = [(0, 10), (12, 30)]
+    sentences = [(0, 5), (6, 11), (11, 12), (12, 20), (21, 30)]
+    assert assign_sentences(paragraphs, sentences) == [0, 0, -1, 1, 1]
+
+
+def test_repeated_sentences_keep_their_paragraph():
+    spacy = pytest.importorskip("spacy")
+    nlp = spacy.blank("pt")
+    nlp.add_pipe("sentencizer")
+    doc = nlp("Sim. Depois.\nSim.\nOutro. Sim.")
+
+    index = build_doc_index(doc)
+
+    assert index.n_paragraphs == 3
+    texts = {
+        p: [index.sentences[s].text.strip() for s in index.sentences_of(p)]
+        for p in range(index.n_paragraphs)
+    }
+    assert texts == {0: ["Sim.", "Depois."], 1: ["Sim."], 2: ["Outro.", "Sim."]}
+    for sent_idx in index.sentences_of(2):
+        assert index.paragraph_of(sent_idx) == 2
+
+
+def test_token_spans():
+    spacy = pytest.importorskip("spacy")
+    nlp = spacy.blank("pt")
+    nlp.add_pipe("sentencizer")
+    doc = nlp("Sim. Depois disso.\nOutro.")
+
+    index = build_doc_index(doc)
+
+    assert [index.token_span(t.i) for t in doc] == [
+        (t.idx, t.idx + len(t.text)) for t in doc
+    ]
+    start, end = index.token_span(3)
+    assert doc.text[start:end] == "disso"
@@ -0,0 +1,48 @@
+import pytest
+
+spacy = pytest.importorskip("spacy")
+np = pytest.importorskip("numpy")
+
+from utils import embeddings  # noqa: E402
+
+
+def _doc(vectors=True):
+    from spacy.tokens import Doc
+
+    nlp = spacy.blank("pt")
+    if vectors:
+        nlp.vocab.vectors.resize((4, 2))
+        nlp.vocab.set_vector("gato", np.array([1.0, 0.0], dtype="float32"))
+        nlp.vocab.set_vector("cão", np.array([0.0, 1.0], dtype="float32"))
+    words = ["gato", "gato", ".", "cão", "xyz", ".", "xyz", ".", "gato", "cão", "."]
+    starts = [True, False, False, True, False, False, True, False, True, False, False]
+    return Doc(nlp.vocab, words=words, sent_starts=starts)
+
+
+def test_sentence_vectors_match_span_vectors():
+    doc = _doc()
+    matrix = embeddings.get_sentence_embeddings(doc)
+
+    expected = np.vstack([sent.vector for sent in doc.sents])
+    assert np.allclose(matrix.vectors, expected)
+    assert matrix.norms[2] == 0
+
+
+def test_adjacent_and_window_similarity():
+    matrix = embeddings.get_sentence_embeddings(_doc())
+
+    # The third sentence has no vector and takes the default similarity
+    assert matrix.adjacent_similarity(default=0.5).tolist() == pytest.approx(
+        [0.0, 0.5, 0.5]
+    )
+    assert matrix.shifted_similarity(3).tolist() == pytest.approx([2 ** -0.5])
+    window = matrix.window_similarity(window=2, default=0.5)
+    assert window.tolist() == pytest.approx([0.5, 0.0, 0.5, (0.5 + 2 ** -0.5) / 2])
+
+
+def test_no_vectors_and_caching():
+    assert embeddings.get_sentence_embeddings(_doc(vectors=False)) is None
+
+    doc = _doc()
+    matrix = embeddings.get_sentence_embeddings(doc)
+    assert embeddings.get_sentence_embeddings(doc) is matrix
@@ -0,0 +1,142 @@
+import importlib
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture
+def metrics_module(monkeypatch):
+    root = Path(__file__).resolve().parents[1]
+    if str(root) not in sys.path:
+        sys.path.insert(0, str(root))
+    fake_spacy = types.ModuleType("spacy")
+    fake_spacy.tokens = types.SimpleNamespace(Doc=object)
+    monkeypatch.setitem(sys.modules, "spacy", fake_spacy)
+    monkeypatch.setitem(sys.modules, "numpy", types.ModuleType("numpy"))
+    fake_stats = types.SimpleNamespace(norm=types.SimpleNamespace(cdf=lambda z: 0.5))
+    fake_scipy = types.ModuleType("scipy")
+    fake_scipy.stats = fake_stats
+    monkeypatch.setitem(sys.modules, "scipy", fake_scipy)
+    monkeypatch.setitem(sys.modules, "scipy.stats", fake_stats)
+
+    return importlib.import_module("utils.metrics")
+
+
+class StubToken:
+    def __init__(self, text, pos, dep="", lemma=None, is_stop=False, is_punct=False):
+        self.text = text
+        self.pos_ = pos
+        self.dep_ = dep
+        self.lemma_ = lemma if lemma is not None else text
+        self.is_stop = is_stop
+        self.is_punct = is_punct
+        self.is_space = False
+        self.ancestors = []
+        self.i = 0
+
+
+class StubDoc:
+    def __init__(self, sentences):
+        self._sents = [list(s) for s in sentences]
+        self.tokens = [t for s in self._sents for t in s]
+        for idx, t in enumerate(self.tokens):
+            t.i = idx
+        self.user_data = {}
+
+    def __iter__(self):
+        return iter(self.tokens)
+
+    def __len__(self):
+        return len(self.tokens)
+
+    @property
+    def sents(self):
+        return list(self._sents)
+
+    @property
+    def text(self):
+        return " ".join(t.text for t in self.tokens)
+
+
+def _sample_doc():
+    return StubDoc(
+        [
+            [
+                StubToken("Ana", "PROPN", "nsubj"),
+                StubToken("estuda", "VERB", "ROOT", lemma="estudar"),
+                StubToken(".", "PUNCT", "punct", is_punct=True),
+            ],
+            [
+                StubToken("Ela", "PRON", "nsubj", lemma="ela", is_stop=True),
+                StubToken("Estudos", "NOUN", "obj", lemma="Estudo"),
+            ],
+        ]
+    )
+
+
+def test_extract_features_columns(metrics_module):
+    features_module = importlib.import_module("utils.features")
+    features = features_module.extract_features(_sample_doc())
+
+    assert features.n_tokens == 5
+    assert features.sent_bounds == [(0, 3), (3, 5)]
+    assert features.sent_id == [0, 0, 0, 1, 1]
+    assert features.lower[4] == "estudos"
+    assert features.lemma_lower[4] == "estudo"
+    assert features.words == [0, 1, 3, 4]
+    assert features.content_words == [1, 4]
+    assert features.sent_subjects == [[0], [3]]
+    assert features.lemma_id[4] == features.lemma_ids["estudo"]
+    # Ids are local to the document: one per distinct lowercased lemma
+    assert sorted(features.lemma_ids.values()) == list(range(len(features.lemma_ids)))
+
+
+def test_doc_features_are_cached(metrics_module):
+    features_module = importlib.import_module("utils.features")
+    doc = _sample_doc()
+    first = features_module.get_doc_features(doc)
+    assert features_module.get_doc_features(doc) is first
+    assert doc.user_data[features_module.FEATURES_KEY] is first
+
+
+def test_calculate_metrics_runs_each_metric_once(monkeypatch, metrics_module):
+    metrics = metrics_module
+    calls = {}
+
+    for name in dir(metrics):
+        if name.startswith("calculate_") and name not in (
+            "calculate_metrics",
+            "calculate_percentile",
+        ):
+            original = getattr(metrics, name)
+
+            def counted(*args, _name=name, _original=original, **kwargs):
+                calls[_name] = calls.get(_name, 0) + 1
+                return _original(*args, **kwargs)
+
+            monkeypatch.setattr(metrics, name, counted)
+
+    result = metrics.calculate_metrics(_sample_doc())
+
+    assert len(calls) == 13
+    assert set(calls.values()) == {1}
+    assert set(result["dimensions"]) == {
+        "coesao",
+        "coerencia",
+        "adequacao",
+        "precisao",
+        "complexidade",
+    }
+
+
+def test_lemma_positions_index(metrics_module):
+    features_module = importlib.import_module("utils.features")
+    features = features_module.extract_features(_sample_doc())
+
+    index = features.lemma_positions
+    assert index[features.lemma_ids["estudo"]] == [4]
+    assert sorted(p for positions in index.values() for p in positions) == list(
+        range(features.n_tokens)
+    )
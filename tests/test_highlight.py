@@ -0,0 +1,61 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from utils import highlight  # noqa: E402
+
+
+def _ann(start, end, severity="low", description="d"):
+    return {
+        "span_start": start,
+        "span_end": end,
+        "severity": severity,
+        "description": description,
+    }
+
+
+def test_overlapping_annotations_are_stacked():
+    text = "abcdefghij"
+    table = highlight.as_table(
+        [_ann(0, 6, "low", "a"), _ann(4, 8, "high", "b"), _ann(4, 8, "high", "b")]
+    )
+
+    segments = list(highlight.highlight_segments(table, 0, len(text)))
+    assert [segment[:3] for segment in segments] == [
+        (0, 4, 0),
+        (4, 6, 2),
+        (6, 8, 2),
+    ]
+    assert len(segments[1][3]) == 2
+
+    html = highlight.render_highlighted_html(text, table)
+    assert html.count("<span") == 3
+    assert html.endswith("</span>ij")
+    # The overlap carries both descriptions, each once
+    assert 'title="a\nb"' in html
+
+
+def test_text_and_tooltips_are_escaped():
+    text = "<b>x</b> & y"
+    html = highlight.render_highlighted_html(
+        text, [_ann(0, 3, "medium", '"quoted" <tip>')]
+    )
+    assert html.startswith('<span style="background-color: #b45309;')
+    assert 'title="&quot;quoted&quot; &lt;tip&gt;"' in html
+    assert "&lt;b&gt;</span>x&lt;/b&gt; &amp; y" in html
+    assert highlight.render_highlighted_html(text, []) == "&lt;b&gt;x&lt;/b&gt; &amp; y"
+
+
+def test_windowed_rendering():
+    text = "linha um\nlinha dois\nlinha três\n"
+    pages = highlight.page_bounds(text, page_size=12)
+    assert [text[s:e] for s, e in pages] == [
+        "linha um\n",
+        "linha dois\n",
+        "linha três\n",
+    ]
+
+    # An annotation crossing the window edge is clipped to the window
+    html = highlight.render_highlighted_html(text, [_ann(6, 15)], *pages[1])
+    assert html.startswith("<span") and html.endswith(">linha </span>dois\n")
+    assert highlight.page_bounds("") == [(0, 0)]
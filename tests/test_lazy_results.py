@@ -0,0 +1,62 @@
+import sys
+from pathlib import Path
+
+root = Path(__file__).resolve().parents[1]
+if str(root) not in sys.path:
+    sys.path.insert(0, str(root))
+
+from utils.lazy_results import (  # noqa: E402
+    ANALYSIS_ID_KEY,
+    make_analysis_id,
+    memoized,
+)
+
+
+def test_analysis_id_depends_on_text_and_parameters():
+    base = make_analysis_id("Um texto.", domain="Acadêmico", genre="Ensaio")
+    assert base == make_analysis_id("Um texto.", genre="Ensaio", domain="Acadêmico")
+    assert base != make_analysis_id("Outro texto.", domain="Acadêmico", genre="Ensaio")
+    assert base != make_analysis_id("Um texto.", domain="Jurídico", genre="Ensaio")
+
+
+def test_products_are_computed_once_per_analysis():
+    calls = []
+    results = {ANALYSIS_ID_KEY: "a", "processing_time": {"metrics": 0.1}}
+
+    def compute():
+        calls.append(results[ANALYSIS_ID_KEY])
+        return [len(calls)]
+
+    first = memoized(results, "recommendations", compute)
+    assert memoized(results, "recommendations", compute) is first
+    assert calls == ["a"]
+    assert "recommendations" in results["processing_time"]
+
+    # A new analysis id invalidates the memoized product
+    results[ANALYSIS_ID_KEY] = "b"
+    assert memoized(results, "recommendations", compute) == [2]
+    assert calls == ["a", "b"]
+
+
+def test_products_are_profiled_whichever_builds_first():
+    from utils.profiling import profile_section
+
+    results = {ANALYSIS_ID_KEY: "a", "profile": {"parse": {"calls": 1}}}
+
+    def recommendations():
+        with profile_section("recommend_x", "recommendation"):
+            return ["rec"]
+
+    def annotations():
+        # Nested products report to the enclosing product's profiler
+        memoized(results, "recommendations", recommendations)
+        with profile_section("annotations"):
+            return []
+
+    memoized(results, "annotations", annotations)
+    assert {"parse", "recommend_x", "annotations"} <= set(results["profile"])
+    assert results["profile"]["recommend_x"]["calls"] == 1
+
+    results = {ANALYSIS_ID_KEY: "b", "profile": {}}
+    memoized(results, "recommendations", recommendations)
+    assert set(results["profile"]) == {"recommend_x"}
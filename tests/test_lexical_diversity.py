@@ -0,0 +1,49 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+root = Path(__file__).resolve().parents[1]
+if str(root) not in sys.path:
+    sys.path.insert(0, str(root))
+
+from utils.lexical_diversity import (  # noqa: E402
+    compute_lexical_diversity,
+    hdd,
+    mattr,
+    mtld,
+)
+
+
+def _naive_mattr(items, window):
+    ttrs = [
+        len(set(items[i : i + window])) / window
+        for i in range(len(items) - window + 1)
+    ]
+    return sum(ttrs) / len(ttrs)
+
+
+def test_mattr_matches_naive_windows():
+    items = [i % 7 if i % 3 else i for i in range(250)]
+    assert mattr(items, 20) == pytest.approx(_naive_mattr(items, 20))
+    assert mattr(items[:10], 20) == len(set(items[:10])) / 10
+
+
+def test_mtld_is_bidirectional():
+    # Forward: one full factor ([0, 0]) -> 5 / 1; backward: only a partial
+    # factor of (1 - 0.8) / (1 - 0.72) -> 5 / 0.714...
+    assert mtld([0, 0, 1, 2, 3]) == pytest.approx((5 + 5 * 0.28 / 0.2) / 2)
+    assert mtld(list(range(30))) == 30
+
+
+def test_hdd_bounds():
+    assert hdd(list(range(100))) == pytest.approx(1.0)
+    assert hdd([1] * 100) == pytest.approx(1 / 42)
+    assert hdd([1, 2, 2]) == pytest.approx(2 / 3)
+
+
+def test_compute_lexical_diversity_counts():
+    result = compute_lexical_diversity([1, 2, 2, 3])
+    assert (result.tokens, result.types) == (4, 3)
+    assert result.ttr == 0.75
+    assert result.mattr == 0.75
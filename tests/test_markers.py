@@ -0,0 +1,43 @@
+import sys
+from pathlib import Path
+
+root = Path(__file__).resolve().parents[1]
+if str(root) not in sys.path:
+    sys.path.insert(0, str(root))
+
+from utils.markers import MarkerMatcher, tokenize  # noqa: E402
+
+
+def test_tokenize_keeps_offsets():
+    assert tokenize("Conclui-se, Logo.") == [
+        ("conclui", 0, 7),
+        ("-", 7, 8),
+        ("se", 8, 10),
+        (",", 10, 11),
+        ("logo", 12, 16),
+        (".", 16, 17),
+    ]
+
+
+def test_matches_are_whole_word_and_overlapping():
+    matcher = MarkerMatcher(
+        {"conclusao": ["logo", "conclui-se"], "exemplo": ["por exemplo", "por"]}
+    )
+    text = "Por exemplo, o diálogo termina logo. Conclui-se que sim."
+    matches = matcher.match(text)
+
+    # "logo" inside "diálogo" is not a match
+    assert matches.count("conclusao") == 2
+    assert matches.count("exemplo") == 2
+    assert [text[s:e] for s, e, _ in matches.get_spans("exemplo")] == [
+        "Por",
+        "Por exemplo",
+    ]
+    assert matches.get_spans("conclusao")[1] == (37, 47, "conclui-se")
+    assert not matches.found("outro")
+
+
+def test_repeated_entries_count_once_per_listing():
+    matcher = MarkerMatcher({"a": ["assim"], "b": ["assim", "assim"]})
+    matches = matcher.match("assim foi")
+    assert (matches.count("a"), matches.count("b")) == (1, 2)
@@ -52,3 +52,11 @@ def test_calculate_percentile(monkeypatch, metrics_module):
     monkeypatch.setitem(sys.modules, "scipy.stats", fake_stats)
     percentile = metrics.calculate_percentile(55, "Test")
     assert percentile == 100.0
+
+
+def test_get_required_annotations(metrics_module):
+    func = metrics_module.get_required_annotations
+    assert func([("coerencia", "retorica")]) == {"parser"}
+    assert "ner" in func()
+    assert "ner" not in func(fast=True)
+    assert func(fast=True) | {"ner"} == func()
@@ -91,6 +91,112 @@ def test_calculate_referential_cohesion(metrics_module):
     assert score == 80.0
 
 
+def test_recommendation_reuses_metric_evidence(metrics_module, recommendations_module):
+    alice = StubToken("Alice", "PROPN")
+    greeted = StubToken("greeted", "VERB")
+    him = StubToken("him", "PRON", "dobj", ancestors=[alice])
+    it = StubToken("It", "PRON", "nsubj")
+    worked = StubToken("worked", "VERB")
+    doc = StubDoc([[alice, greeted, him], [it, worked]])
+    doc.user_data = {}
+    doc._sents[1].text = "It worked"
+
+    metrics_module.calculate_referential_cohesion(doc)
+    evidence = metrics_module.get_metric_evidence(doc, ("coesao", "referencial"))
+    assert evidence == {"token_ids": [3], "sentence_ids": [1]}
+
+    # The recommendation is built from the evidence, not from the Doc
+    doc.tokens = doc._sents = None
+    rec = recommendations_module.recommend_referential_cohesion(
+        doc, {"score": 50.0}, "Acadêmico", "Artigo Científico"
+    )
+    assert rec["affected_segments"] == [1]
+    assert "'It' em: \"It worked\"" in rec["description"]
+
+
+def test_metric_evidence_is_keyed_by_parameters(monkeypatch, metrics_module):
+    calls = []
+
+    def fake_precision(doc, domain, features):
+        calls.append(domain)
+        metrics_module._record_evidence(
+            features, "calculate_terminological_precision", domain, domain=domain
+        )
+        return 70.0
+
+    monkeypatch.setattr(
+        metrics_module, "calculate_terminological_precision", fake_precision
+    )
+    doc = StubDoc([[StubToken("Termo", "NOUN")]])
+    doc.user_data = {}
+    key = ("precisao", "terminologica")
+
+    legal = metrics_module.get_metric_evidence(doc, key, domain="Jurídico")
+    academic = metrics_module.get_metric_evidence(doc, key, domain="Acadêmico")
+    assert legal == {"domain": "Jurídico"}
+    assert academic == {"domain": "Acadêmico"}
+    # Cached per parameters: asking again does not rerun the metric
+    assert metrics_module.get_metric_evidence(doc, key, domain="Jurídico") == legal
+    assert calls == ["Jurídico", "Acadêmico"]
+
+
+def test_evidence_fallback_uses_audience(monkeypatch, recommendations_module):
+    recs = recommendations_module
+    calls = []
+    monkeypatch.setattr(
+        recs,
+        "get_metric_evidence",
+        lambda doc, key, **parameters: calls.append((key, parameters)) or {},
+    )
+
+    recs.generate_metric_recommendation(
+        StubDoc([]),
+        "adequacao",
+        "registro",
+        {"score": 40.0},
+        "Jurídico",
+        "Ensaio",
+        "Estudante",
+    )
+
+    assert calls == [
+        (
+            ("adequacao", "registro"),
+            {"domain": "Jurídico", "genre": "Ensaio", "audience": "Estudante"},
+        )
+    ]
+
+
+def test_recommendations_are_generated_on_first_access(
+    monkeypatch, recommendations_module
+):
+    recs = recommendations_module
+    calls = []
+    monkeypatch.setattr(
+        recs,
+        "generate_recommendations",
+        lambda doc, metrics, domain, genre, audience, time_budget: calls.append(
+            (domain, genre, audience, time_budget)
+        )
+        or ["rec"],
+    )
+    results = {
+        "analysis_id": "a",
+        "parameters": {
+            "domain": "Jurídico",
+            "genre": "Ensaio",
+            "audience": "Estudante",
+            "time_budget": 2.0,
+        },
+        "doc": StubDoc([]),
+        "metrics": {},
+    }
+
+    assert recs.get_recommendations(results) == ["rec"]
+    assert recs.get_recommendations(results) == ["rec"]
+    assert calls == [("Jurídico", "Ensaio", "Estudante", 2.0)]
+
+
 def test_calculate_lexical_cohesion(metrics_module):
     tokens = [
         StubToken("Apple", "NOUN", lemma="apple"),
@@ -124,3 +230,116 @@ def test_generate_recommendations(monkeypatch, recommendations_module):
     recommendations = recs.generate_recommendations(doc, metrics)
     ids = [r["id"] for r in recommendations]
     assert ids == ["general", "metric"]
+
+
+def test_calculate_metrics_time_budget(monkeypatch, metrics_module):
+    calls = []
+
+    def fake_metric(doc, *args):
+        calls.append(args[-1])
+        return 40.0
+
+    for spec in metrics_module.METRIC_REGISTRY.values():
+        monkeypatch.setattr(metrics_module, spec.function, fake_metric)
+    monkeypatch.setattr(metrics_module, "calculate_percentile", lambda score, domain: 50.0)
+    doc = StubDoc([[StubToken("Alice", "PROPN"), StubToken("runs", "VERB")]])
+
+    result = metrics_module.calculate_metrics(doc)
+    assert "pending_metrics" not in result
+    assert len(calls) == len(metrics_module.METRIC_PRIORITY)
+    assert result["overall_score"] == 40.0
+
+    calls.clear()
+    result = metrics_module.calculate_metrics(doc, time_budget=0)
+    assert calls == []
+    assert result["pending_metrics"] == list(metrics_module.METRIC_PRIORITY)
+    lexical = result["dimensions"]["coesao"]["lexical"]
+    assert lexical["pending"] is True
+    assert lexical["score"] == sum(lexical["expected_range"]) / 2
+    assert result["dimensions"]["coesao"]["pending"] is True
+
+
+def test_generate_recommendations_skips_pending(monkeypatch, recommendations_module):
+    recs = recommendations_module
+    monkeypatch.setattr(
+        recs,
+        "generate_metric_recommendation",
+        lambda doc, dim, metric, *a: {"id": metric, "potential_improvement": 2},
+    )
+    metrics = {
+        "overall_score": 80,
+        "dimensions": {
+            "coesao": {
+                "referencial": {"score": 50, "expected_range": (70, 90)},
+                "lexical": {"score": 50, "expected_range": (70, 90), "pending": True},
+            }
+        },
+    }
+    doc = types.SimpleNamespace(text="stub")
+    assert [r["id"] for r in recs.generate_recommendations(doc, metrics)] == ["referencial"]
+    assert recs.generate_recommendations(doc, metrics, time_budget=0) == []
+
+
+def test_calculate_metrics_selected_dimensions(monkeypatch, metrics_module):
+    calls = []
+    for spec in metrics_module.METRIC_REGISTRY.values():
+        monkeypatch.setattr(
+            metrics_module,
+            spec.function,
+            lambda doc, *args, _key=spec.key: calls.append(_key) or 60.0,
+        )
+    monkeypatch.setattr(metrics_module, "calculate_percentile", lambda score, domain: 50.0)
+    doc = StubDoc([[StubToken("Alice", "PROPN"), StubToken("runs", "VERB")]])
+
+    result = metrics_module.calculate_metrics(
+        doc, dimensions=["complexidade"], metrics=[("coesao", "lexical")]
+    )
+    assert set(calls) == {
+        ("complexidade", "lexical"),
+        ("complexidade", "sintatica"),
+        ("complexidade", "informacional"),
+        ("coesao", "lexical"),
+    }
+    assert list(result["dimensions"]) == ["coesao", "complexidade"]
+    assert list(result["dimensions"]["coesao"]) == ["lexical", "score"]
+    assert result["overall_score"] == 60.0
+
+    with pytest.raises(ValueError):
+        metrics_module.calculate_metrics(doc, dimensions=["estilo"])
+    assert metrics_module.estimate_cost(
+        metrics_module.select_metrics(["complexidade"])
+    ) < metrics_module.estimate_cost()
+
+
+def test_complex_sentence_annotation_keeps_length_rule():
+    spacy = pytest.importorskip("spacy")
+    from spacy.tokens import Doc
+
+    metrics = importlib.import_module("utils.metrics")
+    # A long flat sentence (26 nouns, 4 verbs), then a short one with
+    # three nested clauses
+    words = ["palavra"] * 26 + ["fala", "corre", "lê", "vê", "."]
+    pos = ["NOUN"] * 26 + ["VERB"] * 4 + ["PUNCT"]
+    heads = [26] * 31
+    deps = ["dep"] * 26 + ["ROOT", "conj", "conj", "conj", "punct"]
+    words += ["Ele", "disse", "que", "ela", "sabia", "que", "eu", "via"]
+    words += ["que", "chovia", "."]
+    pos += ["PRON", "VERB", "SCONJ", "PRON", "VERB", "SCONJ", "PRON", "VERB"]
+    pos += ["SCONJ", "VERB", "PUNCT"]
+    heads += [h + 31 for h in [1, 1, 4, 4, 1, 7, 7, 4, 9, 7, 1]]
+    deps += ["nsubj", "ROOT", "mark", "nsubj", "ccomp", "mark", "nsubj", "ccomp"]
+    deps += ["mark", "ccomp", "punct"]
+    starts = [True] + [False] * 30 + [True] + [False] * 10
+    doc = Doc(
+        spacy.blank("pt").vocab,
+        words=words,
+        pos=pos,
+        heads=heads,
+        deps=deps,
+        sent_starts=starts,
+    )
+
+    evidence = metrics.get_metric_evidence(doc, ("precisao", "estrutural"))
+    # Recommendations also flag the nested sentence; annotations do not
+    assert evidence["complex_sentences"] == [0, 1]
+    assert evidence["long_sentences"] == [0]
@@ -0,0 +1,91 @@
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+root = Path(__file__).resolve().parents[1]
+if str(root) not in sys.path:
+    sys.path.insert(0, str(root))
+
+spacy = pytest.importorskip("spacy")
+
+from utils import models  # noqa: E402
+
+
+@pytest.fixture
+def loads(monkeypatch):
+    calls = []
+
+    def fake_load(name):
+        calls.append(name)
+        if name == "missing":
+            raise OSError(name)
+        time.sleep(0.05)
+        return spacy.blank("pt")
+
+    monkeypatch.setattr(models.spacy, "load", fake_load)
+    models.clear_models()
+    yield calls
+    models.clear_models()
+
+
+def test_concurrent_callers_share_one_load(loads):
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(models.get_model("lg")))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert loads == ["lg"]
+    assert all(nlp is results[0] for nlp in results)
+    assert models.get_model("other") is not results[0]
+
+
+def test_missing_model_is_not_registered(loads):
+    for _ in range(2):
+        with pytest.raises(OSError):
+            models.get_model("missing")
+    assert loads == ["missing", "missing"]
+
+
+def test_calculator_shares_registry_and_pre_parsed_doc(loads, monkeypatch):
+    pytest.importorskip("sklearn")
+    from utils.academic_metrics import AcademicMetricsCalculator
+
+    calculator = AcademicMetricsCalculator()
+    seen = []
+    for name in (
+        "macrostructure",
+        "cohesion_coherence",
+        "lexical_sophistication",
+        "syntactic_complexity",
+        "metadiscourse",
+        "intertextuality",
+        "methodological_rigor",
+    ):
+        monkeypatch.setattr(
+            calculator,
+            f"_calculate_{name}",
+            lambda text, doc: seen.append(doc) or {"score": 0.5},
+        )
+    monkeypatch.setattr(
+        calculator,
+        "_calculate_style_adequacy",
+        lambda text, doc, domain, level: seen.append(doc) or {"score": 0.5},
+    )
+
+    doc = spacy.blank("pt")("Um texto já analisado.")
+    results = calculator.calculate_all_dimensions(doc=doc)
+
+    assert results["overall_score"]["score"] == pytest.approx(0.5)
+    assert len(seen) == 8 and all(item is doc for item in seen)
+    # The model is only loaded on demand, through the shared registry
+    assert loads == []
+    assert calculator.nlp is models.get_model(calculator.config.spacy_model)
+    assert len(loads) == 1
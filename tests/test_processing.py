@@ -0,0 +1,153 @@
+import warnings
+
+import numpy as np
+import pytest
+
+spacy = pytest.importorskip("spacy")
+
+TEXT = (
+    "A pesquisa analisa textos longos. Ela tem método.\n\n"
+    "O segundo parágrafo continua o tema.\n\n"
+    "Um parágrafo final encerra o texto."
+)
+
+
+def _tokens(doc):
+    return [(t.text, t.idx, t.whitespace_) for t in doc]
+
+
+def test_incremental_reparses_only_edited_paragraph(processing):
+    first = processing.process_text(TEXT, incremental=True)
+    assert first.user_data[processing.INCREMENTAL_KEY] == {
+        "paragraphs": 3,
+        "reparsed": 3,
+    }
+
+    edited = TEXT.replace("continua o tema", "muda de assunto")
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        doc = processing.process_text(edited, incremental=True)
+    assert doc.user_data[processing.INCREMENTAL_KEY] == {
+        "paragraphs": 3,
+        "reparsed": 1,
+    }
+
+    full = processing.process_text(edited, use_cache=False)
+    assert doc.text == edited
+    assert _tokens(doc) == _tokens(full)
+    assert [s.start_char for s in doc.sents] == [s.start_char for s in full.sents]
+
+
+def test_incremental_and_full_parses_are_cached_apart(processing):
+    incremental = processing.process_text(TEXT, incremental=True)
+    full = processing.process_text(TEXT)
+
+    assert full is not incremental
+    assert processing.INCREMENTAL_KEY not in full.user_data
+    assert processing.process_text(TEXT, incremental=True) is incremental
+    assert processing.process_text(TEXT) is full
+
+
+def test_single_paragraph_does_not_share_cached_doc(processing):
+    text = "Um parágrafo apenas. Com duas frases."
+    doc = processing.process_text(text, incremental=True)
+    doc.user_data["lexa_features"] = object()
+
+    again = processing._parse_incremental(
+        processing.get_nlp_model("pt"), text, "pt", ["sentencizer"], []
+    )
+    assert again is not doc
+    assert again.user_data[processing.INCREMENTAL_KEY]["reparsed"] == 0
+    assert "lexa_features" not in again.user_data
+    assert _tokens(again) == _tokens(doc)
+
+    # Cached paragraphs keep empty user_data, so merging them warns nothing
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        processing.process_text(text + "\n\nOutro parágrafo.", incremental=True)
+
+
+def _reference_features(doc):
+    """Token-by-token version of ``extract_linguistic_features``."""
+    tokens = [t for t in doc if not t.is_punct and not t.is_space]
+    content = [t for t in tokens if not t.is_stop]
+    lemmas = {t.lemma_ for t in content}
+    sentences = list(doc.sents)
+    lengths = [len([t for t in sent if not t.is_punct]) for sent in sentences]
+    distances = [abs(t.i - t.head.i) for t in doc if t.head != t]
+    labels = [ent.label_ for ent in doc.ents]
+    pos_counts = {}
+    for token in doc:
+        pos_counts[token.pos_] = pos_counts.get(token.pos_, 0) + 1
+    return {
+        "token_count": len(tokens),
+        "content_token_count": len(content),
+        "unique_lemma_count": len(lemmas),
+        "lexical_diversity": len(lemmas) / len(content),
+        "sentence_count": len(sentences),
+        "avg_sentence_length": np.mean(lengths),
+        "median_sentence_length": np.median(lengths),
+        "sentence_length_std": np.std(lengths),
+        "avg_dependency_distance": np.mean(distances),
+        "max_dependency_distance": max(distances),
+        "entity_count": len(labels),
+        "entity_density": len(labels) / len(sentences),
+        "entity_types": {label: labels.count(label) for label in set(labels)},
+        "pos_distribution": pos_counts,
+    }
+
+
+def _annotated_doc():
+    from spacy.tokens import Doc
+
+    nlp = spacy.blank("pt")
+    words = ["Ana", "Souza", "estuda", "em", "Lisboa", ".", "Ela", "lê", "muito", "."]
+    doc = Doc(
+        nlp.vocab,
+        words=words,
+        spaces=[True, True, True, True, False, True, True, True, False, False],
+        pos=["PROPN", "PROPN", "VERB", "ADP", "PROPN", "PUNCT"]
+        + ["PRON", "VERB", "ADV", "PUNCT"],
+        heads=[2, 0, 2, 4, 2, 2, 7, 7, 7, 7],
+        deps=["nsubj", "flat", "ROOT", "case", "obl", "punct"]
+        + ["nsubj", "ROOT", "advmod", "punct"],
+        lemmas=["Ana", "Souza", "estudar", "em", "Lisboa", "."]
+        + ["ela", "ler", "muito", "."],
+        ents=["B-PER", "I-PER", "O", "O", "B-LOC", "O", "O", "O", "O", "O"],
+    )
+    return doc
+
+
+def test_linguistic_features_match_token_loop(processing):
+    doc = _annotated_doc()
+
+    features = processing.extract_linguistic_features(doc)
+    expected = _reference_features(doc)
+
+    assert features.keys() == expected.keys()
+    for name, value in expected.items():
+        assert features[name] == pytest.approx(value), name
+    # "em", "Ela" and "muito" are stop words of the blank pipeline
+    assert features["content_token_count"] == 5
+    assert features["entity_types"] == {"PER": 1, "LOC": 1}
+    assert features["pos_distribution"] == {
+        "PROPN": 3,
+        "VERB": 2,
+        "ADP": 1,
+        "PUNCT": 2,
+        "PRON": 1,
+        "ADV": 1,
+    }
+
+
+def test_linguistic_features_return_arrays(processing):
+    doc = _annotated_doc()
+
+    features = processing.extract_linguistic_features(doc, return_arrays=True)
+    arrays = features.pop("arrays")
+
+    assert features == processing.extract_linguistic_features(doc)
+    assert all(len(column) == len(doc) for column in arrays.values())
+    assert arrays["head"].tolist() == [t.head.i - t.i for t in doc]
+    assert arrays["sent_id"].tolist() == [0] * 6 + [1] * 4
+    assert arrays["lemma"].tolist() == [t.lemma for t in doc]
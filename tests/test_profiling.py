@@ -0,0 +1,66 @@
+import json
+import sys
+from pathlib import Path
+
+root = Path(__file__).resolve().parents[1]
+if str(root) not in sys.path:
+    sys.path.insert(0, str(root))
+
+from utils.profiling import (  # noqa: E402
+    Profiler,
+    get_active_profiler,
+    profile_section,
+    profiled,
+    save_chrome_trace,
+)
+
+
+@profiled("metric")
+def _metric(n):
+    return sum(range(n))
+
+
+def test_profiled_is_noop_without_profiler():
+    assert get_active_profiler() is None
+    assert _metric(10) == 45
+
+
+def test_summary_counts_calls_and_nesting():
+    with Profiler() as profiler:
+        with profile_section("outer", "analysis"):
+            _metric(10)
+            _metric(1000)
+
+    assert get_active_profiler() is None
+    summary = profiler.summary()
+    assert summary["_metric"]["calls"] == 2
+    assert summary["_metric"]["category"] == "metric"
+    assert summary["outer"]["total"] >= summary["_metric"]["total"]
+    assert summary["_metric"]["mean"] == summary["_metric"]["total"] / 2
+
+
+def test_memory_peaks_include_nested_sections():
+    with Profiler(trace_memory=True) as profiler:
+        with profile_section("outer"):
+            with profile_section("inner"):
+                data = [0] * 200_000
+            del data
+
+    summary = profiler.summary()
+    assert summary["inner"]["peak_bytes"] >= 1_000_000
+    assert summary["outer"]["peak_bytes"] >= summary["inner"]["peak_bytes"]
+
+
+def test_chrome_trace(tmp_path):
+    with Profiler() as profiler:
+        _metric(10)
+
+    trace = profiler.to_chrome_trace()
+    (event,) = trace["traceEvents"]
+    assert event["name"] == "_metric"
+    assert event["ph"] == "X"
+    assert event["dur"] >= 0
+
+    assert save_chrome_trace(profiler, None) is None
+    path = save_chrome_trace(profiler, str(tmp_path / "traces"))
+    assert json.loads(Path(path).read_text())["traceEvents"][0]["name"] == "_metric"
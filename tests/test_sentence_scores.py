@@ -0,0 +1,77 @@
+import pytest
+
+spacy = pytest.importorskip("spacy")
+np = pytest.importorskip("numpy")
+
+from utils import sentence_scores  # noqa: E402
+
+
+def _doc():
+    from spacy.tokens import Doc
+
+    nlp = spacy.blank("pt")
+    nlp.vocab.vectors.resize((4, 2))
+    nlp.vocab.set_vector("gato", np.array([1.0, 0.0], dtype="float32"))
+    nlp.vocab.set_vector("saiu", np.array([1.0, 0.0], dtype="float32"))
+    words = ["O", "gato", "disse", "que", "ele", "sabia", "."]
+    words += ["Portanto", "ela", "saiu", "."]
+    heads = [1, 2, 2, 5, 5, 2, 2, 9, 9, 9, 9]
+    deps = ["det", "nsubj", "ROOT", "mark", "nsubj", "ccomp", "punct"]
+    deps += ["advmod", "nsubj", "ROOT", "punct"]
+    pos = ["DET", "NOUN", "VERB", "SCONJ", "PRON", "VERB", "PUNCT"]
+    pos += ["ADV", "PRON", "VERB", "PUNCT"]
+    starts = [True] + [False] * 6 + [True] + [False] * 3
+    return Doc(
+        nlp.vocab,
+        words=words,
+        heads=heads,
+        deps=deps,
+        pos=pos,
+        sent_starts=starts,
+    )
+
+
+def test_sentence_measures():
+    result = sentence_scores.get_sentence_scores(_doc())
+
+    assert result.words.tolist() == [6, 3]
+    assert result.max_depth.tolist() == [2, 1]
+    assert result.connectives.tolist() == [0, 1]
+    # "O" has the noun "gato" among its ancestors, "ele" and "ela" do not
+    assert result.references.tolist() == [2, 1]
+    assert result.clear_references.tolist() == [1, 0]
+    assert np.isnan(result.similarity[0])
+    assert result.similarity[1] == pytest.approx(1.0)
+
+
+def test_sentence_score_matrix():
+    result = sentence_scores.get_sentence_scores(_doc())
+
+    assert result.scores.shape == (2, len(sentence_scores.SENTENCE_MEASURES))
+    assert result.scores[0, [0, 1, 2, 4]].tolist() == pytest.approx(
+        [75.0, 100.0, 50.0, 50.0]
+    )
+    assert np.isnan(result.scores[0, 3])
+    assert result.scores[1].tolist() == pytest.approx([37.5, 100.0, 100.0, 47.5, 0.0])
+
+
+def test_scores_are_cached_on_doc():
+    doc = _doc()
+    result = sentence_scores.get_sentence_scores(doc)
+    assert sentence_scores.get_sentence_scores(doc) is result
+    assert doc.user_data[sentence_scores.SENTENCE_SCORES_KEY] is result
+
+
+def test_downsample_averages_consecutive_sentences():
+    matrix = np.array([[0.0], [10.0], [20.0], [np.nan], [40.0]])
+    result = sentence_scores.SentenceScores(*([None] * 7), scores=matrix)
+    result.words = np.zeros(5)
+
+    starts, means = result.downsample(2)
+    assert starts.tolist() == [0, 2]
+    assert means[:, 0].tolist() == pytest.approx([5.0, 30.0])
+    assert sentence_scores.sentence_labels(starts, 5) == ["S1-S2", "S3-S5"]
+
+    starts, means = result.downsample(10)
+    assert starts.tolist() == list(range(5))
+    assert sentence_scores.sentence_labels(starts[:2], 2) == ["S1", "S2"]
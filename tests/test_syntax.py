@@ -0,0 +1,34 @@
+import pytest
+
+spacy = pytest.importorskip("spacy")
+
+from utils import syntax  # noqa: E402
+
+
+def _doc():
+    from spacy.tokens import Doc
+
+    nlp = spacy.blank("pt")
+    words = ["Ele", "disse", "que", "ela", "sabia", ".", "Sim", "."]
+    heads = [1, 1, 4, 4, 1, 1, 6, 6]
+    deps = ["nsubj", "ROOT", "mark", "nsubj", "ccomp", "punct", "ROOT", "punct"]
+    starts = [True, False, False, False, False, False, True, False]
+    return Doc(nlp.vocab, words=words, heads=heads, deps=deps, sent_starts=starts)
+
+
+def test_profile_depths_and_distances():
+    profile = syntax.get_syntax_profile(_doc())
+
+    assert profile.depth.tolist() == [1, 0, 2, 2, 1, 1, 0, 1]
+    assert profile.clause_depth.tolist() == [0, 0, 1, 1, 1, 0, 0, 0]
+    assert profile.sent_max_depth.tolist() == [2, 1]
+    assert profile.sent_max_clause_depth.tolist() == [1, 0]
+    assert profile.distances.tolist() == [1, 2, 1, 3, 4, 1]
+    assert profile.sent_mean_distance.tolist() == pytest.approx([11 / 5, 1.0])
+
+
+def test_profile_is_cached_on_doc():
+    doc = _doc()
+    profile = syntax.get_syntax_profile(doc)
+    assert syntax.get_syntax_profile(doc) is profile
+    assert doc.user_data[syntax.SYNTAX_KEY] is profile
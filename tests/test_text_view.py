@@ -0,0 +1,37 @@
+import re
+import sys
+from pathlib import Path
+
+root = Path(__file__).resolve().parents[1]
+if str(root) not in sys.path:
+    sys.path.insert(0, str(root))
+
+from utils.markers import MarkerMatcher  # noqa: E402
+from utils.text_view import TextView  # noqa: E402
+
+TEXT = (
+    "  Este estudo analisa_dados de 2020. Além disso, assimila!  Isso é tudo?\n\n"
+    "\n\nSegundo parágrafo... sem fim\n\n   \n\nAssim, conclui-se"
+)
+
+
+def test_view_matches_regex_splits():
+    view = TextView.build(TEXT)
+
+    assert view.words == re.findall(r"\b\w+\b", TEXT.lower())
+    assert view.word_count == len(view.words)
+    sentences = [s.strip() for s in re.split(r"[.!?]+", TEXT) if s.strip()]
+    assert view.sentences == sentences
+    assert view.paragraphs == [p.strip() for p in TEXT.split("\n\n") if p.strip()]
+    assert view.paragraph_words(1) == ["segundo", "parágrafo", "sem", "fim"]
+
+
+def test_phrase_matches_are_whole_word_and_cached():
+    matcher = MarkerMatcher({"assim": ["assim"], "adicao": ["além disso"]})
+    view = TextView.build(TEXT)
+
+    matches = view.match(matcher)
+    # "assimila" does not count as "assim"
+    assert matches.count("assim") == 1
+    assert matches.count("adicao") == 1
+    assert view.match(matcher) is matches
@@ -5,15 +5,78 @@ Based on validated academic linguistic metrics and frameworks
 
 import re
 import math
+import multiprocessing
 import numpy as np
-from collections import Counter, defaultdict
-from typing import Dict, List, Tuple, Any
-import spacy
+import pandas as pd
+from collections import Counter, defaultdict, deque
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Any
 from scipy.spatial.distance import cosine
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 
 from config.env_config import ProductionNLPConfig
+from utils import lexical_diversity
+from utils.batching import batched
+from utils.markers import MarkerMatcher
+from utils.models import get_model
+from utils.syntax import get_syntax_profile
+from utils.text_view import TextView
+
+# Pronouns and possessives counted when no parse is available
+FALLBACK_PRONOUNS = frozenset(
+    ['ele', 'ela', 'isso', 'isto', 'aquilo', 'seu', 'sua', 'dele', 'dela']
+)
+
+# Scalar details reported by every dimension, in corpus column order
+DIMENSION_DETAILS = {
+    'macroestrutura_argumentativa': (
+        'tem_introducao', 'tem_desenvolvimento', 'tem_conclusao',
+        'marcadores_argumentativos', 'progressao_tematica',
+    ),
+    'coesao_coerencia': (
+        'coesao_referencial', 'densidade_conectores', 'coesao_lexical',
+        'coerencia_semantica',
+    ),
+    'sofisticacao_lexico_gramatical': (
+        'ttr', 'mtld', 'mattr', 'hdd', 'vocabulario_academico', 'hapax_ratio',
+        'palavras_unicas', 'total_palavras',
+    ),
+    'complexidade_sintatica': (
+        'comprimento_medio_sentenca', 'clausulas_subordinadas',
+        'construcoes_passivas', 'clausulas_relativas', 'profundidade_maxima',
+        'profundidade_media',
+    ),
+    'metadiscursividade': (
+        'marcadores_textuais', 'marcadores_interpessoais', 'marcadores_epistemicos',
+        'densidade_textual', 'densidade_interpessoal', 'densidade_epistemica',
+        'densidade_total',
+    ),
+    'intertextualidade': (
+        'citacoes_detectadas', 'discurso_reportado', 'densidade_citacoes',
+        'qualidade_integracao', 'dialogo_bibliografico',
+    ),
+    'rigor_metodologico': (
+        'tem_objetivos', 'tem_hipoteses', 'tem_metodologia', 'tem_amostra',
+        'tem_analise', 'precisao_linguistica', 'clareza_procedimental',
+    ),
+    'estilo_adequacao': (
+        'impessoalidade', 'formalidade', 'objetividade', 'adequacao_registro',
+        'ausencia_ambiguidade', 'ausencia_redundancia',
+    ),
+}
+
+# Columns of the corpus table, declared up front so that every batch
+# (and every CSV chunk) has the same header
+CORPUS_COLUMNS = (
+    ['index']
+    + [
+        column
+        for dimension, details in DIMENSION_DETAILS.items()
+        for column in (dimension, *(f"{dimension}.{detail}" for detail in details))
+    ]
+    + ['overall_score', 'performance_level']
+)
+
 
 class AcademicMetricsCalculator:
     """
@@ -23,17 +86,28 @@ class AcademicMetricsCalculator:
     
     def __init__(self, config: ProductionNLPConfig | None = None):
         self.config = config or ProductionNLPConfig()
-        self.nlp = None
+        self._nlp = None
+        self._nlp_loaded = False
         self._load_linguistic_resources()
+
+    @property
+    def nlp(self):
+        """
+        Portuguese pipeline shared with ``utils.processing`` (``None`` when
+        the model is not installed), loaded on first use only: callers that
+        pass pre-parsed Docs never load it.
+        """
+        if not self._nlp_loaded:
+            try:
+                self._nlp = get_model(self.config.spacy_model)
+            except OSError:
+                # Fallback to basic processing if model not available
+                self._nlp = None
+            self._nlp_loaded = True
+        return self._nlp
         
     def _load_linguistic_resources(self):
-        """Load Portuguese linguistic model and academic word lists"""
-        try:
-            self.nlp = spacy.load(self.config.spacy_model)
-        except OSError:
-            # Fallback to basic processing if model not available
-            self.nlp = None
-            
+        """Load academic word lists"""
         # Academic vocabulary lists (AWL adapted for Portuguese)
         self.academic_vocab = {
             'analysis', 'approach', 'area', 'assessment', 'assume', 'authority', 'available',
@@ -63,26 +137,70 @@ class AcademicMetricsCalculator:
             'epistemic': ['acredita-se', 'considera-se', 'supõe-se', 'pode-se afirmar', 'é possível que']
         }
 
-    def calculate_all_dimensions(self, text: str, domain: str = "academic", 
-                               level: str = "graduacao") -> Dict[str, Any]:
+        # Argumentative, reported speech and structural markers
+        self.argumentative_markers = ['por outro lado', 'em contrapartida', 'no entanto', 'contudo',
+                                      'além disso', 'ademais', 'por conseguinte', 'dessa forma']
+        self.reported_speech_markers = [
+            'afirma que', 'declara que', 'sustenta que', 'argumenta que',
+            'defende que', 'propõe que', 'considera que', 'aponta que'
+        ]
+        self.introduction_markers = ['este trabalho', 'este artigo', 'este estudo', 'esta pesquisa',
+                                     'o objetivo', 'pretende-se', 'busca-se', 'visa-se']
+        self.conclusion_markers = ['conclui-se', 'em conclusão', 'portanto', 'assim',
+                                   'em suma', 'finalmente', 'por fim']
+
+        # Methodological keywords
+        self.methodological_keywords = {
+            'objectives': ['objetivo', 'objetivos', 'meta', 'finalidade', 'propósito'],
+            'hypothesis': ['hipótese', 'hipóteses', 'suposição', 'pressuposto'],
+            'method': ['método', 'metodologia', 'procedimento', 'técnica', 'abordagem'],
+            'sample': ['amostra', 'corpus', 'população', 'participantes', 'sujeitos'],
+            'analysis': ['análise', 'exame', 'investigação', 'estudo', 'avaliação']
+        }
+
+        # Every list above, matched in one whole-word pass per text
+        lexicons = {('argumentative',): self.argumentative_markers,
+                    ('reported_speech',): self.reported_speech_markers,
+                    ('introduction',): self.introduction_markers,
+                    ('conclusion',): self.conclusion_markers}
+        for kind, markers in self.discourse_connectors.items():
+            lexicons[('connector', kind)] = markers
+        for kind, markers in self.metadiscourse_markers.items():
+            lexicons[('metadiscourse', kind)] = markers
+        for kind, keywords in self.methodological_keywords.items():
+            lexicons[('methodological', kind)] = keywords
+        self.marker_matcher = MarkerMatcher(lexicons)
+
+    def calculate_all_dimensions(self, text: str = None, domain: str = "academic", 
+                               level: str = "graduacao", doc=None) -> Dict[str, Any]:
         """
         Calculate all 8 LEXA dimensions with normalized 0.05-0.95 scores
+
+        A ``doc`` already parsed (e.g. by ``utils.processing.process_text``)
+        is used as is instead of parsing ``text`` again; ``text`` then
+        defaults to ``doc.text``.
         """
+        if text is None:
+            text = doc.text if doc is not None else ""
         if not text.strip():
             return self._empty_results()
             
         # Process text with spaCy if available
-        doc = self.nlp(text) if self.nlp else None
+        if doc is None:
+            doc = self.nlp(text) if self.nlp else None
+
+        # Words, sentences, paragraphs and markers, tokenized once for all dimensions
+        view = TextView.build(text)
         
         results = {
-            'macroestrutura_argumentativa': self._calculate_macrostructure(text, doc),
-            'coesao_coerencia': self._calculate_cohesion_coherence(text, doc),
-            'sofisticacao_lexico_gramatical': self._calculate_lexical_sophistication(text, doc),
-            'complexidade_sintatica': self._calculate_syntactic_complexity(text, doc),
-            'metadiscursividade': self._calculate_metadiscourse(text, doc),
-            'intertextualidade': self._calculate_intertextuality(text, doc),
-            'rigor_metodologico': self._calculate_methodological_rigor(text, doc),
-            'estilo_adequacao': self._calculate_style_adequacy(text, doc, domain, level)
+            'macroestrutura_argumentativa': self._calculate_macrostructure(view, doc),
+            'coesao_coerencia': self._calculate_cohesion_coherence(view, doc),
+            'sofisticacao_lexico_gramatical': self._calculate_lexical_sophistication(view, doc),
+            'complexidade_sintatica': self._calculate_syntactic_complexity(view, doc),
+            'metadiscursividade': self._calculate_metadiscourse(view, doc),
+            'intertextualidade': self._calculate_intertextuality(view, doc),
+            'rigor_metodologico': self._calculate_methodological_rigor(view, doc),
+            'estilo_adequacao': self._calculate_style_adequacy(view, doc, domain, level)
         }
         
         # Calculate overall score
@@ -95,6 +213,76 @@ class AcademicMetricsCalculator:
         
         return results
 
+    def calculate_corpus(self, texts: Iterable[str], domain: str = "academic",
+                         level: str = "graduacao", n_jobs: int = 1,
+                         batch_size: int = 64, output_path: Optional[str] = None):
+        """
+        Score a corpus and return one table row per text
+
+        Texts are consumed lazily in batches of ``batch_size``, parsed with
+        ``nlp.pipe`` and scored with ``calculate_all_dimensions``. With
+        ``n_jobs > 1`` each batch is parsed and scored in a worker process
+        (with a bounded number of batches in flight), so only the flat rows
+        travel back; each worker builds its calculator once, when it starts.
+        Columns are ``CORPUS_COLUMNS``: ``index``, one score column per
+        dimension followed by one ``dimension.detail`` column per scalar
+        detail of ``DIMENSION_DETAILS``, ``overall_score`` and
+        ``performance_level``. Details a text does not report are empty.
+
+        Without ``output_path`` the rows are returned as a pandas DataFrame.
+        With it, every batch is appended to that CSV file as soon as it is
+        scored, so corpora larger than memory can be processed.
+
+        Args:
+            texts (Iterable[str]): Input texts
+            domain (str): Text domain
+            level (str): Academic level
+            n_jobs (int): Number of worker processes
+            batch_size (int): Texts per batch
+            output_path (Optional[str]): CSV file to stream the rows to
+
+        Returns:
+            pandas.DataFrame | str: The table, or ``output_path`` once written
+        """
+        batches = self._iter_corpus_batches(texts, domain, level, n_jobs, batch_size)
+
+        if output_path is None:
+            frames = [pd.DataFrame(rows, columns=CORPUS_COLUMNS) for rows in batches]
+            if not frames:
+                return pd.DataFrame(columns=CORPUS_COLUMNS)
+            return pd.concat(frames, ignore_index=True)
+
+        pd.DataFrame(columns=CORPUS_COLUMNS).to_csv(output_path, index=False)
+        for rows in batches:
+            pd.DataFrame(rows, columns=CORPUS_COLUMNS).to_csv(
+                output_path, mode='a', header=False, index=False
+            )
+        return output_path
+
+    def _iter_corpus_batches(self, texts: Iterable[str], domain: str, level: str,
+                             n_jobs: int, batch_size: int) -> Iterator[List[Dict[str, Any]]]:
+        """Yield the flat rows of every batch of ``texts``, in input order"""
+        batches = batched(enumerate(texts), batch_size)
+
+        if n_jobs <= 1:
+            for batch in batches:
+                yield _score_corpus_batch(batch, domain, level, batch_size, self)
+            return
+
+        with multiprocessing.Pool(
+            processes=n_jobs, initializer=_init_corpus_worker, initargs=(self.config,)
+        ) as pool:
+            pending = deque()
+            for batch in batches:
+                pending.append(pool.apply_async(
+                    _score_corpus_batch, (batch, domain, level, batch_size)
+                ))
+                if len(pending) >= n_jobs * 2:
+                    yield pending.popleft().get()
+
+            while pending:
+                yield pending.popleft().get()
+
     def _normalize_score(self, raw_score: float, min_val: float = 0, max_val: float = 1) -> float:
         """Normalize score to LEXA 0.05-0.95 scale"""
         if max_val == min_val:
@@ -115,23 +303,23 @@ class AcademicMetricsCalculator:
         else:
             return "excelência textual"
 
-    def _calculate_macrostructure(self, text: str, doc) -> Dict[str, Any]:
+    def _calculate_macrostructure(self, view: TextView, doc) -> Dict[str, Any]:
         """
         Dimension 1: Argumentative Macrostructure
         Evaluates logical organization and argumentative sequence
         """
-        paragraphs = [p.strip() for p in text.split('\n\n') if p.strip()]
+        n_paragraphs = len(view.paragraph_spans)
         
         # Detect structural elements
-        has_introduction = self._detect_introduction(paragraphs)
-        has_development = len(paragraphs) >= 3
-        has_conclusion = self._detect_conclusion(paragraphs)
+        has_introduction = self._detect_introduction(view)
+        has_development = n_paragraphs >= 3
+        has_conclusion = self._detect_conclusion(view)
         
         # Argumentative sequence detection
-        argumentative_markers = self._count_argumentative_markers(text)
+        argumentative_markers = self._count_argumentative_markers(view)
         
         # Thematic progression
-        thematic_consistency = self._calculate_thematic_progression(paragraphs)
+        thematic_consistency = self._calculate_thematic_progression(view)
         
         # Calculate raw score
         structure_score = (has_introduction + has_development + has_conclusion) / 3
@@ -156,19 +344,18 @@ class AcademicMetricsCalculator:
             )
         }
 
-    def _calculate_cohesion_coherence(self, text: str, doc) -> Dict[str, Any]:
+    def _calculate_cohesion_coherence(self, view: TextView, doc) -> Dict[str, Any]:
         """
         Dimension 2: Cohesion and Coherence
         Based on Coh-Metrix principles and LSA similarity
         """
-        sentences = re.split(r'[.!?]+', text)
-        sentences = [s.strip() for s in sentences if s.strip()]
+        sentences = view.sentences
         
         # Referential cohesion
-        referential_cohesion = self._calculate_referential_cohesion(text, doc)
+        referential_cohesion = self._calculate_referential_cohesion(view, doc)
         
         # Sequential cohesion (connectives)
-        connector_density = self._calculate_connector_density(text)
+        connector_density = self._calculate_connector_density(view)
         
         # Lexical cohesion
         lexical_cohesion = self._calculate_lexical_cohesion(sentences)
@@ -191,18 +378,19 @@ class AcademicMetricsCalculator:
             'recommendations': self._get_cohesion_recommendations(connector_density, semantic_coherence)
         }
 
-    def _calculate_lexical_sophistication(self, text: str, doc) -> Dict[str, Any]:
+    def _calculate_lexical_sophistication(self, view: TextView, doc) -> Dict[str, Any]:
         """
         Dimension 3: Lexical-Grammatical Sophistication
         Implements TTR, MTLD, and academic vocabulary metrics
         """
-        words = re.findall(r'\b\w+\b', text.lower())
+        words = view.words
         
-        # Type-Token Ratio (TTR)
-        ttr = len(set(words)) / len(words) if words else 0
+        # Type-Token Ratio (TTR), moving-average TTR and HD-D
+        diversity = lexical_diversity.compute_lexical_diversity(words)
+        ttr = diversity.ttr
         
-        # MTLD approximation
-        mtld = self._calculate_mtld(words)
+        # MTLD (bidirectional, with partial factors); short texts use TTR
+        mtld = diversity.mtld if len(words) >= 50 else ttr
         
         # Academic vocabulary usage
         academic_ratio = sum(1 for word in words if word in self.academic_vocab) / len(words)
@@ -220,6 +408,8 @@ class AcademicMetricsCalculator:
             'details': {
                 'ttr': ttr,
                 'mtld': mtld,
+                'mattr': diversity.mattr,
+                'hdd': diversity.hdd,
                 'vocabulario_academico': academic_ratio,
                 'hapax_ratio': hapax_ratio,
                 'palavras_unicas': len(set(words)),
@@ -229,14 +419,14 @@ class AcademicMetricsCalculator:
             'recommendations': self._get_lexical_recommendations(ttr, academic_ratio, mtld)
         }
 
-    def _calculate_syntactic_complexity(self, text: str, doc) -> Dict[str, Any]:
+    def _calculate_syntactic_complexity(self, view: TextView, doc) -> Dict[str, Any]:
         """
         Dimension 4: Syntactic Complexity
         Implements D-Level scale and syntactic depth metrics
         """
         if not doc:
             # Fallback analysis without spaCy
-            return self._basic_syntactic_analysis(text)
+            return self._basic_syntactic_analysis(view.text)
             
         sentences = list(doc.sents)
         
@@ -251,9 +441,10 @@ class AcademicMetricsCalculator:
         passive_constructions = self._count_passive_voice(doc)
         relative_clauses = sum(1 for token in doc if token.dep_ == 'relcl')
         
-        # Syntactic depth approximation
-        max_depth = max((self._get_syntactic_depth(sent.root) for sent in sentences), default=0)
-        avg_depth = np.mean([self._get_syntactic_depth(sent.root) for sent in sentences])
+        # Syntactic depth (deepest token of each sentence, computed once per Doc)
+        sentence_depths = get_syntax_profile(doc).sent_max_depth
+        max_depth = int(sentence_depths.max()) if sentence_depths.size else 0
+        avg_depth = float(sentence_depths.mean()) if sentence_depths.size else 0.0
         
         raw_score = (
             min(1.0, avg_sentence_length / 25) * 0.3 +  # Normalize to ~25 words
@@ -276,23 +467,20 @@ class AcademicMetricsCalculator:
             'recommendations': self._get_syntactic_recommendations(avg_sentence_length, subordination_ratio)
         }
 
-    def _calculate_metadiscourse(self, text: str, doc) -> Dict[str, Any]:
+    def _calculate_metadiscourse(self, view: TextView, doc) -> Dict[str, Any]:
         """
         Dimension 5: Metadiscursivity
         Based on Hyland's metadiscourse framework
         """
-        text_lower = text.lower()
+        matches = view.match(self.marker_matcher)
         
         # Count metadiscourse markers
-        textual_markers = sum(1 for marker in self.metadiscourse_markers['textual'] 
-                             if marker in text_lower)
-        interpersonal_markers = sum(1 for marker in self.metadiscourse_markers['interpersonal'] 
-                                   if marker in text_lower)
-        epistemic_markers = sum(1 for marker in self.metadiscourse_markers['epistemic'] 
-                               if marker in text_lower)
+        textual_markers = matches.count(('metadiscourse', 'textual'))
+        interpersonal_markers = matches.count(('metadiscourse', 'interpersonal'))
+        epistemic_markers = matches.count(('metadiscourse', 'epistemic'))
         
         # Calculate density (per 1000 words)
-        word_count = len(re.findall(r'\b\w+\b', text))
+        word_count = view.word_count
         textual_density = (textual_markers / word_count) * 1000 if word_count else 0
         interpersonal_density = (interpersonal_markers / word_count) * 1000 if word_count else 0
         epistemic_density = (epistemic_markers / word_count) * 1000 if word_count else 0
@@ -316,7 +504,7 @@ class AcademicMetricsCalculator:
             'recommendations': self._get_metadiscourse_recommendations(textual_density, interpersonal_density)
         }
 
-    def _calculate_intertextuality(self, text: str, doc) -> Dict[str, Any]:
+    def _calculate_intertextuality(self, view: TextView, doc) -> Dict[str, Any]:
         """
         Dimension 6: Intertextuality
         Detects citations, references, and reported speech
@@ -331,14 +519,11 @@ class AcademicMetricsCalculator:
             r'conforme\s+[A-Z][a-z]+',     # conforme Author
         ]
         
+        text = view.text
         citation_count = sum(len(re.findall(pattern, text)) for pattern in citation_patterns)
         
         # Reported speech markers
-        reported_speech_markers = [
-            'afirma que', 'declara que', 'sustenta que', 'argumenta que',
-            'defende que', 'propõe que', 'considera que', 'aponta que'
-        ]
-        reported_speech = sum(1 for marker in reported_speech_markers if marker in text.lower())
+        reported_speech = view.match(self.marker_matcher).count(('reported_speech',))
         
         # Reference integration quality
         integration_quality = self._assess_citation_integration(text)
@@ -346,7 +531,7 @@ class AcademicMetricsCalculator:
         # Bibliography dialogue
         bibliography_dialogue = self._assess_bibliography_dialogue(text)
         
-        word_count = len(re.findall(r'\b\w+\b', text))
+        word_count = view.word_count
         citation_density = (citation_count / word_count) * 1000 if word_count else 0
         
         raw_score = (
@@ -369,32 +554,25 @@ class AcademicMetricsCalculator:
             'recommendations': self._get_intertextuality_recommendations(citation_density, reported_speech)
         }
 
-    def _calculate_methodological_rigor(self, text: str, doc) -> Dict[str, Any]:
+    def _calculate_methodological_rigor(self, view: TextView, doc) -> Dict[str, Any]:
         """
         Dimension 7: Methodological Rigor
         Assesses clarity and completeness of methodological exposition
         """
-        text_lower = text.lower()
-        
-        # Methodological keywords
-        objective_keywords = ['objetivo', 'objetivos', 'meta', 'finalidade', 'propósito']
-        hypothesis_keywords = ['hipótese', 'hipóteses', 'suposição', 'pressuposto']
-        method_keywords = ['método', 'metodologia', 'procedimento', 'técnica', 'abordagem']
-        sample_keywords = ['amostra', 'corpus', 'população', 'participantes', 'sujeitos']
-        analysis_keywords = ['análise', 'exame', 'investigação', 'estudo', 'avaliação']
+        matches = view.match(self.marker_matcher)
         
         # Count presence of methodological elements
-        has_objectives = any(keyword in text_lower for keyword in objective_keywords)
-        has_hypothesis = any(keyword in text_lower for keyword in hypothesis_keywords)
-        has_method = any(keyword in text_lower for keyword in method_keywords)
-        has_sample = any(keyword in text_lower for keyword in sample_keywords)
-        has_analysis = any(keyword in text_lower for keyword in analysis_keywords)
+        has_objectives = matches.found(('methodological', 'objectives'))
+        has_hypothesis = matches.found(('methodological', 'hypothesis'))
+        has_method = matches.found(('methodological', 'method'))
+        has_sample = matches.found(('methodological', 'sample'))
+        has_analysis = matches.found(('methodological', 'analysis'))
         
         # Methodological language precision
-        precision_score = self._assess_methodological_language(text)
+        precision_score = self._assess_methodological_language(view.text)
         
         # Procedural clarity
-        procedural_clarity = self._assess_procedural_clarity(text)
+        procedural_clarity = self._assess_procedural_clarity(view.text)
         
         # Calculate components
         component_score = (has_objectives + has_hypothesis + has_method + 
@@ -419,11 +597,13 @@ class AcademicMetricsCalculator:
             )
         }
 
-    def _calculate_style_adequacy(self, text: str, doc, domain: str, level: str) -> Dict[str, Any]:
+    def _calculate_style_adequacy(self, view: TextView, doc, domain: str, level: str) -> Dict[str, Any]:
         """
         Dimension 8: Style and Adequacy
         Evaluates conformity with academic genre and linguistic norms
         """
+        text = view.text
+
         # Impersonality assessment
         impersonality = self._assess_impersonality(text, doc)
         
@@ -462,87 +642,65 @@ class AcademicMetricsCalculator:
         }
 
     # Helper methods for detailed calculations
-    def _detect_introduction(self, paragraphs: List[str]) -> bool:
-        """Detect if text has an introduction"""
-        if not paragraphs:
+    def _detect_introduction(self, view: TextView) -> bool:
+        """Detect if text has an introduction (marker in the first paragraph)"""
+        if not view.paragraph_spans:
             return False
-        first_para = paragraphs[0].lower()
-        intro_markers = ['este trabalho', 'este artigo', 'este estudo', 'esta pesquisa', 
-                        'o objetivo', 'pretende-se', 'busca-se', 'visa-se']
-        return any(marker in first_para for marker in intro_markers)
-
-    def _detect_conclusion(self, paragraphs: List[str]) -> bool:
-        """Detect if text has a conclusion"""
-        if not paragraphs:
+        return self._has_marker_in(view, ('introduction',), view.paragraph_spans[0])
+
+    def _detect_conclusion(self, view: TextView) -> bool:
+        """Detect if text has a conclusion (marker in the last paragraph)"""
+        if not view.paragraph_spans:
             return False
-        last_para = paragraphs[-1].lower()
-        conclusion_markers = ['conclui-se', 'em conclusão', 'portanto', 'assim', 
-                             'em suma', 'finalmente', 'por fim']
-        return any(marker in last_para for marker in conclusion_markers)
+        return self._has_marker_in(view, ('conclusion',), view.paragraph_spans[-1])
+
+    def _has_marker_in(self, view: TextView, category: Tuple, span: Tuple[int, int]) -> bool:
+        """Whether a marker of ``category`` lies inside the character ``span``"""
+        start, end = span
+        return any(
+            start <= marker_start and marker_end <= end
+            for marker_start, marker_end, _ in view.match(self.marker_matcher).get_spans(category)
+        )
 
-    def _count_argumentative_markers(self, text: str) -> int:
+    def _count_argumentative_markers(self, view: TextView) -> int:
         """Count argumentative discourse markers"""
-        text_lower = text.lower()
-        markers = ['por outro lado', 'em contrapartida', 'no entanto', 'contudo', 
-                  'além disso', 'ademais', 'por conseguinte', 'dessa forma']
-        return sum(1 for marker in markers if marker in text_lower)
+        return view.match(self.marker_matcher).count(('argumentative',))
 
-    def _calculate_thematic_progression(self, paragraphs: List[str]) -> float:
+    def _calculate_thematic_progression(self, view: TextView) -> float:
         """Assess thematic consistency across paragraphs"""
-        if len(paragraphs) < 2:
+        if len(view.paragraph_spans) < 2:
             return 0.5
         
         # Simple keyword overlap between consecutive paragraphs
         similarities = []
-        for i in range(len(paragraphs) - 1):
-            words1 = set(re.findall(r'\b\w+\b', paragraphs[i].lower()))
-            words2 = set(re.findall(r'\b\w+\b', paragraphs[i + 1].lower()))
+        paragraph_words = [set(view.paragraph_words(i)) for i in range(len(view.paragraph_spans))]
+        for i in range(len(paragraph_words) - 1):
+            words1 = paragraph_words[i]
+            words2 = paragraph_words[i + 1]
             if words1 and words2:
                 similarity = len(words1 & words2) / len(words1 | words2)
                 similarities.append(similarity)
         
         return np.mean(similarities) if similarities else 0.5
 
-    def _calculate_mtld(self, words: List[str]) -> float:
-        """Calculate MTLD (Measure of Textual Lexical Diversity)"""
-        if len(words) < 50:
-            return len(set(words)) / len(words) if words else 0
-        
-        # Simplified MTLD calculation
-        ttr_threshold = 0.72
-        segments = []
-        current_segment = []
-        
-        for word in words:
-            current_segment.append(word)
-            current_ttr = len(set(current_segment)) / len(current_segment)
-            if current_ttr <= ttr_threshold:
-                segments.append(len(current_segment))
-                current_segment = []
-        
-        return np.mean(segments) if segments else len(words)
-
-    def _calculate_referential_cohesion(self, text: str, doc) -> float:
+    def _calculate_referential_cohesion(self, view: TextView, doc) -> float:
         """Calculate referential cohesion (pronouns, determiners)"""
         if not doc:
             # Fallback: count pronouns and determiners manually
-            pronouns = re.findall(r'\b(ele|ela|isso|isto|aquilo|seu|sua|dele|dela)\b', text.lower())
-            words = re.findall(r'\b\w+\b', text)
-            return len(pronouns) / len(words) if words else 0
+            pronouns = sum(1 for word in view.words if word in FALLBACK_PRONOUNS)
+            return pronouns / view.word_count if view.words else 0
         
         # Use spaCy POS tags
         pronouns = sum(1 for token in doc if token.pos_ in ['PRON', 'DET'])
         return pronouns / len(doc) if doc else 0
 
-    def _calculate_connector_density(self, text: str) -> float:
+    def _calculate_connector_density(self, view: TextView) -> float:
         """Calculate density of discourse connectors"""
-        text_lower = text.lower()
-        all_connectors = []
-        for connector_list in self.discourse_connectors.values():
-            all_connectors.extend(connector_list)
-        
-        connector_count = sum(1 for connector in all_connectors if connector in text_lower)
-        words = re.findall(r'\b\w+\b', text)
+        matches = view.match(self.marker_matcher)
+        connector_count = sum(
+            matches.count(('connector', kind)) for kind in self.discourse_connectors
+        )
+        words = view.words
         return (connector_count / len(words)) * 100 if words else 0  # Per 100 words
 
     def _empty_results(self) -> Dict[str, Any]:
@@ -571,4 +729,50 @@ class AcademicMetricsCalculator:
         }
 
     # Additional helper methods would continue here...
-    # (Implementation of remaining helper methods for brevity)
\ No newline at end of file
+    # (Implementation of remaining helper methods for brevity)
+
+
+# Calculator of a corpus worker process (set by ``_init_corpus_worker``)
+_worker_calculator = None
+
+
+def _init_corpus_worker(config: ProductionNLPConfig) -> None:
+    """Build the calculator of a new corpus worker process"""
+    global _worker_calculator
+    _worker_calculator = AcademicMetricsCalculator(config)
+
+
+def _score_corpus_batch(batch: List[Tuple[int, str]], domain: str, level: str,
+                        batch_size: int,
+                        calculator: Optional[AcademicMetricsCalculator] = None
+                        ) -> List[Dict[str, Any]]:
+    """
+    Parse and score one batch of (index, text) pairs into flat rows, with
+    ``calculator`` or, in a worker process, the worker's calculator
+    """
+    calculator = calculator or _worker_calculator
+    texts = [text for _, text in batch]
+    nlp = calculator.nlp
+    docs = nlp.pipe(texts, batch_size=batch_size) if nlp else [None] * len(texts)
+
+    rows = []
+    for (index, text), doc in zip(batch, docs):
+        results = calculator.calculate_all_dimensions(text, domain, level, doc=doc)
+        rows.append({'index': index, **_flatten_results(results)})
+    return rows
+
+
+def _flatten_results(results: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten ``calculate_all_dimensions`` output into scalar columns"""
+    overall = results.get('overall_score', {})
+    row = {}
+    for dimension, data in results.items():
+        if dimension == 'overall_score':
+            continue
+        row[dimension] = data.get('score')
+        for detail, value in data.get('details', {}).items():
+            if isinstance(value, (bool, int, float, str, np.number)):
+                row[f"{dimension}.{detail}"] = value
+    row['overall_score'] = overall.get('score')
+    row['performance_level'] = overall.get('performance_level')
+    return row
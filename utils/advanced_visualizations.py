@@ -13,8 +13,8 @@ from plotly.subplots import make_subplots
 import numpy as np
 import pandas as pd
 from typing import Dict, List, Tuple, Any
-import re
-from collections import defaultdict
+
+from utils.sentence_scores import SENTENCE_MEASURES, get_sentence_scores, sentence_labels
 
 class LEXAVisualizations:
     """Advanced visualization system for LEXA academic analysis"""
@@ -239,50 +239,31 @@ class LEXAVisualizations:
         return fig
 
     def create_text_heatmap(self, text: str, problems: List[Dict], 
-                           analysis_results: Dict) -> go.Figure:
+                           analysis_results: Dict, max_rows: int = 60) -> go.Figure:
         """
         Create textual heat map highlighting problem areas
+
+        Uses the sentence-level scores of the analysed document; long texts
+        are averaged into at most ``max_rows`` rows of consecutive sentences.
         """
-        sentences = re.split(r'[.!?]+', text)
-        sentences = [s.strip() for s in sentences if s.strip()]
-        
-        if not sentences:
+        doc = (analysis_results or {}).get("doc")
+        if doc is None or not text.strip():
             return self._create_empty_heatmap()
-        
-        # Calculate problem density per sentence
-        sentence_problems = defaultdict(list)
-        sentence_scores = []
-        
-        for i, sentence in enumerate(sentences):
-            # Simple problem detection based on length and complexity
-            words = len(sentence.split())
-            
-            # Score based on multiple factors
-            length_score = min(1.0, words / 25)  # Optimal ~25 words
-            
-            # Check for specific issues
-            issues = 0
-            if words < 5:  # Too short
-                issues += 1
-            if words > 40:  # Too long
-                issues += 1
-            if sentence.count(',') / words > 0.15 if words > 0 else False:  # Too many commas
-                issues += 1
-            if not re.search(r'[.!?]$', sentence):  # Missing punctuation
-                issues += 1
-            
-            issue_score = max(0, 1 - (issues * 0.25))
-            final_score = (length_score + issue_score) / 2
-            sentence_scores.append(final_score)
-        
-        # Create heatmap data
-        y_labels = [f"Sentença {i+1}" for i in range(len(sentences))]
-        z_values = [[score] for score in sentence_scores]
-        
+
+        sentence_scores = get_sentence_scores(doc)
+        if not sentence_scores.n_sents:
+            return self._create_empty_heatmap()
+
+        row_starts, matrix = sentence_scores.downsample(max_rows)
+        y_labels = sentence_labels(row_starts, sentence_scores.n_sents)
+        z_values = matrix / 100
+
         fig = go.Figure(data=go.Heatmap(
             z=z_values,
             y=y_labels,
-            x=['Qualidade'],
+            x=[name for _, name in SENTENCE_MEASURES],
+            zmin=0,
+            zmax=1,
             colorscale=[
                 [0, '#f44336'],      # Red (poor)
                 [0.25, '#ff9800'],   # Orange
@@ -290,11 +271,11 @@ class LEXAVisualizations:
                 [0.75, '#4caf50'],   # Green
                 [1, '#2196f3']       # Blue (excellent)
             ],
-            text=[[f"{score:.2f}"] for score in sentence_scores],
+            text=np.where(np.isnan(z_values), "", np.char.mod("%.2f", z_values)),
             texttemplate="%{text}",
             textfont={"size": 10, "color": "white"},
             hoverongaps=False,
-            hovertemplate='Sentença: %{y}<br>Qualidade: %{z:.2f}<extra></extra>'
+            hovertemplate='Sentença: %{y}<br>%{x}: %{z:.2f}<extra></extra>'
         ))
         
         fig.update_layout(
@@ -304,11 +285,11 @@ class LEXAVisualizations:
                 font=dict(color=self.colors['text'], size=16, family="Arial")
             ),
             xaxis=dict(color=self.colors['text']),
-            yaxis=dict(color=self.colors['text']),
+            yaxis=dict(color=self.colors['text'], autorange='reversed'),
             paper_bgcolor='rgba(0,0,0,0)',
             plot_bgcolor='rgba(0,0,0,0)',
             font=dict(color=self.colors['text'], family="Arial"),
-            height=max(400, len(sentences) * 25),
+            height=max(400, len(y_labels) * 25),
             margin=dict(l=100, r=100, t=80, b=50)
         )
         
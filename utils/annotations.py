@@ -0,0 +1,188 @@
+"""
+Compact, sorted table of text annotations.
+
+An annotation is a ``(start, end, severity, code)`` record: a character
+span, a severity code (see ``SEVERITIES``) and the code of its issue.
+Issues (dimension, metric, issue type and description) are interned
+once per table, so texts with thousands of flagged tokens hold one small
+NumPy record per flag instead of one dictionary each. ``AnnotationBuilder``
+indexes issues by metric, so "does this metric have annotations yet" is a
+dictionary lookup rather than a scan of everything emitted so far.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# Severity names by code (higher code, more severe)
+SEVERITIES = ("low", "medium", "high")
+SEVERITY_CODES = {name: code for code, name in enumerate(SEVERITIES)}
+
+ANNOTATION_DTYPE = np.dtype(
+    [("start", np.int64), ("end", np.int64), ("severity", np.int8), ("code", np.int32)]
+)
+
+
+@dataclass
+class AnnotationTable:
+    """Annotations sorted by start offset (longer spans first on ties)."""
+
+    records: np.ndarray
+    issues: List[Dict[str, str]]
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def filter(
+        self,
+        severities: Optional[Iterable[str]] = None,
+        dimensions: Optional[Iterable[str]] = None,
+    ) -> "AnnotationTable":
+        """
+        Keep the annotations of the given severities and dimensions.
+
+        Args:
+            severities (Optional[Iterable[str]]): Severity names to keep
+                (all when omitted)
+            dimensions (Optional[Iterable[str]]): Dimension names to keep
+                (all when omitted or empty)
+
+        Returns:
+            AnnotationTable: Filtered table sharing the issue list
+        """
+        mask = np.ones(len(self.records), dtype=bool)
+        if severities is not None:
+            codes = [SEVERITY_CODES[name] for name in severities]
+            mask &= np.isin(self.records["severity"], codes)
+        if dimensions:
+            dimensions = set(dimensions)
+            issue_codes = [
+                code
+                for code, issue in enumerate(self.issues)
+                if issue["dimension"] in dimensions
+            ]
+            mask &= np.isin(self.records["code"], issue_codes)
+        return AnnotationTable(records=self.records[mask], issues=self.issues)
+
+    def between(self, start: int, end: int) -> "AnnotationTable":
+        """
+        Keep the annotations overlapping ``[start, end)``.
+
+        Args:
+            start (int): Window start offset
+            end (int): Window end offset
+
+        Returns:
+            AnnotationTable: Filtered table sharing the issue list
+        """
+        records = self.records[
+            : np.searchsorted(self.records["start"], end, side="left")
+        ]
+        return AnnotationTable(
+            records=records[records["end"] > start], issues=self.issues
+        )
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """
+        Expand the records into annotation dictionaries.
+
+        Returns:
+            List[Dict[str, Any]]: ``span_start``, ``span_end``, ``severity``
+            and the issue fields of every annotation, in table order
+        """
+        return [
+            {
+                "span_start": start,
+                "span_end": end,
+                "severity": SEVERITIES[severity],
+                **self.issues[code],
+            }
+            for start, end, severity, code in self.records.tolist()
+        ]
+
+
+class AnnotationBuilder:
+    """Accumulates annotation records and their interned issues."""
+
+    def __init__(self):
+        self.issues: List[Dict[str, str]] = []
+        self.metric_issues: Dict[str, List[int]] = {}
+        self._issue_codes: Dict[Tuple[str, ...], int] = {}
+        self._chunks: List[np.ndarray] = []
+
+    def issue(
+        self, dimension: str, metric: str, issue_type: str, description: str
+    ) -> int:
+        """
+        Return the code of an issue, registering it on first use.
+
+        Args:
+            dimension (str): Dimension name
+            metric (str): Metric name
+            issue_type (str): Short issue label
+            description (str): Issue description
+
+        Returns:
+            int: Issue code
+        """
+        key = (dimension, metric, issue_type, description)
+        code = self._issue_codes.get(key)
+        if code is None:
+            code = self._issue_codes[key] = len(self.issues)
+            self.issues.append(
+                {
+                    "dimension": dimension,
+                    "metric": metric,
+                    "issue_type": issue_type,
+                    "description": description,
+                }
+            )
+            self.metric_issues.setdefault(metric, []).append(code)
+        return code
+
+    def has_metric(self, metric: str) -> bool:
+        """Whether an annotation was added for ``metric``."""
+        return metric in self.metric_issues
+
+    def add(self, starts, ends, severity: str, code: int) -> None:
+        """
+        Add annotations sharing a severity and an issue.
+
+        Args:
+            starts: Start offset, or sequence of start offsets
+            ends: End offset(s), matching ``starts``
+            severity (str): Severity name
+            code (int): Issue code from :meth:`issue`
+        """
+        starts = np.atleast_1d(np.asarray(starts, dtype=np.int64))
+        chunk = np.empty(len(starts), dtype=ANNOTATION_DTYPE)
+        chunk["start"] = starts
+        chunk["end"] = np.atleast_1d(np.asarray(ends, dtype=np.int64))
+        chunk["severity"] = SEVERITY_CODES[severity]
+        chunk["code"] = code
+        self._chunks.append(chunk)
+
+    def build(self) -> AnnotationTable:
+        """
+        Sort the records and drop exact duplicates.
+
+        Returns:
+            AnnotationTable: The annotations
+        """
+        if self._chunks:
+            records = np.concatenate(self._chunks)
+        else:
+            records = np.empty(0, dtype=ANNOTATION_DTYPE)
+        # One stable sort; longer spans first so they enclose shorter ones
+        order = np.lexsort(
+            (records["code"], records["severity"], -records["end"], records["start"])
+        )
+        records = records[order]
+        if len(records) > 1:
+            keep = np.ones(len(records), dtype=bool)
+            keep[1:] = records[1:] != records[:-1]
+            records = records[keep]
+        return AnnotationTable(records=records, issues=self.issues)
@@ -0,0 +1,25 @@
+"""
+Batching of lazily consumed input streams.
+"""
+
+from itertools import islice
+from typing import Any, Iterable, Iterator, List
+
+
+def batched(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """
+    Split ``items`` into lists of at most ``size`` elements.
+
+    Args:
+        items (Iterable[Any]): Input items, consumed lazily
+        size (int): Maximum batch length (at least one item per batch)
+
+    Returns:
+        Iterator[List[Any]]: Consecutive batches, in input order
+    """
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, max(1, size)))
+        if not batch:
+            return
+        yield batch
@@ -0,0 +1,150 @@
+"""
+Chunked parsing of long documents.
+
+Very long texts are split on paragraph boundaries, parsed chunk by chunk
+and merged back into one ``Doc`` whose character offsets match the
+original string.
+"""
+
+from typing import Iterable, List
+
+from spacy.tokens import Doc
+
+# spaCy's own estimate of parser/NER working memory (~1GB per 100,000 chars)
+PARSE_BYTES_PER_CHAR = 10 * 1024
+
+
+def parse_in_chunks(
+    nlp,
+    text: str,
+    chunk_chars: int,
+    memory_mb: int,
+    n_process: int = 1,
+    disable: Iterable[str] = (),
+) -> Doc:
+    """
+    Parse ``text`` in paragraph-aligned chunks and merge them with ``Doc.from_docs``.
+
+    Chunk size and the number of chunks buffered by ``nlp.pipe`` are bounded
+    so the estimated parser memory stays below ``memory_mb``. Chunk
+    boundaries always start a new sentence.
+
+    Args:
+        nlp (spacy.language.Language): Loaded spaCy model
+        text (str): Input text
+        chunk_chars (int): Maximum characters per chunk
+        memory_mb (int): Parser memory ceiling in megabytes
+        n_process (int): Number of worker processes used by ``nlp.pipe``
+        disable (Iterable[str]): Pipeline components to skip
+
+    Returns:
+        Doc: Processed document covering the whole text
+    """
+    disable = list(disable)
+    memory_bytes = memory_mb * 1024 * 1024
+
+    # A single chunk must fit under the ceiling, and so must a whole batch
+    chunk_chars = max(1, min(chunk_chars, memory_bytes // PARSE_BYTES_PER_CHAR))
+    batch_size = max(1, memory_bytes // (chunk_chars * PARSE_BYTES_PER_CHAR))
+
+    chunks = split_into_chunks(text, chunk_chars)
+    if len(chunks) == 1:
+        return nlp(text, disable=disable)
+
+    docs = nlp.pipe(
+        chunks, batch_size=batch_size, n_process=n_process, disable=disable
+    )
+    # Chunks keep their separators, so no whitespace may be inserted between them
+    return Doc.from_docs(list(docs), ensure_whitespace=False)
+
+
+def split_into_chunks(text: str, max_chars: int) -> List[str]:
+    """
+    Split text into chunks of about ``max_chars`` on paragraph boundaries.
+
+    The chunks always concatenate back to ``text``. Line breaks between
+    chunks are carried to the start of the following chunk (which may then
+    exceed ``max_chars`` by that whitespace). A single paragraph longer than
+    ``max_chars`` is cut at the last whitespace that fits (or hard-cut when
+    it has none).
+
+    Args:
+        text (str): Input text
+        max_chars (int): Maximum characters per chunk
+
+    Returns:
+        List[str]: Consecutive chunks covering the whole text
+    """
+    max_chars = max(1, max_chars)
+    chunks = []
+    current = ""
+
+    for paragraph in text.splitlines(keepends=True):
+        if current and len(current) + len(paragraph) > max_chars:
+            chunks.append(current)
+            current = ""
+
+        while len(paragraph) > max_chars:
+            cut = max(
+                paragraph.rfind(" ", 0, max_chars), paragraph.rfind("\t", 0, max_chars)
+            )
+            cut = cut + 1 if cut > 0 else max_chars
+            chunks.append(paragraph[:cut])
+            paragraph = paragraph[cut:]
+
+        current += paragraph
+
+    if current or not chunks:
+        chunks.append(current)
+
+    return _carry_line_breaks(chunks)
+
+
+def split_into_paragraphs(text: str) -> List[str]:
+    """
+    Split text into one segment per paragraph (non-blank line).
+
+    The segments always concatenate back to ``text``. As in
+    :func:`split_into_chunks`, the line breaks after a paragraph start the
+    next segment, so blank lines never form a segment of their own.
+
+    Args:
+        text (str): Input text
+
+    Returns:
+        List[str]: Consecutive paragraph segments covering the whole text
+    """
+    segments = []
+    pending = ""
+    for line in text.splitlines(keepends=True):
+        pending += line
+        if line.strip():
+            segments.append(pending)
+            pending = ""
+
+    if pending:
+        if segments:
+            segments[-1] += pending
+        else:
+            segments.append(pending)
+
+    return _carry_line_breaks(segments or [text])
+
+
+def _carry_line_breaks(chunks: List[str]) -> List[str]:
+    """
+    Move the line breaks ending each chunk to the start of the next one.
+
+    The break is then tokenized (and sentence-split) exactly as in a single
+    parse. A single leading space stays behind as the last token's
+    whitespace.
+    """
+    for i in range(len(chunks) - 1):
+        body = chunks[i].rstrip()
+        tail = chunks[i][len(body) :]
+        if tail.startswith(" "):
+            body, tail = body + " ", tail[1:]
+        if body and tail:
+            chunks[i], chunks[i + 1] = body, tail + chunks[i + 1]
+
+    return chunks
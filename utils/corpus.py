@@ -0,0 +1,115 @@
+import multiprocessing
+from collections import deque
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from utils.batching import batched
+from utils.metrics import calculate_metrics, get_required_annotations, select_metrics
+from utils.processing import get_nlp_model, process_texts
+from utils.recommendations import generate_recommendations
+
+
+def analyze_corpus(
+    texts: Iterable[str],
+    language: str = "pt",
+    domain: str = "Acadêmico",
+    genre: str = "Artigo Científico",
+    audience: str = "Acadêmico",
+    batch_size: int = 32,
+    n_process: int = 1,
+    dimensions: Optional[Iterable[str]] = None,
+    metrics: Optional[Iterable[Tuple[str, str]]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Analyse a stream of texts and yield metrics and recommendations for each.
+
+    Texts are grouped into batches of ``batch_size`` and parsed with
+    ``nlp.pipe``. With ``n_process > 1`` every batch is parsed, scored and
+    turned into recommendations inside a worker process, so only the
+    (small) result dictionaries travel back to the caller. Each worker
+    process holds its own copy of the spaCy pipeline (around 1 GB for the
+    large models), loaded once through ``utils.models.get_model`` when the
+    worker starts, so memory grows with ``n_process``. Selecting
+    ``dimensions`` or ``metrics`` restricts both the scoring and the
+    pipeline components run to what those metrics need.
+
+    Args:
+        texts (Iterable[str]): Input texts, consumed lazily
+        language (str): Language code
+        domain (str): Text domain
+        genre (str): Text genre
+        audience (str): Target audience level
+        batch_size (int): Number of texts per batch
+        n_process (int): Number of worker processes
+        dimensions (Optional[Iterable[str]]): Dimensions to score (all
+            when neither ``dimensions`` nor ``metrics`` is given)
+        metrics (Optional[Iterable[Tuple[str, str]]]): Individual
+            (dimension, metric) pairs to score
+
+    Returns:
+        Iterator[Dict[str, Any]]: One result per text, in input order, with
+        ``index``, ``metrics`` and ``recommendations`` keys
+    """
+    batches = batched(enumerate(texts), batch_size)
+    selected = select_metrics(dimensions, metrics)
+    params = (language, domain, genre, audience, batch_size, selected)
+
+    if n_process <= 1:
+        for batch in batches:
+            yield from _analyze_batch(batch, *params)
+        return
+
+    with multiprocessing.Pool(
+        processes=n_process, initializer=_init_worker, initargs=(language,)
+    ) as pool:
+        # Keep a bounded number of batches in flight so large corpora are
+        # never fully materialised in memory
+        pending = deque()
+        for batch in batches:
+            pending.append(pool.apply_async(_analyze_batch, (batch, *params)))
+            if len(pending) >= n_process * 2:
+                yield from pending.popleft().get()
+
+        while pending:
+            yield from pending.popleft().get()
+
+
+def _init_worker(language: str) -> None:
+    """Load the pipeline of ``language`` once in a new worker process."""
+    get_nlp_model(language)
+
+
+def _analyze_batch(
+    batch: List[Tuple[int, str]],
+    language: str,
+    domain: str,
+    genre: str,
+    audience: str,
+    batch_size: int,
+    selected: List[Tuple[str, str]],
+) -> List[Dict[str, Any]]:
+    """Parse, score and generate recommendations for one batch of texts."""
+    indices = [index for index, _ in batch]
+    docs = process_texts(
+        (text for _, text in batch),
+        language=language,
+        batch_size=batch_size,
+        annotations=get_required_annotations(selected),
+    )
+
+    results = []
+    for index, doc in zip(indices, docs):
+        metrics = calculate_metrics(
+            doc, domain=domain, genre=genre, audience=audience, metrics=selected
+        )
+        recommendations = (
+            generate_recommendations(
+                doc, metrics, domain=domain, genre=genre, audience=audience
+            )
+            if metrics["dimensions"]
+            else []
+        )
+        results.append(
+            {"index": index, "metrics": metrics, "recommendations": recommendations}
+        )
+
+    return results
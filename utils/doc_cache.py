@@ -0,0 +1,167 @@
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Iterable, Optional, Union
+
+from spacy.tokens import Doc, DocBin
+
+logger = logging.getLogger(__name__)
+
+
+class DocCache:
+    """
+    Content-addressed cache of parsed documents.
+
+    Recent Docs are kept in a bounded in-memory LRU. Entries evicted from
+    memory spill to a ``DocBin`` file on disk, and the on-disk store is
+    trimmed (least recently used first) whenever it exceeds ``max_disk_bytes``.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 16,
+        cache_dir: Optional[Union[str, Path]] = None,
+        max_disk_bytes: int = 512 * 1024 * 1024,
+    ):
+        self.max_entries = max(1, max_entries)
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.max_disk_bytes = max_disk_bytes
+        self._memory: "OrderedDict[str, Doc]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(
+        text: str,
+        language: str,
+        nlp,
+        components: Iterable[str] = (),
+        mode: str = "full",
+    ) -> str:
+        """
+        Build the cache key for ``text`` parsed by ``nlp``.
+
+        Args:
+            text (str): Input text
+            language (str): Language code
+            nlp (spacy.language.Language): Pipeline used for parsing
+            components (Iterable[str]): Pipeline components that were run
+            mode (str): How the text was parsed ("full" or "incremental")
+
+        Returns:
+            str: Hex digest identifying text, language, model and parse mode
+        """
+        meta = getattr(nlp, "meta", {}) or {}
+        model_id = "|".join(
+            [
+                language,
+                str(meta.get("lang", "")),
+                str(meta.get("name", "")),
+                str(meta.get("version", "")),
+                ",".join(components),
+                mode,
+            ]
+        )
+        text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return hashlib.sha256(f"{text_hash}|{model_id}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str, vocab) -> Optional[Doc]:
+        """
+        Return the cached Doc for ``key``, or ``None`` on a miss.
+
+        Args:
+            key (str): Cache key from :meth:`make_key`
+            vocab (spacy.vocab.Vocab): Vocabulary used to restore spilled Docs
+
+        Returns:
+            Optional[Doc]: Cached document
+        """
+        with self._lock:
+            doc = self._memory.get(key)
+            if doc is not None:
+                self._memory.move_to_end(key)
+                return doc
+
+            doc = self._load(key, vocab)
+            if doc is not None:
+                self._store(key, doc)
+            return doc
+
+    def put(self, key: str, doc: Doc) -> None:
+        """
+        Insert ``doc`` under ``key``, spilling the oldest entries to disk.
+
+        Args:
+            key (str): Cache key from :meth:`make_key`
+            doc (Doc): Parsed document
+        """
+        with self._lock:
+            self._store(key, doc)
+
+    def clear(self) -> None:
+        """Drop every in-memory entry (the on-disk store is left untouched)."""
+        with self._lock:
+            self._memory.clear()
+
+    def _store(self, key: str, doc: Doc) -> None:
+        self._memory[key] = doc
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            old_key, old_doc = self._memory.popitem(last=False)
+            self._spill(old_key, old_doc)
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.spacy"
+
+    def _spill(self, key: str, doc: Doc) -> None:
+        if self.cache_dir is None:
+            return
+
+        path = self._path(key)
+        try:
+            if not path.exists():
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                # Derived data in user_data (feature tables etc.) is not persisted
+                doc_bin = DocBin(store_user_data=False)
+                doc_bin.add(doc)
+                doc_bin.to_disk(path)
+            self._trim_disk()
+        except OSError as e:
+            logger.warning(f"Could not spill parsed document to {path}: {e}")
+
+    def _load(self, key: str, vocab) -> Optional[Doc]:
+        if self.cache_dir is None:
+            return None
+
+        path = self._path(key)
+        if not path.exists():
+            return None
+
+        try:
+            docs = list(DocBin().from_disk(path).get_docs(vocab))
+            # Refresh the access time used for LRU trimming of the disk store
+            os.utime(path)
+        except Exception as e:
+            # A truncated or corrupt spill file is dropped and treated as a miss
+            logger.warning(f"Could not load cached document from {path}: {e}")
+            try:
+                path.unlink(missing_ok=True)
+            except OSError:
+                pass
+            return None
+
+        return docs[0] if docs else None
+
+    def _trim_disk(self) -> None:
+        files = [
+            (entry.stat().st_mtime, entry.stat().st_size, entry)
+            for entry in self.cache_dir.glob("*.spacy")
+        ]
+        total = sum(size for _, size, _ in files)
+        for _, size, entry in sorted(files, key=lambda item: item[0]):
+            if total <= self.max_disk_bytes:
+                break
+            entry.unlink(missing_ok=True)
+            total -= size
@@ -0,0 +1,177 @@
+"""
+Paragraph, sentence and token index of a processed document.
+
+Paragraphs are the non-blank lines of ``doc.text`` (the same segmentation
+used by ``segment_text``). Their character spans are computed once and
+sentences are assigned to them in a single merge pass over character
+offsets, so "which paragraph is this sentence in" and "which sentences
+does this paragraph hold" are constant-time lookups. The character span
+of every token is kept as well, so evidence recorded as token ids maps
+to text offsets without touching the Doc. (The sentence of a token is
+``DocFeatures.sent_id``; see ``utils.features``.)
+"""
+
+from dataclasses import dataclass
+from typing import Any, List, Tuple
+
+# Key under which the index is cached in ``Doc.user_data``
+INDEX_KEY = "lexa_index"
+
+
+@dataclass
+class DocIndex:
+    """Offset-based paragraph/sentence index of a document."""
+
+    sentences: List[Any]
+    paragraph_spans: List[Tuple[int, int]]
+    sent_spans: List[Tuple[int, int]]
+    sent_paragraph: List[int]
+    paragraph_sents: List[Tuple[int, int]]
+    token_starts: List[int]
+    token_ends: List[int]
+
+    @property
+    def n_paragraphs(self) -> int:
+        """Number of (non-blank) paragraphs."""
+        return len(self.paragraph_spans)
+
+    @property
+    def n_sents(self) -> int:
+        """Number of sentences."""
+        return len(self.sent_spans)
+
+    def paragraph_of(self, sent_idx: int) -> int:
+        """Paragraph id of sentence ``sent_idx`` (-1 if it lies between paragraphs)."""
+        return self.sent_paragraph[sent_idx]
+
+    def sentences_of(self, para_idx: int) -> range:
+        """Sentence ids belonging to paragraph ``para_idx``."""
+        start, end = self.paragraph_sents[para_idx]
+        return range(start, end)
+
+    def token_span(self, token_i: int) -> Tuple[int, int]:
+        """Character span of token ``token_i``."""
+        return self.token_starts[token_i], self.token_ends[token_i]
+
+
+def find_paragraph_spans(text: str) -> List[Tuple[int, int]]:
+    """
+    Return the character spans of the non-blank lines of ``text``.
+
+    Args:
+        text (str): Document text
+
+    Returns:
+        List[Tuple[int, int]]: (start_char, end_char) per paragraph
+    """
+    spans = []
+    start = 0
+    length = len(text)
+
+    while start <= length:
+        end = text.find("\n", start)
+        if end == -1:
+            end = length
+        if text[start:end].strip():
+            spans.append((start, end))
+        start = end + 1
+
+    return spans
+
+
+def assign_sentences(
+    paragraph_spans: List[Tuple[int, int]], sent_spans: List[Tuple[int, int]]
+) -> List[int]:
+    """
+    Assign each sentence to the first paragraph it overlaps, in one pass.
+
+    Both span lists must be sorted by start offset (as produced by
+    ``find_paragraph_spans`` and ``doc.sents``).
+
+    Args:
+        paragraph_spans (List[Tuple[int, int]]): Paragraph character spans
+        sent_spans (List[Tuple[int, int]]): Sentence character spans
+
+    Returns:
+        List[int]: Paragraph id per sentence, -1 for sentences made only of
+        the whitespace between paragraphs
+    """
+    assignment = []
+    p = 0
+    n_paragraphs = len(paragraph_spans)
+
+    for start, end in sent_spans:
+        while p < n_paragraphs and paragraph_spans[p][1] <= start:
+            p += 1
+        if p < n_paragraphs and paragraph_spans[p][0] < end:
+            assignment.append(p)
+        else:
+            assignment.append(-1)
+
+    return assignment
+
+
+def build_doc_index(doc) -> DocIndex:
+    """
+    Build the paragraph/sentence/token index of a document.
+
+    Args:
+        doc (spacy.tokens.Doc): Processed spaCy document
+
+    Returns:
+        DocIndex: Paragraph, sentence and token lookup tables
+    """
+    try:
+        sentences = list(doc.sents)
+    except ValueError:
+        # Pipelines without sentence boundaries: treat the doc as one sentence
+        sentences = [doc[:]]
+
+    paragraph_spans = find_paragraph_spans(doc.text)
+    sent_spans = [(sent.start_char, sent.end_char) for sent in sentences]
+    sent_paragraph = assign_sentences(paragraph_spans, sent_spans)
+
+    # Assignment is monotonic, so each paragraph owns a contiguous range
+    paragraph_sents = [(0, 0)] * len(paragraph_spans)
+    for sent_idx, para_idx in enumerate(sent_paragraph):
+        if para_idx < 0:
+            continue
+        start, end = paragraph_sents[para_idx]
+        if start == end:
+            start = sent_idx
+        paragraph_sents[para_idx] = (start, sent_idx + 1)
+
+    token_starts = doc.to_array("IDX")
+    token_ends = token_starts + doc.to_array("LENGTH")
+
+    return DocIndex(
+        sentences=sentences,
+        paragraph_spans=paragraph_spans,
+        sent_spans=sent_spans,
+        sent_paragraph=sent_paragraph,
+        paragraph_sents=paragraph_sents,
+        token_starts=token_starts.tolist(),
+        token_ends=token_ends.tolist(),
+    )
+
+
+def get_doc_index(doc) -> DocIndex:
+    """
+    Return the paragraph/sentence/token index of ``doc``, building it at most once.
+
+    The index is cached in ``doc.user_data`` when the document supports it.
+
+    Args:
+        doc (spacy.tokens.Doc): Processed spaCy document
+
+    Returns:
+        DocIndex: Paragraph, sentence and token lookup tables
+    """
+    user_data = getattr(doc, "user_data", None)
+    if isinstance(user_data, dict) and INDEX_KEY in user_data:
+        return user_data[INDEX_KEY]
+
+    index = build_doc_index(doc)
+    if isinstance(user_data, dict):
+        user_data[INDEX_KEY] = index
+    return index
@@ -0,0 +1,179 @@
+"""
+Sentence embedding matrix of a processed document.
+
+Sentence vectors are the mean of their token vectors (the same definition
+as ``Span.vector``), computed for all sentences at once with
+``np.add.reduceat`` over the token vector table and normalised once.
+Adjacent and windowed cosine similarities are then plain row-wise matrix
+products. The matrix is cached in ``Doc.user_data`` and shared by the
+metrics, recommendations, annotations and heatmaps.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from utils.features import DocFeatures, get_doc_features
+
+# Key under which the embeddings are cached in ``Doc.user_data``
+EMBEDDINGS_KEY = "lexa_embeddings"
+
+# Tokens whose vectors are gathered at once, bounding temporary memory
+_BLOCK_TOKENS = 20000
+
+
+@dataclass
+class SentenceEmbeddings:
+    """Mean token vectors of every sentence, with their unit-norm rows."""
+
+    vectors: np.ndarray
+    norms: np.ndarray
+    unit: np.ndarray
+
+    @property
+    def n_sents(self) -> int:
+        """Number of sentences."""
+        return len(self.vectors)
+
+    def shifted_similarity(self, offset: int = 1, default: float = 0.5) -> np.ndarray:
+        """
+        Cosine similarity between each sentence and the one ``offset`` later.
+
+        Args:
+            offset (int): Distance between the compared sentences
+            default (float): Similarity used when either vector is zero
+
+        Returns:
+            np.ndarray: ``n_sents - offset`` similarities
+        """
+        if offset <= 0 or offset >= self.n_sents:
+            return np.zeros(0)
+
+        similarity = np.einsum("ij,ij->i", self.unit[:-offset], self.unit[offset:])
+        defined = (self.norms[:-offset] > 0) & (self.norms[offset:] > 0)
+        return np.where(defined, similarity, default)
+
+    def adjacent_similarity(self, default: float = 0.5) -> np.ndarray:
+        """Cosine similarity of every pair of consecutive sentences."""
+        return self.shifted_similarity(1, default)
+
+    def window_similarity(self, window: int = 3, default: float = 0.5) -> np.ndarray:
+        """
+        Mean cosine similarity of each sentence to the ``window`` preceding ones.
+
+        Args:
+            window (int): Number of preceding sentences compared
+            default (float): Similarity used when either vector is zero
+
+        Returns:
+            np.ndarray: One value per sentence (``default`` for the first)
+        """
+        totals = np.zeros(self.n_sents)
+        counts = np.zeros(self.n_sents)
+        for offset in range(1, min(window, self.n_sents - 1) + 1):
+            totals[offset:] += self.shifted_similarity(offset, default)
+            counts[offset:] += 1
+
+        return np.divide(
+            totals, counts, out=np.full(self.n_sents, default), where=counts > 0
+        )
+
+
+def _token_vector_rows(
+    doc, start: int, end: int, keys: Optional[np.ndarray]
+) -> np.ndarray:
+    """
+    Vectors of tokens ``start:end`` (zeros for out-of-vocabulary tokens).
+
+    ``keys`` are the ORTH ids of those tokens, or ``None`` when the
+    pipeline has no static vectors.
+    """
+    if keys is None:
+        # Pipelines without static vectors expose the contextual tensor
+        return np.asarray(doc.tensor[start:end], dtype=np.float32)
+
+    vectors = doc.vocab.vectors
+    rows = vectors.find(keys=keys)
+    block = vectors.data[np.maximum(rows, 0)]
+    block[rows < 0] = 0
+    return block
+
+
+def build_sentence_embeddings(doc, features: DocFeatures) -> Optional[SentenceEmbeddings]:
+    """
+    Compute the sentence embedding matrix of a document.
+
+    Args:
+        doc (spacy.tokens.Doc): Processed spaCy document
+        features (DocFeatures): Feature table of the document
+
+    Returns:
+        Optional[SentenceEmbeddings]: ``None`` when the pipeline provides
+        neither static vectors nor a tensor
+    """
+    vocab = getattr(doc, "vocab", None)
+    if vocab is None or not features.n_sents:
+        return None
+
+    if vocab.vectors.size == 0 and getattr(doc.tensor, "size", 0) == 0:
+        return None
+
+    if vocab.vectors.size and vocab.vectors.mode != "default":
+        # Floret vectors are computed from subwords; let spaCy build them
+        vectors = np.vstack([sent.vector for sent in features.sentences])
+    else:
+        starts = np.asarray([start for start, _ in features.sent_bounds])
+        lengths = np.asarray([end - start for start, end in features.sent_bounds])
+        orth = doc.to_array("ORTH") if vocab.vectors.size else None
+        blocks = []
+        first = 0
+        # Gather token vectors block by block, split on sentence boundaries
+        while first < len(starts):
+            last = int(np.searchsorted(starts, starts[first] + _BLOCK_TOKENS))
+            last = max(last, first + 1)
+            block_start = int(starts[first])
+            block_end = int(starts[last]) if last < len(starts) else features.n_tokens
+            keys = None if orth is None else orth[block_start:block_end]
+            rows = _token_vector_rows(doc, block_start, block_end, keys)
+            blocks.append(
+                np.add.reduceat(rows, starts[first:last] - block_start, axis=0)
+            )
+            first = last
+        vectors = np.vstack(blocks) / np.maximum(lengths, 1)[:, None]
+
+    norms = np.linalg.norm(vectors, axis=1)
+    unit = np.divide(
+        vectors,
+        norms[:, None],
+        out=np.zeros_like(vectors, dtype=np.float64),
+        where=norms[:, None] > 0,
+    )
+    return SentenceEmbeddings(vectors=vectors, norms=norms, unit=unit)
+
+
+def get_sentence_embeddings(
+    doc, features: Optional[DocFeatures] = None
+) -> Optional[SentenceEmbeddings]:
+    """
+    Return the sentence embedding matrix of ``doc``, computing it at most once.
+
+    The matrix is cached in ``doc.user_data`` when the document supports it.
+
+    Args:
+        doc (spacy.tokens.Doc): Processed spaCy document
+        features (Optional[DocFeatures]): Precomputed feature table
+
+    Returns:
+        Optional[SentenceEmbeddings]: ``None`` when no vectors are available
+    """
+    user_data = getattr(doc, "user_data", None)
+    if isinstance(user_data, dict) and EMBEDDINGS_KEY in user_data:
+        return user_data[EMBEDDINGS_KEY]
+
+    embeddings = build_sentence_embeddings(doc, get_doc_features(doc, features))
+    if isinstance(user_data, dict):
+        user_data[EMBEDDINGS_KEY] = embeddings
+    return embeddings
@@ -0,0 +1,214 @@
+"""
+Per-document feature table shared by the metric functions.
+
+The table is extracted in a single pass over a processed ``Doc`` and keeps
+token attributes as parallel columns (one list per attribute, indexed by
+token position). Metrics read these columns instead of re-walking the Doc,
+re-materialising ``doc.sents`` and re-reading spaCy string attributes.
+"""
+
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.lexical_diversity import LexicalDiversity, compute_lexical_diversity
+
+# Part-of-speech groups used across the metrics
+CONTENT_POS = ("NOUN", "VERB", "ADJ", "ADV")
+FUNCTION_POS = ("ADP", "AUX", "CCONJ", "DET", "PART", "PRON", "SCONJ")
+NOUN_POS = ("NOUN", "PROPN")
+SUBJECT_DEPS = ("nsubj", "nsubjpass")
+
+# Key under which the table is cached in ``Doc.user_data``
+FEATURES_KEY = "lexa_features"
+
+
+@dataclass
+class DocFeatures:
+    """Columnar view of a processed document."""
+
+    tokens: List[Any]
+    sentences: List[Any]
+    text: str
+    text_lower: str
+    lower: List[str]
+    length: List[int]
+    pos: List[str]
+    dep: List[str]
+    head: List[int]
+    lemma: List[str]
+    lemma_lower: List[str]
+    lemma_id: List[int]
+    # Ids of the lowercased lemmas, local to the document
+    lemma_ids: Dict[str, int]
+    is_stop: List[bool]
+    is_punct: List[bool]
+    is_space: List[bool]
+    mood: List[Any]
+    sent_id: List[int]
+    sent_bounds: List[Tuple[int, int]]
+    entity_count: int
+    # Derived per-document results memoized by the metric modules
+    cache: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def n_tokens(self) -> int:
+        """Number of tokens in the document."""
+        return len(self.pos)
+
+    @property
+    def n_sents(self) -> int:
+        """Number of sentences in the document."""
+        return len(self.sent_bounds)
+
+    def sentence_range(self, sent_idx: int) -> range:
+        """Token positions belonging to sentence ``sent_idx``."""
+        start, end = self.sent_bounds[sent_idx]
+        return range(start, end)
+
+    @cached_property
+    def words(self) -> List[int]:
+        """Positions of tokens that are neither punctuation nor whitespace."""
+        return [
+            i
+            for i in range(self.n_tokens)
+            if not self.is_punct[i] and not self.is_space[i]
+        ]
+
+    @cached_property
+    def content_words(self) -> List[int]:
+        """Positions of non-stopword content words longer than one character."""
+        return [
+            i
+            for i in range(self.n_tokens)
+            if self.pos[i] in CONTENT_POS
+            and not self.is_stop[i]
+            and self.length[i] > 1
+        ]
+
+    @cached_property
+    def lemma_positions(self) -> Dict[int, List[int]]:
+        """Inverted index from lemma id to the sorted positions of its tokens."""
+        index: Dict[int, List[int]] = {}
+        for i, lemma_id in enumerate(self.lemma_id):
+            index.setdefault(lemma_id, []).append(i)
+        return index
+
+    @cached_property
+    def content_diversity(self) -> LexicalDiversity:
+        """Lexical diversity measures over the content-word lemma ids."""
+        return compute_lexical_diversity([self.lemma_id[i] for i in self.content_words])
+
+    @cached_property
+    def sent_subjects(self) -> List[List[int]]:
+        """Positions of grammatical subjects, grouped by sentence."""
+        subjects: List[List[int]] = [[] for _ in range(self.n_sents)]
+        for i, dep in enumerate(self.dep):
+            if dep in SUBJECT_DEPS:
+                subjects[self.sent_id[i]].append(i)
+        return subjects
+
+
+def extract_features(doc) -> DocFeatures:
+    """
+    Build the feature table for a document in a single pass.
+
+    Args:
+        doc (spacy.tokens.Doc): Processed spaCy document
+
+    Returns:
+        DocFeatures: Columnar feature table
+    """
+    try:
+        sentences = list(doc.sents)
+    except ValueError:
+        # Pipelines without sentence boundaries: treat the doc as one sentence
+        sentences = [doc]
+
+    text = doc.text
+    columns: Dict[str, list] = {
+        name: []
+        for name in (
+            "tokens",
+            "lower",
+            "length",
+            "pos",
+            "dep",
+            "head",
+            "lemma",
+            "lemma_lower",
+            "lemma_id",
+            "is_stop",
+            "is_punct",
+            "is_space",
+            "mood",
+            "sent_id",
+        )
+    }
+    sent_bounds = []
+    lemma_ids: Dict[str, int] = {}
+
+    for sent_idx, sent in enumerate(sentences):
+        start = len(columns["tokens"])
+        for token in sent:
+            i = len(columns["tokens"])
+            token_text = token.text
+            lemma = token.lemma_
+            lemma_lower = lemma.lower()
+            head = getattr(token, "head", None)
+            morph = getattr(token, "morph", None)
+            moods = morph.get("Mood") if morph is not None else ()
+
+            columns["tokens"].append(token)
+            columns["lower"].append(token_text.lower())
+            columns["length"].append(len(token_text))
+            columns["pos"].append(token.pos_)
+            columns["dep"].append(token.dep_)
+            columns["head"].append(head.i if head is not None else i)
+            columns["lemma"].append(lemma)
+            columns["lemma_lower"].append(lemma_lower)
+            columns["lemma_id"].append(
+                lemma_ids.setdefault(lemma_lower, len(lemma_ids))
+            )
+            columns["is_stop"].append(token.is_stop)
+            columns["is_punct"].append(token.is_punct)
+            columns["is_space"].append(token.is_space)
+            columns["mood"].append(moods[0] if moods else None)
+            columns["sent_id"].append(sent_idx)
+        sent_bounds.append((start, len(columns["tokens"])))
+
+    return DocFeatures(
+        sentences=sentences,
+        text=text,
+        text_lower=text.lower(),
+        sent_bounds=sent_bounds,
+        lemma_ids=lemma_ids,
+        entity_count=len(getattr(doc, "ents", ())),
+        **columns,
+    )
+
+
+def get_doc_features(doc, features: Optional[DocFeatures] = None) -> DocFeatures:
+    """
+    Return the feature table for ``doc``, extracting it at most once.
+
+    The table is cached in ``doc.user_data`` when the document supports it.
+
+    Args:
+        doc (spacy.tokens.Doc): Processed spaCy document
+        features (Optional[DocFeatures]): Precomputed table to reuse
+
+    Returns:
+        DocFeatures: Columnar feature table
+    """
+    if features is not None:
+        return features
+
+    user_data = getattr(doc, "user_data", None)
+    if isinstance(user_data, dict) and FEATURES_KEY in user_data:
+        return user_data[FEATURES_KEY]
+
+    features = extract_features(doc)
+    if isinstance(user_data, dict):
+        user_data[FEATURES_KEY] = features
+    return features
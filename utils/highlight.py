@@ -0,0 +1,221 @@
+"""
+Interval-based HTML highlighting of annotated text.
+
+Annotations may overlap or nest. A single sweep over their sorted start
+and end offsets splits the text into segments covered by the same set of
+annotations; each segment is emitted once, coloured by the most severe
+annotation covering it and with the descriptions of all of them as its
+tooltip. Spans never nest in the output, so it is always well-formed,
+and both text and tooltips are HTML-escaped.
+
+Large documents are rendered one window at a time: ``page_bounds`` cuts
+the text into pages at line breaks, and only the annotations touching
+the requested window are swept.
+"""
+
+import html
+from typing import Any, Iterator, List, Tuple, Union
+
+import numpy as np
+
+from utils.annotations import SEVERITIES, AnnotationBuilder, AnnotationTable
+
+# Background colour by severity
+SEVERITY_COLORS = {
+    "high": "#b91c1c",  # Dark red for better contrast
+    "medium": "#b45309",  # Dark orange for better contrast
+    "low": "#047857",  # Dark green for better contrast
+}
+
+# Characters per page of rendered text
+PAGE_SIZE = 20000
+
+
+def as_table(annotations: Union[AnnotationTable, List[Any]]) -> AnnotationTable:
+    """
+    Return ``annotations`` as an :class:`AnnotationTable`.
+
+    Args:
+        annotations: Annotation table, or list of annotation dictionaries
+            (``span_start``, ``span_end``, ``severity``, ``description``)
+
+    Returns:
+        AnnotationTable: Sorted annotation records
+    """
+    if isinstance(annotations, AnnotationTable):
+        return annotations
+
+    builder = AnnotationBuilder()
+    for annotation in annotations:
+        code = builder.issue(
+            annotation.get("dimension", ""),
+            annotation.get("metric", ""),
+            annotation.get("issue_type", ""),
+            annotation.get("description", ""),
+        )
+        severity = annotation.get("severity", "low")
+        builder.add(
+            annotation["span_start"],
+            annotation["span_end"],
+            severity if severity in SEVERITIES else "low",
+            code,
+        )
+    return builder.build()
+
+
+def highlight_segments(
+    table: AnnotationTable, start: int, end: int
+) -> Iterator[Tuple[int, int, int, Tuple[int, ...]]]:
+    """
+    Split ``[start, end)`` into segments covered by the same annotations.
+
+    Args:
+        table (AnnotationTable): Annotations
+        start (int): Window start offset
+        end (int): Window end offset
+
+    Yields:
+        Tuple[int, int, int, Tuple[int, ...]]: ``(seg_start, seg_end,
+        severity, codes)`` for every annotated segment, in text order,
+        where ``severity`` is the highest severity code covering it and
+        ``codes`` the sorted issue codes covering it
+    """
+    records = table.between(start, end).records
+    starts = np.maximum(records["start"], start)
+    ends = np.minimum(records["end"], end)
+    keep = starts < ends
+    starts, ends, records = starts[keep], ends[keep], records[keep]
+
+    n = len(records)
+    if not n:
+        return
+
+    start_order = np.argsort(starts, kind="stable").tolist()
+    end_order = np.argsort(ends, kind="stable").tolist()
+    starts, ends = starts.tolist(), ends.tolist()
+    severities, codes = records["severity"].tolist(), records["code"].tolist()
+
+    severity_counts = [0] * len(SEVERITIES)
+    code_counts = {}
+    active = 0
+    pos = start
+    i = j = 0
+
+    # Every record contributes one start and one end event
+    while j < n:
+        next_pos = starts[start_order[i]] if i < n else end
+        next_pos = min(next_pos, ends[end_order[j]])
+
+        if active and next_pos > pos:
+            severity = max(s for s, count in enumerate(severity_counts) if count)
+            yield pos, next_pos, severity, tuple(sorted(code_counts))
+        pos = next_pos
+
+        while j < n and ends[end_order[j]] == pos:
+            k = end_order[j]
+            severity_counts[severities[k]] -= 1
+            code_counts[codes[k]] -= 1
+            if not code_counts[codes[k]]:
+                del code_counts[codes[k]]
+            active -= 1
+            j += 1
+        while i < n and starts[start_order[i]] == pos:
+            k = start_order[i]
+            severity_counts[severities[k]] += 1
+            code_counts[codes[k]] = code_counts.get(codes[k], 0) + 1
+            active += 1
+            i += 1
+
+
+def render_highlighted_html(
+    text: str,
+    annotations: Union[AnnotationTable, List[Any]],
+    start: int = 0,
+    end: int = None,
+) -> str:
+    """
+    Render ``text[start:end]`` as HTML with its annotations highlighted.
+
+    Args:
+        text (str): Original text
+        annotations: Annotation table, or list of annotation dictionaries
+        start (int): Window start offset
+        end (int): Window end offset (end of the text when omitted)
+
+    Returns:
+        str: Escaped HTML of the window
+    """
+    end = len(text) if end is None else min(end, len(text))
+    start = max(0, min(start, end))
+    table = as_table(annotations)
+
+    parts = []
+    tooltips = {}
+    last = start
+    merged = None  # (seg_start, seg_end, severity, codes) pending output
+
+    def flush():
+        seg_start, seg_end, severity, codes = merged
+        tooltip = tooltips.get(codes)
+        if tooltip is None:
+            descriptions = dict.fromkeys(
+                table.issues[code]["description"] for code in codes
+            )
+            tooltip = tooltips[codes] = html.escape("\n".join(descriptions))
+        stacked = " box-shadow: inset 0 -2px 0 #1e293b;" if len(codes) > 1 else ""
+        parts.append(
+            f'<span style="background-color: {SEVERITY_COLORS[SEVERITIES[severity]]};'
+            f' padding: 0 2px; border-radius: 2px;{stacked}" title="{tooltip}">'
+            f"{html.escape(text[seg_start:seg_end], quote=False)}</span>"
+        )
+
+    for segment in highlight_segments(table, start, end):
+        seg_start, seg_end, severity, codes = segment
+        # Adjacent segments covered by the same annotations form one span
+        if merged and merged[1] == seg_start and merged[2:] == (severity, codes):
+            merged = (merged[0], seg_end, severity, codes)
+            continue
+        if merged:
+            flush()
+            last = merged[1]
+        if seg_start > last:
+            parts.append(html.escape(text[last:seg_start], quote=False))
+        merged = segment
+
+    if merged:
+        flush()
+        last = merged[1]
+    if last < end:
+        parts.append(html.escape(text[last:end], quote=False))
+
+    return "".join(parts)
+
+
+def page_bounds(text: str, page_size: int = PAGE_SIZE) -> List[Tuple[int, int]]:
+    """
+    Cut ``text`` into pages of at most ``page_size`` characters.
+
+    Pages end after the last line break of their window when there is
+    one, so paragraphs are not split across pages.
+
+    Args:
+        text (str): Text to paginate
+        page_size (int): Maximum characters per page
+
+    Returns:
+        List[Tuple[int, int]]: (start, end) offsets of every page
+    """
+    pages = []
+    start = 0
+    length = len(text)
+
+    while start < length:
+        end = min(start + page_size, length)
+        if end < length:
+            newline = text.rfind("\n", start, end)
+            if newline >= start:
+                end = newline + 1
+        pages.append((start, end))
+        start = end
+
+    return pages or [(0, 0)]
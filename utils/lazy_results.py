@@ -0,0 +1,88 @@
+"""
+On-demand products of an analysis.
+
+Recommendations and annotations are only shown by their own tabs, so
+the analyze handler stores the metrics with an analysis id and leaves
+them out: they are built when their tabs are rendered, after the metrics
+tab has been sent. Streamlit runs every tab body on each rerun, so this
+moves the work after the metrics rather than skipping it for unopened
+tabs. ``memoized`` builds each product the first time it is asked for
+and keeps it in the analysis results under that id. Later reruns of the
+page reuse it, and a new analysis (new text or parameters) gets a new
+id, so nothing stale is served. Products are profiled into the analysis
+profile whichever tab builds them first.
+"""
+
+import hashlib
+import json
+import time
+from typing import Any, Callable, Dict
+
+from utils.profiling import Profiler, get_active_profiler
+
+# Keys of the analysis results dictionary
+ANALYSIS_ID_KEY = "analysis_id"
+PARAMETERS_KEY = "parameters"
+_MEMO_KEY = "lazy"
+
+
+def make_analysis_id(text: str, **parameters: Any) -> str:
+    """
+    Build the id of the analysis of ``text`` with ``parameters``.
+
+    Args:
+        text (str): Analyzed text
+        **parameters: Analysis parameters (domain, genre, audience, ...)
+
+    Returns:
+        str: Hex digest identifying text and parameters
+    """
+    text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    params = json.dumps(parameters, sort_keys=True, default=str)
+    return hashlib.sha256(f"{text_hash}|{params}".encode("utf-8")).hexdigest()
+
+
+def memoized(
+    analysis_results: Dict[str, Any], name: str, compute: Callable[[], Any]
+) -> Any:
+    """
+    Return the product ``name`` of an analysis, computing it on first use.
+
+    The time spent is recorded under ``processing_time[name]`` when the
+    results have a ``processing_time`` dictionary. When they have a
+    ``profile`` dictionary, the computation runs under a ``Profiler``
+    (unless one is already active, e.g. for an enclosing product) whose
+    summary is merged into it.
+
+    Args:
+        analysis_results (Dict[str, Any]): Results of the analysis
+        name (str): Product name (e.g. ``"recommendations"``)
+        compute (Callable[[], Any]): Builds the product
+
+    Returns:
+        Any: The product, shared by every later call for the same analysis
+    """
+    memo = analysis_results.setdefault(_MEMO_KEY, {})
+    analysis_id = analysis_results.get(ANALYSIS_ID_KEY)
+
+    entry = memo.get(name)
+    if entry is not None and entry[0] == analysis_id:
+        return entry[1]
+
+    profile = analysis_results.get("profile")
+    profiler = None
+    if isinstance(profile, dict) and get_active_profiler() is None:
+        profiler = Profiler()
+
+    start = time.perf_counter()
+    if profiler is None:
+        value = compute()
+    else:
+        with profiler:
+            value = compute()
+        profile.update(profiler.summary())
+    if isinstance(analysis_results.get("processing_time"), dict):
+        analysis_results["processing_time"][name] = time.perf_counter() - start
+
+    memo[name] = (analysis_id, value)
+    return value
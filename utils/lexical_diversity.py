@@ -0,0 +1,204 @@
+"""
+Lexical diversity measures computed with running counters.
+
+All measures take a sequence of hashable items (typically integer lemma
+ids from ``utils.features``) and run in linear time:
+
+* MATTR: moving-average type-token ratio over every window (step 1),
+  updating the window's type count as one item enters and one leaves.
+* MTLD: bidirectional Measure of Textual Lexical Diversity (McCarthy &
+  Jarvis, 2010), with partial factors for the trailing segment.
+* HD-D: hypergeometric estimate of the TTR of random samples, from the
+  type frequencies.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Dict, Hashable, Sequence
+
+# Defaults from the literature
+MATTR_WINDOW = 100
+MTLD_THRESHOLD = 0.72
+HDD_SAMPLE_SIZE = 42
+
+
+@dataclass
+class LexicalDiversity:
+    """Lexical diversity measures of one token sequence."""
+
+    tokens: int
+    types: int
+    ttr: float
+    mattr: float
+    mtld: float
+    hdd: float
+
+
+def mattr(items: Sequence[Hashable], window: int = MATTR_WINDOW) -> float:
+    """
+    Moving-average type-token ratio with a step of one token.
+
+    Sequences shorter than ``window`` yield their plain TTR.
+
+    Args:
+        items (Sequence[Hashable]): Token sequence (e.g. lemma ids)
+        window (int): Window length in tokens
+
+    Returns:
+        float: Mean TTR over all windows (0 for an empty sequence)
+    """
+    n = len(items)
+    if n == 0:
+        return 0.0
+    if n <= window:
+        return len(set(items)) / n
+
+    counts: Dict[Hashable, int] = {}
+    for item in items[:window]:
+        counts[item] = counts.get(item, 0) + 1
+
+    types = len(counts)
+    total = types
+    for i in range(window, n):
+        entering, leaving = items[i], items[i - window]
+        if entering == leaving:
+            total += types
+            continue
+
+        remaining = counts[leaving] - 1
+        if remaining:
+            counts[leaving] = remaining
+        else:
+            del counts[leaving]
+            types -= 1
+
+        seen = counts.get(entering, 0)
+        if not seen:
+            types += 1
+        counts[entering] = seen + 1
+        total += types
+
+    return total / ((n - window + 1) * window)
+
+
+def _mtld_factors(items: Sequence[Hashable], threshold: float) -> float:
+    """Number of MTLD factors (including the partial one) in one direction."""
+    factors = 0.0
+    seen = set()
+    length = 0
+
+    for item in items:
+        seen.add(item)
+        length += 1
+        if len(seen) / length <= threshold:
+            factors += 1
+            seen = set()
+            length = 0
+
+    if length:
+        factors += (1 - len(seen) / length) / (1 - threshold)
+
+    return factors
+
+
+def mtld(items: Sequence[Hashable], threshold: float = MTLD_THRESHOLD) -> float:
+    """
+    Bidirectional MTLD: mean of the forward and backward factor lengths.
+
+    Args:
+        items (Sequence[Hashable]): Token sequence (e.g. lemma ids)
+        threshold (float): TTR at which a factor is closed
+
+    Returns:
+        float: Average number of tokens per factor
+    """
+    n = len(items)
+    if n == 0:
+        return 0.0
+
+    scores = []
+    for direction in (items, items[::-1]):
+        factors = _mtld_factors(direction, threshold)
+        # A text that never drops its TTR counts as a single factor
+        scores.append(n / factors if factors > 0 else float(n))
+
+    return sum(scores) / 2
+
+
+def hdd(items: Sequence[Hashable], sample_size: int = HDD_SAMPLE_SIZE) -> float:
+    """
+    HD-D: expected TTR of a random ``sample_size``-token sample.
+
+    For each type, the probability that it occurs at least once in the
+    sample follows the hypergeometric distribution.
+
+    Args:
+        items (Sequence[Hashable]): Token sequence (e.g. lemma ids)
+        sample_size (int): Sample length in tokens
+
+    Returns:
+        float: HD-D in [0, 1] (plain TTR for sequences shorter than the sample)
+    """
+    counts: Dict[Hashable, int] = {}
+    for item in items:
+        counts[item] = counts.get(item, 0) + 1
+    return _hdd_from_counts(counts, len(items), sample_size)
+
+
+def _hdd_from_counts(
+    counts: Dict[Hashable, int], n: int, sample_size: int
+) -> float:
+    if n == 0:
+        return 0.0
+    if n <= sample_size:
+        return len(counts) / n
+
+    log_total = _log_comb(n, sample_size)
+    expected_types = 0.0
+    for freq in counts.values():
+        if n - freq < sample_size:
+            # The type cannot be missing from the sample
+            expected_types += 1
+        else:
+            missing = math.exp(_log_comb(n - freq, sample_size) - log_total)
+            expected_types += 1 - missing
+
+    return expected_types / sample_size
+
+
+def _log_comb(n: int, k: int) -> float:
+    return math.lgamma(n + 1) - math.lgamma(k + 1) - math.lgamma(n - k + 1)
+
+
+def compute_lexical_diversity(
+    items: Sequence[Hashable],
+    window: int = MATTR_WINDOW,
+    threshold: float = MTLD_THRESHOLD,
+    sample_size: int = HDD_SAMPLE_SIZE,
+) -> LexicalDiversity:
+    """
+    Compute TTR, MATTR, MTLD and HD-D for a token sequence.
+
+    Args:
+        items (Sequence[Hashable]): Token sequence (e.g. lemma ids)
+        window (int): MATTR window length
+        threshold (float): MTLD factor threshold
+        sample_size (int): HD-D sample length
+
+    Returns:
+        LexicalDiversity: All diversity measures
+    """
+    items = list(items)
+    counts: Dict[Hashable, int] = {}
+    for item in items:
+        counts[item] = counts.get(item, 0) + 1
+
+    n = len(items)
+    return LexicalDiversity(
+        tokens=n,
+        types=len(counts),
+        ttr=len(counts) / n if n else 0.0,
+        mattr=mattr(items, window),
+        mtld=mtld(items, threshold),
+        hdd=_hdd_from_counts(counts, n, sample_size),
+    )
@@ -0,0 +1,127 @@
+"""
+Token-aligned matcher for discourse markers and other lexical cues.
+
+Marker phrases are compiled once into a word trie. A text is then scanned
+in a single pass over its word tokens: from every token the trie is
+walked only as far as the longest marker allows, so matching cost depends
+on the text length and the longest marker, not on the number of markers.
+Matches are whole-word (like ``\\b...\\b`` regexes) and case-insensitive.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Hashable, Iterable, List, Mapping, Tuple
+
+# Words (including digits and underscores) and single punctuation marks;
+# whitespace only separates tokens
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+# Trie key holding the categories of the markers ending at a node
+_END = None
+
+
+def tokenize(text: str) -> List[Tuple[str, int, int]]:
+    """
+    Split text into lowercased marker tokens with their character offsets.
+
+    Args:
+        text (str): Input text
+
+    Returns:
+        List[Tuple[str, int, int]]: (token, start_char, end_char) triples
+    """
+    return [
+        (match.group().lower(), match.start(), match.end())
+        for match in _TOKEN_RE.finditer(text)
+    ]
+
+
+@dataclass
+class MarkerMatches:
+    """Markers found in a text, grouped by category."""
+
+    counts: Dict[Hashable, int] = field(default_factory=dict)
+    spans: Dict[Hashable, List[Tuple[int, int, str]]] = field(default_factory=dict)
+
+    def count(self, category: Hashable) -> int:
+        """Number of matches of ``category``."""
+        return self.counts.get(category, 0)
+
+    def found(self, category: Hashable) -> bool:
+        """Whether ``category`` matched at least once."""
+        return category in self.counts
+
+    def get_spans(self, category: Hashable) -> List[Tuple[int, int, str]]:
+        """(start_char, end_char, marker) of every match of ``category``."""
+        return self.spans.get(category, [])
+
+
+class MarkerMatcher:
+    """Multi-phrase matcher compiled from categorised marker lexicons."""
+
+    def __init__(self, lexicons: Mapping[Hashable, Iterable[str]] = None):
+        self._trie: Dict = {}
+        for category, phrases in (lexicons or {}).items():
+            for phrase in phrases:
+                self.add(category, phrase)
+
+    def add(self, category: Hashable, phrase: str) -> None:
+        """
+        Register ``phrase`` under ``category``.
+
+        A phrase listed more than once (or under several categories) is
+        counted once per listing, like a loop over the lexicon would.
+
+        Args:
+            category (Hashable): Category the phrase counts towards
+            phrase (str): Marker phrase
+        """
+        tokens = [token for token, _, _ in tokenize(phrase)]
+        if not tokens:
+            return
+
+        node = self._trie
+        for token in tokens:
+            node = node.setdefault(token, {})
+        node.setdefault(_END, []).append((category, phrase.lower()))
+
+    def match(self, text: str) -> MarkerMatches:
+        """
+        Find every marker in ``text`` in one pass.
+
+        Args:
+            text (str): Input text
+
+        Returns:
+            MarkerMatches: Per-category counts and character spans
+        """
+        return self.match_tokens(tokenize(text))
+
+    def match_tokens(self, tokens: List[Tuple[str, int, int]]) -> MarkerMatches:
+        """
+        Find every marker in a text already split with :func:`tokenize`.
+
+        Args:
+            tokens (List[Tuple[str, int, int]]): Output of ``tokenize``
+
+        Returns:
+            MarkerMatches: Per-category counts and character spans
+        """
+        matches = MarkerMatches()
+        counts, spans = matches.counts, matches.spans
+
+        for i, (token, start, _) in enumerate(tokens):
+            node = self._trie.get(token)
+            j = i
+            while node is not None:
+                for category, phrase in node.get(_END, ()):
+                    counts[category] = counts.get(category, 0) + 1
+                    spans.setdefault(category, []).append(
+                        (start, tokens[j][2], phrase)
+                    )
+                j += 1
+                if j == len(tokens):
+                    break
+                node = node.get(tokens[j][0])
+
+        return matches
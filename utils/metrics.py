@@ -1,32 +1,607 @@
 import spacy
 import numpy as np
-from typing import Dict, Any, Tuple
+from dataclasses import dataclass
+from typing import Dict, Any, Iterable, List, Optional, Set, Tuple
 import re
 import statistics
 import logging
+import time
 from config import REFERENCE_CORPUS_STATS, RECURSOS_LINGUISTICOS
+from utils.features import (
+    CONTENT_POS,
+    FUNCTION_POS,
+    NOUN_POS,
+    DocFeatures,
+    get_doc_features,
+)
+from utils.markers import MarkerMatcher, MarkerMatches
+from utils.profiling import profile_section, profiled
+from utils.embeddings import get_sentence_embeddings
+from utils.syntax import get_syntax_profile
 
 logger = logging.getLogger(__name__)
 
+@dataclass(frozen=True)
+class MetricSpec:
+    """Declaration of one quality metric."""
+
+    dimension: str
+    metric: str
+    name: str
+    description: str
+    # Scoring function, by name (resolved at call time), called as
+    # function(doc, *parameters, features)
+    function: str
+    # Analysis parameters taken between the document and the features
+    parameters: Tuple[str, ...] = ()
+    # Pipeline annotations read (sentence boundaries come from the parser,
+    # so every metric lists it)
+    annotations: Tuple[str, ...] = ("parser",)
+    # Derived document features read, beyond the shared feature table
+    inputs: Tuple[str, ...] = ()
+    # Relative cost of the metric itself, excluding its inputs
+    cost: int = 1
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        """(dimension, metric) key of the metric."""
+        return (self.dimension, self.metric)
+
+
+# Relative cost of building each derived input (shared by every metric
+# reading it); same unit as ``MetricSpec.cost``
+INPUT_COSTS = {
+    "markers": 20,
+    "syntax": 4,
+    "embeddings": 4,
+    "lexical_diversity": 3,
+    "lemma_positions": 1,
+    "sent_subjects": 1,
+}
+
+# Every metric, grouped by dimension in presentation order
+METRIC_REGISTRY = {
+    spec.key: spec
+    for spec in (
+        MetricSpec(
+            "coesao",
+            "referencial",
+            "Coesão Referencial",
+            "Avalia a qualidade das referências anafóricas e catafóricas",
+            "calculate_referential_cohesion",
+            annotations=("tagger", "parser"),
+            cost=3,
+        ),
+        MetricSpec(
+            "coesao",
+            "lexical",
+            "Coesão Lexical",
+            "Avalia a conectividade baseada em relações lexicais",
+            "calculate_lexical_cohesion",
+            annotations=("tagger", "parser", "lemmatizer"),
+            inputs=("lexical_diversity",),
+        ),
+        MetricSpec(
+            "coesao",
+            "estrutural",
+            "Coesão Estrutural",
+            "Avalia o uso de conectivos e marcadores discursivos",
+            "calculate_structural_cohesion",
+            annotations=("tagger", "parser", "lemmatizer"),
+            inputs=("markers",),
+        ),
+        MetricSpec(
+            "coerencia",
+            "continuidade",
+            "Continuidade Tópica",
+            "Avalia a manutenção e transição entre tópicos",
+            "calculate_topic_continuity",
+            annotations=("tagger", "parser", "lemmatizer", "vectors"),
+            inputs=("embeddings",),
+        ),
+        MetricSpec(
+            "coerencia",
+            "progressao",
+            "Progressão Temática",
+            "Avalia o desenvolvimento e a progressão de temas",
+            "calculate_thematic_progression",
+            annotations=("tagger", "parser", "lemmatizer"),
+            inputs=("sent_subjects",),
+        ),
+        MetricSpec(
+            "coerencia",
+            "retorica",
+            "Estrutura Retórica",
+            "Avalia as relações retóricas entre segmentos do texto",
+            "calculate_rhetorical_structure",
+            inputs=("markers",),
+        ),
+        MetricSpec(
+            "adequacao",
+            "conformidade",
+            "Conformidade ao Gênero",
+            "Avalia a adequação às convenções do gênero textual",
+            "calculate_genre_conformity",
+            parameters=("genre",),
+            inputs=("markers",),
+            cost=4,
+        ),
+        MetricSpec(
+            "adequacao",
+            "registro",
+            "Adequação de Registro",
+            "Avalia a adequação do registro ao contexto comunicativo",
+            "calculate_register_adequacy",
+            parameters=("domain", "audience"),
+            annotations=("tagger", "parser"),
+            inputs=("markers",),
+            cost=2,
+        ),
+        MetricSpec(
+            "precisao",
+            "terminologica",
+            "Precisão Terminológica",
+            "Avalia a precisão e consistência no uso de termos",
+            "calculate_terminological_precision",
+            parameters=("domain",),
+            annotations=("tagger", "parser", "lemmatizer"),
+            inputs=("lemma_positions",),
+            cost=2,
+        ),
+        MetricSpec(
+            "precisao",
+            "estrutural",
+            "Clareza Estrutural",
+            "Avalia a clareza das estruturas sintáticas",
+            "calculate_structural_clarity",
+            annotations=("tagger", "parser"),
+            inputs=("syntax",),
+        ),
+        MetricSpec(
+            "complexidade",
+            "lexical",
+            "Complexidade Lexical",
+            "Avalia a sofisticação e diversidade do vocabulário",
+            "calculate_lexical_complexity",
+            annotations=("tagger", "parser", "lemmatizer"),
+            inputs=("lexical_diversity",),
+        ),
+        MetricSpec(
+            "complexidade",
+            "sintatica",
+            "Complexidade Sintática",
+            "Avalia a complexidade das estruturas sintáticas",
+            "calculate_syntactic_complexity",
+            annotations=("tagger", "parser"),
+            inputs=("syntax",),
+            cost=3,
+        ),
+        MetricSpec(
+            "complexidade",
+            "informacional",
+            "Densidade Informacional",
+            "Avalia a quantidade de informação por unidade textual",
+            "calculate_informational_density",
+            annotations=("tagger", "parser", "lemmatizer", "ner"),
+            cost=4,
+        ),
+    )
+}
+
+# Metric dimensions in presentation order
+DIMENSIONS = tuple(dict.fromkeys(spec.dimension for spec in METRIC_REGISTRY.values()))
+
+# Pipeline annotations read by each metric, keyed by (dimension, metric)
+METRIC_REQUIREMENTS = {key: spec.annotations for key, spec in METRIC_REGISTRY.items()}
+
+# Order in which metrics run. When a time budget runs out the remaining
+# metrics are skipped, so each round covers every dimension once: a
+# truncated analysis still scores all five dimensions.
+METRIC_PRIORITY = (
+    ("coesao", "lexical"),
+    ("coerencia", "continuidade"),
+    ("adequacao", "registro"),
+    ("precisao", "estrutural"),
+    ("complexidade", "sintatica"),
+    ("coesao", "estrutural"),
+    ("coerencia", "retorica"),
+    ("adequacao", "conformidade"),
+    ("precisao", "terminologica"),
+    ("complexidade", "lexical"),
+    ("coesao", "referencial"),
+    ("coerencia", "progressao"),
+    ("complexidade", "informacional"),
+)
+
+
+def select_metrics(
+    dimensions: Iterable[str] = None, metrics: Iterable[Tuple[str, str]] = None
+) -> List[Tuple[str, str]]:
+    """
+    Resolve a metric selection to (dimension, metric) keys in priority order.
+
+    Args:
+        dimensions (Iterable[str]): Dimensions whose metrics are selected
+        metrics (Iterable[Tuple[str, str]]): Individual (dimension, metric)
+            pairs selected in addition to ``dimensions``
+
+    Returns:
+        List[Tuple[str, str]]: Selected keys; every metric when both
+        arguments are omitted
+
+    Raises:
+        ValueError: If a dimension or metric is unknown
+    """
+    if dimensions is None and metrics is None:
+        return list(METRIC_PRIORITY)
+
+    selected = set()
+    for dimension in dimensions or ():
+        if dimension not in DIMENSIONS:
+            raise ValueError(f"Unknown metric dimension: {dimension}")
+        selected.update(key for key in METRIC_REGISTRY if key[0] == dimension)
+    for key in metrics or ():
+        key = tuple(key)
+        if key not in METRIC_REGISTRY:
+            raise ValueError(f"Unknown metric: {key}")
+        selected.add(key)
+
+    return [key for key in METRIC_PRIORITY if key in selected]
+
+
+def estimate_cost(keys: Iterable[Tuple[str, str]] = None) -> int:
+    """
+    Estimate the relative cost of computing a set of metrics.
+
+    Each derived input is counted once, however many metrics read it.
+
+    Args:
+        keys (Iterable[Tuple[str, str]]): (dimension, metric) pairs; all
+            metrics when omitted
+
+    Returns:
+        int: Relative cost (see ``INPUT_COSTS``)
+    """
+    specs = [METRIC_REGISTRY[tuple(key)] for key in (keys or METRIC_REGISTRY)]
+    inputs = {name for spec in specs for name in spec.inputs}
+    return sum(spec.cost for spec in specs) + sum(INPUT_COSTS[name] for name in inputs)
+
+
+def get_required_annotations(
+    metrics: Iterable[Tuple[str, str]] = None, fast: bool = False
+) -> Set[str]:
+    """
+    Return the union of pipeline annotations needed by a set of metrics.
+
+    Args:
+        metrics (Iterable[Tuple[str, str]]): (dimension, metric) pairs;
+            all metrics when omitted
+        fast (bool): Drop named-entity recognition, trading a less accurate
+            informational density score for a faster parse
+
+    Returns:
+        Set[str]: Required annotations (tagger, parser, lemmatizer, ner, vectors)
+    """
+    if metrics is None:
+        metrics = METRIC_REQUIREMENTS.keys()
+
+    annotations = set()
+    for key in metrics:
+        annotations.update(METRIC_REQUIREMENTS.get(tuple(key), ()))
+
+    if fast:
+        annotations.discard("ner")
+    return annotations
+
+
+# Rhetorical relation markers by category
+RHETORICAL_MARKERS = {
+    "thesis": ["argumento", "defendo", "proponho", "sustento", "tese"],
+    "contrast": [
+        "mas",
+        "porém",
+        "entretanto",
+        "contudo",
+        "todavia",
+        "no entanto",
+        "por outro lado",
+    ],
+    "cause": [
+        "porque",
+        "pois",
+        "já que",
+        "como resultado",
+        "em razão de",
+        "devido a",
+    ],
+    "elaboration": [
+        "ademais",
+        "além disso",
+        "outro aspecto",
+        "adicionalmente",
+        "somado a isso",
+    ],
+    "example": [
+        "por exemplo",
+        "como exemplo",
+        "para ilustrar",
+        "nomeadamente",
+        "a saber",
+    ],
+    "conclusion": [
+        "portanto",
+        "logo",
+        "assim",
+        "consequentemente",
+        "conclui-se",
+        "em suma",
+    ],
+}
+
+# Formal and informal register markers
+FORMALITY_MARKERS = {
+    "formal": [
+        # Formal connectives
+        "portanto",
+        "assim",
+        "consequentemente",
+        "ademais",
+        "entretanto",
+        "todavia",
+        "outrossim",
+        "conforme",
+        "mediante",
+        "conquanto",
+        # Academic vocabulary
+        "metodologia",
+        "análise",
+        "pesquisa",
+        "estudo",
+        "evidência",
+        "investigação",
+        "paradigma",
+        "abordagem",
+        "hipótese",
+        "conceito",
+    ],
+    "informal": [
+        # Informal markers
+        "né",
+        "daí",
+        "tipo",
+        "tá",
+        "beleza",
+        "cara",
+        "aí",
+        "massa",
+        "pra",
+        "pro",
+        "numa",
+        "num",
+        "tranquilo",
+        "ó",
+        "olha",
+        "viu",
+        # Contractions and informal expressions
+        "tô",
+        "tá",
+        "vamo",
+        "cadê",
+        "a gente",
+        "legal",
+        "bacana",
+        "valeu",
+    ],
+}
+
+# Genre conventions. Each cue is a group of alternative words or phrases
+# (matched as whole words); citation patterns need real regexes.
+_ACADEMIC_CITATIONS = [
+    re.compile(r"\b\(\w+,\s+\d{4}\)"),
+    re.compile(r"\b\w+\s+et\s+al\."),
+    re.compile(r"\bcitado\s+por\b"),
+]
+_ACADEMIC_CUES = [
+    ["objetivo", "propósito", "finalidade"],
+    ["metodologia", "método", "procedimento"],
+    ["resultado", "resultados"],
+    ["conclusão", "conclusões"],
+]
+GENRE_FEATURES = {
+    "Artigo Científico": {
+        "cues": _ACADEMIC_CUES,
+        "section_markers": [
+            "introdução",
+            "metodologia",
+            "resultados",
+            "discussão",
+            "conclusão",
+        ],
+        "citation_patterns": _ACADEMIC_CITATIONS,
+    },
+    "Tese/Dissertação": {
+        "cues": _ACADEMIC_CUES + [["capítulo", "seção"]],
+        "section_markers": [
+            "introdução",
+            "revisão",
+            "metodologia",
+            "resultados",
+            "discussão",
+            "conclusão",
+        ],
+        "citation_patterns": _ACADEMIC_CITATIONS,
+    },
+    "Resumo/Abstract": {
+        "cues": _ACADEMIC_CUES,
+        "section_markers": [],
+        "citation_patterns": [],
+    },
+    "Notícia": {
+        "cues": [
+            ["quem"],
+            ["onde"],
+            ["quando"],
+            ["como"],
+            ["porque"],
+            ["afirmou", "declarou", "disse"],
+        ],
+        "section_markers": [],
+        "citation_patterns": [
+            re.compile(r"\bdisse\b"),
+            re.compile(r"\bdeclarou\b"),
+            re.compile(r"\bafirmou\b"),
+            re.compile(r"\bsegundo\b"),
+        ],
+    },
+    "Editorial": {
+        "cues": [
+            ["posição", "posicionamento", "opinião", "defende"],
+            ["necessário", "devemos", "é preciso"],
+        ],
+        "section_markers": [],
+        "citation_patterns": [],
+    },
+}
+
+
+def _build_marker_lexicons() -> Dict[Tuple, List[str]]:
+    """Collect every marker lexicon under a (source, ...) category key."""
+    lexicons = {}
+    for category, markers in RECURSOS_LINGUISTICOS.get("conectivos", {}).items():
+        lexicons[("conectivos", category)] = markers
+    for relation, markers in RHETORICAL_MARKERS.items():
+        lexicons[("retorica", relation)] = markers
+    for register, markers in FORMALITY_MARKERS.items():
+        lexicons[("registro", register)] = markers
+    for genre, conventions in GENRE_FEATURES.items():
+        for cue_idx, alternatives in enumerate(conventions["cues"]):
+            lexicons[("genero", genre, "cue", cue_idx)] = alternatives
+        for marker in conventions["section_markers"]:
+            lexicons[("genero", genre, "secao", marker)] = [marker]
+    return lexicons
+
+
+# Compiled once; matches every lexicon above in a single pass over the text
+MARKER_MATCHER = MarkerMatcher(_build_marker_lexicons())
+
+# Key of the per-metric evidence in ``DocFeatures.cache``
+EVIDENCE_KEY = "evidence"
+
+
+def get_marker_matches(features: DocFeatures) -> MarkerMatches:
+    """
+    Return the markers found in a document, matching them at most once.
+
+    Args:
+        features (DocFeatures): Feature table of the document
+
+    Returns:
+        MarkerMatches: Per-category counts and spans (offsets into ``doc.text``)
+    """
+    matches = features.cache.get("markers")
+    if matches is None:
+        matches = MARKER_MATCHER.match(features.text)
+        features.cache["markers"] = matches
+    return matches
+
+
+def _record_evidence(
+    features: DocFeatures, function: str, *arguments: str, **evidence
+) -> None:
+    """
+    Keep what a metric found (token ids, sentence ids, counts) for the
+    recommendation engine.
+
+    The feature cache lives on the Doc, which is shared by every analysis
+    of the same text, so evidence is keyed by the metric's function name
+    and the values of its parameters (see ``MetricSpec.parameters``).
+    """
+    features.cache.setdefault(EVIDENCE_KEY, {})[(function, *arguments)] = evidence
+
+
+def get_metric_evidence(
+    doc: spacy.tokens.Doc,
+    key: Tuple[str, str],
+    domain: str = "Acadêmico",
+    genre: str = "Artigo Científico",
+    audience: str = "Acadêmico",
+) -> Dict[str, Any]:
+    """
+    Return the evidence recorded by a metric, running it if it has not run.
+
+    Args:
+        doc (spacy.tokens.Doc): Processed spaCy document
+        key (Tuple[str, str]): (dimension, metric) of the metric
+        domain (str): Text domain
+        genre (str): Text genre
+        audience (str): Target audience level
+
+    Returns:
+        Dict[str, Any]: The metric's evidence (empty when it records none
+        or failed)
+    """
+    spec = METRIC_REGISTRY[key]
+    features = get_doc_features(doc)
+    context = {"domain": domain, "genre": genre, "audience": audience}
+    arguments = [context[name] for name in spec.parameters]
+    evidence_key = (spec.function, *arguments)
+
+    evidence = features.cache.get(EVIDENCE_KEY, {})
+    if evidence_key not in evidence:
+        globals()[spec.function](doc, *arguments, features)
+        evidence = features.cache.get(EVIDENCE_KEY, {})
+    return evidence.get(evidence_key, {})
+
 
 def calculate_metrics(
     doc: spacy.tokens.Doc,
     domain: str = "Acadêmico",
     genre: str = "Artigo Científico",
     audience: str = "Acadêmico",
+    time_budget: float = None,
+    dimensions: Iterable[str] = None,
+    metrics: Iterable[Tuple[str, str]] = None,
 ) -> Dict[str, Any]:
     """
     Calculate quality metrics for the text.
 
+    Only the metrics selected by ``dimensions`` and ``metrics`` run (all
+    of them by default); the derived features they read (markers, syntax
+    profile, sentence embeddings...) are built on first use, so features
+    no selected metric needs are never computed. The result holds the
+    selected dimensions only, each with its selected metrics.
+
+    Metrics run in ``METRIC_PRIORITY`` order. With a ``time_budget``, the
+    deadline is checked before each metric; once it has passed the
+    remaining metrics are skipped. A skipped metric is marked
+    ``"pending": True`` and carries the midpoint of its expected range as
+    a neutral placeholder score, which is left out of its dimension's
+    average (unless every metric of the dimension is pending). The
+    skipped (dimension, metric) pairs are listed under
+    ``"pending_metrics"``.
+
+    Metrics that locate problems record them (token ids, sentence ids,
+    counts) under their entry's ``"evidence"``, which
+    ``generate_recommendations`` reads instead of walking the Doc again.
+
     Args:
         doc (spacy.tokens.Doc): Processed spaCy document
         domain (str): Text domain
         genre (str): Text genre
         audience (str): Target audience level
+        time_budget (float): Seconds available for the whole computation
+            (unbounded when omitted). A metric already running is not
+            interrupted, so the budget can be exceeded by at most one metric.
+        dimensions (Iterable[str]): Dimensions to compute (e.g.
+            ``["complexidade"]``)
+        metrics (Iterable[Tuple[str, str]]): Individual (dimension, metric)
+            pairs to compute, in addition to ``dimensions``
 
     Returns:
         Dict[str, Any]: Dictionary containing calculated metrics
     """
+    selected = select_metrics(dimensions, metrics)
+
     # Check if we have a valid document
     if doc is None or len(doc) == 0:
         return {
@@ -35,181 +610,74 @@ def calculate_metrics(
             "processing_time": {"metrics": 0.0},
         }
 
-    # Start with empty metrics structure
-    metrics = {
-        "dimensions": {
-            "coesao": {},
-            "coerencia": {},
-            "adequacao": {},
-            "precisao": {},
-            "complexidade": {},
-        },
-        "processing_time": {"metrics": 0.0},
-    }
-
-    # Calculate cohesion metrics
-    metrics["dimensions"]["coesao"] = {
-        "referencial": {
-            "name": "Coesão Referencial",
-            "score": calculate_referential_cohesion(doc),
-            "description": "Avalia a qualidade das referências anafóricas e catafóricas",
-            "expected_range": get_expected_range(
-                "coesao", "referencial", domain, genre
-            ),
-        },
-        "lexical": {
-            "name": "Coesão Lexical",
-            "score": calculate_lexical_cohesion(doc),
-            "description": "Avalia a conectividade baseada em relações lexicais",
-            "expected_range": get_expected_range("coesao", "lexical", domain, genre),
-        },
-        "estrutural": {
-            "name": "Coesão Estrutural",
-            "score": calculate_structural_cohesion(doc),
-            "description": "Avalia o uso de conectivos e marcadores discursivos",
-            "expected_range": get_expected_range("coesao", "estrutural", domain, genre),
-        },
-        "score": (
-            calculate_referential_cohesion(doc)
-            + calculate_lexical_cohesion(doc)
-            + calculate_structural_cohesion(doc)
-        )
-        / 3,
-    }
-
-    # Calculate coherence metrics
-    metrics["dimensions"]["coerencia"] = {
-        "continuidade": {
-            "name": "Continuidade Tópica",
-            "score": calculate_topic_continuity(doc),
-            "description": "Avalia a manutenção e transição entre tópicos",
-            "expected_range": get_expected_range(
-                "coerencia", "continuidade", domain, genre
-            ),
-        },
-        "progressao": {
-            "name": "Progressão Temática",
-            "score": calculate_thematic_progression(doc),
-            "description": "Avalia o desenvolvimento e a progressão de temas",
-            "expected_range": get_expected_range(
-                "coerencia", "progressao", domain, genre
-            ),
-        },
-        "retorica": {
-            "name": "Estrutura Retórica",
-            "score": calculate_rhetorical_structure(doc),
-            "description": "Avalia as relações retóricas entre segmentos do texto",
-            "expected_range": get_expected_range(
-                "coerencia", "retorica", domain, genre
-            ),
-        },
-        "score": (
-            calculate_topic_continuity(doc)
-            + calculate_thematic_progression(doc)
-            + calculate_rhetorical_structure(doc)
-        )
-        / 3,
-    }
-
-    # Calculate genre adequacy metrics
-    metrics["dimensions"]["adequacao"] = {
-        "conformidade": {
-            "name": "Conformidade ao Gênero",
-            "score": calculate_genre_conformity(doc, genre),
-            "description": "Avalia a adequação às convenções do gênero textual",
-            "expected_range": get_expected_range(
-                "adequacao", "conformidade", domain, genre
-            ),
-        },
-        "registro": {
-            "name": "Adequação de Registro",
-            "score": calculate_register_adequacy(doc, domain, audience),
-            "description": "Avalia a adequação do registro ao contexto comunicativo",
-            "expected_range": get_expected_range(
-                "adequacao", "registro", domain, genre
-            ),
-        },
-        "score": (
-            calculate_genre_conformity(doc, genre)
-            + calculate_register_adequacy(doc, domain, audience)
-        )
-        / 2,
-    }
-
-    # Calculate precision metrics
-    metrics["dimensions"]["precisao"] = {
-        "terminologica": {
-            "name": "Precisão Terminológica",
-            "score": calculate_terminological_precision(doc, domain),
-            "description": "Avalia a precisão e consistência no uso de termos",
-            "expected_range": get_expected_range(
-                "precisao", "terminologica", domain, genre
-            ),
-        },
-        "estrutural": {
-            "name": "Clareza Estrutural",
-            "score": calculate_structural_clarity(doc),
-            "description": "Avalia a clareza das estruturas sintáticas",
-            "expected_range": get_expected_range(
-                "precisao", "estrutural", domain, genre
-            ),
-        },
-        "score": (
-            calculate_terminological_precision(doc, domain)
-            + calculate_structural_clarity(doc)
-        )
-        / 2,
-    }
-
-    # Calculate complexity metrics
-    metrics["dimensions"]["complexidade"] = {
-        "lexical": {
-            "name": "Complexidade Lexical",
-            "score": calculate_lexical_complexity(doc),
-            "description": "Avalia a sofisticação e diversidade do vocabulário",
-            "expected_range": get_expected_range(
-                "complexidade", "lexical", domain, genre
-            ),
-        },
-        "sintatica": {
-            "name": "Complexidade Sintática",
-            "score": calculate_syntactic_complexity(doc),
-            "description": "Avalia a complexidade das estruturas sintáticas",
-            "expected_range": get_expected_range(
-                "complexidade", "sintatica", domain, genre
-            ),
-        },
-        "informacional": {
-            "name": "Densidade Informacional",
-            "score": calculate_informational_density(doc),
-            "description": "Avalia a quantidade de informação por unidade textual",
-            "expected_range": get_expected_range(
-                "complexidade", "informacional", domain, genre
-            ),
-        },
-        "score": (
-            calculate_lexical_complexity(doc)
-            + calculate_syntactic_complexity(doc)
-            + calculate_informational_density(doc)
-        )
-        / 3,
-    }
-
-    # Calculate overall score as weighted average of dimension scores
+    start = time.perf_counter()
+    deadline = start + time_budget if time_budget is not None else None
+
+    # Extract the shared feature table once; every metric reads from it
+    with profile_section("extract_features", "features"):
+        features = get_doc_features(doc)
+
+    # Compute each selected metric exactly once, in priority order
+    context = {"domain": domain, "genre": genre, "audience": audience}
+    scores = {}
+    pending = []
+    evidence_keys = {}
+    for key in selected:
+        if deadline is not None and time.perf_counter() >= deadline:
+            pending.append(key)
+            continue
+        spec = METRIC_REGISTRY[key]
+        arguments = [context[name] for name in spec.parameters]
+        scores[key] = globals()[spec.function](doc, *arguments, features)
+        evidence_keys[key] = (spec.function, *arguments)
+
+    result = {"dimensions": {}, "processing_time": {"metrics": 0.0}}
+    evidence = features.cache.get(EVIDENCE_KEY, {})
+
+    for key, spec in METRIC_REGISTRY.items():
+        if key not in selected:
+            continue
+
+        expected_range = get_expected_range(spec.dimension, spec.metric, domain, genre)
+        entry = {
+            "name": spec.name,
+            "score": scores.get(key, sum(expected_range) / 2),
+            "description": spec.description,
+            "expected_range": expected_range,
+        }
+        if key not in scores:
+            entry["pending"] = True
+        elif evidence_keys[key] in evidence:
+            entry["evidence"] = evidence[evidence_keys[key]]
+        result["dimensions"].setdefault(spec.dimension, {})[spec.metric] = entry
+
+    for dimension in result["dimensions"].values():
+        entries = list(dimension.values())
+        computed = [entry["score"] for entry in entries if not entry.get("pending")]
+
+        # Average the computed metrics; placeholders only stand in for a
+        # dimension none of whose metrics could run
+        metric_scores = computed or [entry["score"] for entry in entries]
+        dimension["score"] = sum(metric_scores) / len(metric_scores)
+        if len(computed) < len(entries):
+            dimension["pending"] = True
+
+    # Calculate overall score as the average of the dimension scores
     dimension_scores = [
-        metrics["dimensions"]["coesao"]["score"],
-        metrics["dimensions"]["coerencia"]["score"],
-        metrics["dimensions"]["adequacao"]["score"],
-        metrics["dimensions"]["precisao"]["score"],
-        metrics["dimensions"]["complexidade"]["score"],
+        dimension["score"] for dimension in result["dimensions"].values()
     ]
 
-    metrics["overall_score"] = sum(dimension_scores) / len(dimension_scores)
+    result["overall_score"] = sum(dimension_scores) / len(dimension_scores)
 
     # Calculate percentile based on reference corpus
-    metrics["percentile"] = calculate_percentile(metrics["overall_score"], domain)
+    result["percentile"] = calculate_percentile(result["overall_score"], domain)
+
+    if pending:
+        result["pending_metrics"] = pending
 
-    return metrics
+    result["processing_time"]["metrics"] = time.perf_counter() - start
+
+    return result
 
 
 def get_expected_range(
@@ -310,34 +778,37 @@ def calculate_percentile(score: float, domain: str) -> float:
 # ============================================================
 
 
-def calculate_referential_cohesion(doc: spacy.tokens.Doc) -> float:
+@profiled("metric")
+def calculate_referential_cohesion(
+    doc: spacy.tokens.Doc, features: Optional[DocFeatures] = None
+) -> float:
     """
     Calculate referential cohesion score.
 
     Args:
         doc (spacy.tokens.Doc): Processed document
+        features (Optional[DocFeatures]): Precomputed feature table
 
     Returns:
         float: Referential cohesion score (0-100)
     """
     try:
+        features = get_doc_features(doc, features)
+        pos = features.pos
+
         # Identify potential reference expressions
         reference_tokens = [
-            token
-            for token in doc
-            if token.pos_ in ("PRON", "DET") and token.dep_ not in ("ROOT")
+            features.tokens[i]
+            for i in range(features.n_tokens)
+            if pos[i] in ("PRON", "DET") and features.dep[i] not in ("ROOT", "")
         ]
 
         # Count total sentences
-        sentences = list(doc.sents)
-        sentence_count = max(1, len(sentences))
-
-        # If there are no reference tokens, assign a low score
-        if not reference_tokens:
-            return 50.0
+        sentence_count = max(1, features.n_sents)
 
         # Count reference tokens that have clear antecedents
         clear_references = 0
+        unclear = []
 
         for token in reference_tokens:
             # Simple heuristic: check if token has potential referents
@@ -346,6 +817,19 @@ def calculate_referential_cohesion(doc: spacy.tokens.Doc) -> float:
 
             if referents:
                 clear_references += 1
+            else:
+                unclear.append(token.i)
+
+        _record_evidence(
+            features,
+            "calculate_referential_cohesion",
+            token_ids=unclear,
+            sentence_ids=[features.sent_id[i] for i in unclear],
+        )
+
+        # If there are no reference tokens, assign a low score
+        if not reference_tokens:
+            return 50.0
 
         # Calculate reference clarity rate
         if len(reference_tokens) > 0:
@@ -367,33 +851,45 @@ def calculate_referential_cohesion(doc: spacy.tokens.Doc) -> float:
         return 60.0  # Return a reasonable default
 
 
-def calculate_lexical_cohesion(doc: spacy.tokens.Doc) -> float:
+@profiled("metric")
+def calculate_lexical_cohesion(
+    doc: spacy.tokens.Doc, features: Optional[DocFeatures] = None
+) -> float:
     """
     Calculate lexical cohesion score.
 
     Args:
         doc (spacy.tokens.Doc): Processed document
+        features (Optional[DocFeatures]): Precomputed feature table
 
     Returns:
         float: Lexical cohesion score (0-100)
     """
     try:
+        features = get_doc_features(doc, features)
+
+        # Lemmas of content words repeated more than five times
+        lemma_counts = {}
+        for i in range(features.n_tokens):
+            if features.pos[i] in CONTENT_POS and not features.is_stop[i]:
+                lemma = features.lemma[i]
+                lemma_counts[lemma] = lemma_counts.get(lemma, 0) + 1
+        _record_evidence(
+            features,
+            "calculate_lexical_cohesion",
+            repeated_lemmas=[lemma for lemma, count in lemma_counts.items() if count > 5],
+        )
+
         # Get content words (nouns, verbs, adjectives, adverbs)
-        content_words = [
-            token
-            for token in doc
-            if token.pos_ in ("NOUN", "VERB", "ADJ", "ADV")
-            and not token.is_stop
-            and len(token.text) > 1
-        ]
+        content_words = features.content_words
 
         if len(content_words) < 5:
             return 50.0  # Default for very short texts
 
         # Count lemma repetitions
+        content_lemmas = [features.lemma_id[i] for i in content_words]
         lemma_counts = {}
-        for token in content_words:
-            lemma = token.lemma_.lower()
+        for lemma in content_lemmas:
             lemma_counts[lemma] = lemma_counts.get(lemma, 0) + 1
 
         # Calculate lexical repetition rate
@@ -404,29 +900,13 @@ def calculate_lexical_cohesion(doc: spacy.tokens.Doc) -> float:
         )
 
         # Calculate lexical density
-        total_tokens = max(
-            1, len([t for t in doc if not t.is_punct and not t.is_space])
-        )
+        total_tokens = max(1, len(features.words))
         lexical_density = len(content_words) / total_tokens
 
         # Calculate TTR (Type-Token Ratio) with normalization
-        # Use MATTR-like approach (Moving Average TTR)
-        window_size = min(100, len(content_words))
-        ttrs = []
-
-        for i in range(
-            0, len(content_words) - window_size + 1, 20
-        ):  # Step by 20 tokens
-            window = content_words[i : i + window_size]
-            unique_lemmas = set(token.lemma_.lower() for token in window)
-            ttrs.append(len(unique_lemmas) / len(window))
-
-        # If no full windows, calculate for the whole text
-        if not ttrs:
-            unique_lemmas = set(token.lemma_.lower() for token in content_words)
-            normalized_ttr = len(unique_lemmas) / len(content_words)
-        else:
-            normalized_ttr = sum(ttrs) / len(ttrs)
+        # MATTR (Moving Average TTR over 100-token windows, step 1); plain
+        # TTR for texts shorter than one window
+        normalized_ttr = features.content_diversity.mattr
 
         # Combine metrics
         # Good lexical cohesion has moderate repetition, good lexical density, and not extreme TTR
@@ -445,28 +925,41 @@ def calculate_lexical_cohesion(doc: spacy.tokens.Doc) -> float:
         return 65.0  # Return a reasonable default
 
 
-def calculate_structural_cohesion(doc: spacy.tokens.Doc) -> float:
+@profiled("metric")
+def calculate_structural_cohesion(
+    doc: spacy.tokens.Doc, features: Optional[DocFeatures] = None
+) -> float:
     """
     Calculate structural cohesion score based on connectives and discourse markers.
 
     Args:
         doc (spacy.tokens.Doc): Processed document
+        features (Optional[DocFeatures]): Precomputed feature table
 
     Returns:
         float: Structural cohesion score (0-100)
     """
     try:
+        features = get_doc_features(doc, features)
+        pos, dep = features.pos, features.dep
+
         # Get connectives (conjunctions and certain adverbs)
         connectives = [
-            token
-            for token in doc
-            if token.pos_ in ("CCONJ", "SCONJ")
-            or (token.pos_ == "ADV" and token.dep_ == "advmod")
+            i
+            for i in range(features.n_tokens)
+            if pos[i] in ("CCONJ", "SCONJ") or (pos[i] == "ADV" and dep[i] == "advmod")
         ]
 
         # Count sentences
-        sentences = list(doc.sents)
-        sentence_count = max(1, len(sentences))
+        sentence_count = max(1, features.n_sents)
+
+        _record_evidence(
+            features,
+            "calculate_structural_cohesion",
+            connectives=len(connectives),
+            connective_types=len({features.lemma[i] for i in connectives}),
+            sentences=features.n_sents,
+        )
 
         # If very short text, return default score
         if sentence_count < 3:
@@ -476,22 +969,17 @@ def calculate_structural_cohesion(doc: spacy.tokens.Doc) -> float:
         connective_density = len(connectives) / sentence_count
 
         # Calculate connective variety
-        connective_types = set(token.lemma_.lower() for token in connectives)
+        connective_types = set(features.lemma_id[i] for i in connectives)
         variety_score = min(1, len(connective_types) / 10)  # Cap at 10 different types
 
         # Look for common connective phrases not caught by simple token analysis
-        text = doc.text.lower()
-
-        # Get discourse connectives from resources
-        discourse_markers = []
-        for category, markers in RECURSOS_LINGUISTICOS.get("conectivos", {}).items():
-            discourse_markers.extend(markers)
+        markers = get_marker_matches(features)
 
-        # Count occurrences of multi-word connectives
-        phrase_count = 0
-        for phrase in discourse_markers:
-            if phrase.lower() in text:
-                phrase_count += text.count(phrase.lower())
+        # Count occurrences of (multi-word) discourse connectives
+        phrase_count = sum(
+            markers.count(("conectivos", category))
+            for category in RECURSOS_LINGUISTICOS.get("conectivos", {})
+        )
 
         # Adjust connective density with phrase connectives
         adjusted_density = connective_density + (phrase_count / sentence_count)
@@ -510,69 +998,74 @@ def calculate_structural_cohesion(doc: spacy.tokens.Doc) -> float:
         return 65.0  # Return a reasonable default
 
 
-def calculate_topic_continuity(doc: spacy.tokens.Doc) -> float:
+@profiled("metric")
+def calculate_topic_continuity(
+    doc: spacy.tokens.Doc, features: Optional[DocFeatures] = None
+) -> float:
     """
     Calculate topic continuity score.
 
     Args:
         doc (spacy.tokens.Doc): Processed document
+        features (Optional[DocFeatures]): Precomputed feature table
 
     Returns:
         float: Topic continuity score (0-100)
     """
     try:
+        features = get_doc_features(doc, features)
+
         # Get sentences
-        sentences = list(doc.sents)
+        sentences = features.sentences
 
         # If too few sentences, return default score
         if len(sentences) < 3:
+            _record_evidence(
+                features,
+                "calculate_topic_continuity",
+                sentences=len(sentences),
+                topic_shifts=[],
+            )
             return 70.0
 
-        # Check if sentence vectors are available
-        has_vectors = hasattr(sentences[0], "vector") and sentences[0].vector.size > 0
-
-        if has_vectors:
-            # Calculate semantic similarity between adjacent sentences
-            similarities = []
-
-            for i in range(len(sentences) - 1):
-                # Get sentence vectors
-                vec1 = sentences[i].vector
-                vec2 = sentences[i + 1].vector
-
-                # Calculate cosine similarity only if both vectors have non-zero norm
-                norm1 = np.linalg.norm(vec1)
-                norm2 = np.linalg.norm(vec2)
-
-                if norm1 > 0 and norm2 > 0:
-                    sim = np.dot(vec1, vec2) / (norm1 * norm2)
-                    similarities.append(sim)
-                else:
-                    # Default similarity if vectors unavailable
-                    similarities.append(0.5)
+        # Sentence embedding matrix (None when the pipeline has no vectors)
+        embeddings = get_sentence_embeddings(doc, features)
+
+        # Abrupt topic shifts: sentence i is unrelated to sentence i + 1
+        # (pairs involving a sentence without a vector are never flagged)
+        topic_shifts = []
+        if embeddings is not None:
+            topic_shifts = np.flatnonzero(
+                embeddings.adjacent_similarity(default=1.0) < 0.3
+            ).tolist()
+        _record_evidence(
+            features,
+            "calculate_topic_continuity",
+            sentences=len(sentences),
+            topic_shifts=topic_shifts,
+        )
 
-            # Average similarity
-            if similarities:
-                avg_similarity = sum(similarities) / len(similarities)
-            else:
-                avg_similarity = 0.5  # Default if no similarities could be calculated
+        if embeddings is not None:
+            # Semantic similarity between adjacent sentences, with a default
+            # of 0.5 where a sentence has no vector
+            avg_similarity = float(embeddings.adjacent_similarity(default=0.5).mean())
         else:
             # Fallback method if vectors aren't available
             # Use lexical overlap as proxy for semantic similarity
+            sentence_lemmas = [
+                set(
+                    features.lemma_id[t]
+                    for t in features.sentence_range(i)
+                    if not features.is_stop[t] and not features.is_punct[t]
+                )
+                for i in range(len(sentences))
+            ]
             similarities = []
 
             for i in range(len(sentences) - 1):
                 # Get sentence tokens (excluding stopwords and punctuation)
-                sent1_tokens = set(
-                    token.lemma_.lower()
-                    for token in sentences[i]
-                    if not token.is_stop and not token.is_punct
-                )
-                sent2_tokens = set(
-                    token.lemma_.lower()
-                    for token in sentences[i + 1]
-                    if not token.is_stop and not token.is_punct
-                )
+                sent1_tokens = sentence_lemmas[i]
+                sent2_tokens = sentence_lemmas[i + 1]
 
                 # Calculate overlap (Jaccard similarity)
                 if not sent1_tokens or not sent2_tokens:
@@ -591,25 +1084,19 @@ def calculate_topic_continuity(doc: spacy.tokens.Doc) -> float:
 
         # Check for subject consistency
         consistent_subjects = 0
+        subject_lemmas = [
+            [features.lemma[t] for t in subjects]
+            for subjects in features.sent_subjects
+        ]
 
         for i in range(len(sentences) - 1):
             # Get subjects in adjacent sentences
-            subj1 = [
-                token for token in sentences[i] if token.dep_ in ("nsubj", "nsubjpass")
-            ]
-            subj2 = [
-                token
-                for token in sentences[i + 1]
-                if token.dep_ in ("nsubj", "nsubjpass")
-            ]
+            subj1 = subject_lemmas[i]
+            subj2 = set(subject_lemmas[i + 1])
 
             if subj1 and subj2:
                 # Check if any subjects share the same lemma
-                for s1 in subj1:
-                    for s2 in subj2:
-                        if s1.lemma_ == s2.lemma_:
-                            consistent_subjects += 1
-                            break
+                consistent_subjects += sum(1 for s1 in subj1 if s1 in subj2)
 
         # Calculate subject consistency rate
         if len(sentences) > 1:
@@ -631,40 +1118,45 @@ def calculate_topic_continuity(doc: spacy.tokens.Doc) -> float:
         return 65.0  # Return a reasonable default
 
 
-def calculate_thematic_progression(doc: spacy.tokens.Doc) -> float:
+@profiled("metric")
+def calculate_thematic_progression(
+    doc: spacy.tokens.Doc, features: Optional[DocFeatures] = None
+) -> float:
     """
     Calculate thematic progression score.
 
     Args:
         doc (spacy.tokens.Doc): Processed document
+        features (Optional[DocFeatures]): Precomputed feature table
 
     Returns:
         float: Thematic progression score (0-100)
     """
     try:
-        # Get sentences
-        sentences = list(doc.sents)
+        features = get_doc_features(doc, features)
+        lemma, pos = features.lemma, features.pos
 
         # If too few sentences, return default score
-        if len(sentences) < 3:
+        if features.n_sents < 3:
+            _record_evidence(
+                features, "calculate_thematic_progression", sentences=features.n_sents
+            )
             return 70.0
 
-        # Extract sentence subjects as themes
+        # Extract sentence subjects as themes (token positions)
         themes = []
-        for sent in sentences:
-            # Look for grammatical subject
-            subjects = [token for token in sent if token.dep_ in ("nsubj", "nsubjpass")]
-
+        for sent_idx, subjects in enumerate(features.sent_subjects):
             if subjects:
                 # Use first subject as theme
                 themes.append(subjects[0])
             else:
                 # Fallback to first non-punctuation token
-                non_punct = [token for token in sent if not token.is_punct]
-                if non_punct:
-                    themes.append(non_punct[0])
-                else:
-                    themes.append(None)  # No suitable theme
+                non_punct = (
+                    t
+                    for t in features.sentence_range(sent_idx)
+                    if not features.is_punct[t]
+                )
+                themes.append(next(non_punct, None))  # None: no suitable theme
 
         # Analyze theme patterns
         constant_theme = 0  # Same theme repeats in consecutive sentences
@@ -678,24 +1170,20 @@ def calculate_thematic_progression(doc: spacy.tokens.Doc) -> float:
                 continue
 
             # Check for constant theme pattern
-            if current.lemma_ == next_theme.lemma_:
+            if lemma[current] == lemma[next_theme]:
                 constant_theme += 1
                 continue
 
             # Check for linear progression (simplified)
             # Rheme is roughly everything after the theme
             # Check if any content word in current sentence's rheme matches next theme
-            current_sent = sentences[i]
-            rheme_tokens = [
-                t
-                for t in current_sent
-                if t.i > current.i and t.pos_ in ("NOUN", "PROPN", "VERB", "ADJ")
-            ]
-
-            for token in rheme_tokens:
-                if token.lemma_ == next_theme.lemma_:
-                    linear_progression += 1
-                    break
+            _, sent_end = features.sent_bounds[i]
+            if any(
+                lemma[t] == lemma[next_theme]
+                and pos[t] in ("NOUN", "PROPN", "VERB", "ADJ")
+                for t in range(current + 1, sent_end)
+            ):
+                linear_progression += 1
 
         # Calculate pattern rates
         if len(themes) > 1:
@@ -705,6 +1193,13 @@ def calculate_thematic_progression(doc: spacy.tokens.Doc) -> float:
             constant_rate = 0
             linear_rate = 0
 
+        _record_evidence(
+            features,
+            "calculate_thematic_progression",
+            sentences=features.n_sents,
+            constant_rate=constant_rate,
+        )
+
         # Calculate pattern variety
         pattern_variety = min(constant_rate + linear_rate, 1)
 
@@ -722,95 +1217,58 @@ def calculate_thematic_progression(doc: spacy.tokens.Doc) -> float:
         return 65.0  # Return a reasonable default
 
 
-def calculate_rhetorical_structure(doc: spacy.tokens.Doc) -> float:
+@profiled("metric")
+def calculate_rhetorical_structure(
+    doc: spacy.tokens.Doc, features: Optional[DocFeatures] = None
+) -> float:
     """
     Calculate rhetorical structure score based on discourse markers.
 
     Args:
         doc (spacy.tokens.Doc): Processed document
+        features (Optional[DocFeatures]): Precomputed feature table
 
     Returns:
         float: Rhetorical structure score (0-100)
     """
     try:
-        # Get sentences
-        sentences = list(doc.sents)
-        text = doc.text.lower()
-
-        # If very short text, return default score
-        if len(sentences) < 3:
-            return 70.0
+        features = get_doc_features(doc, features)
+        sentence_count = features.n_sents
 
-        # Define rhetorical relation markers by category
-        relation_markers = {
-            "thesis": ["argumento", "defendo", "proponho", "sustento", "tese"],
-            "contrast": [
-                "mas",
-                "porém",
-                "entretanto",
-                "contudo",
-                "todavia",
-                "no entanto",
-                "por outro lado",
-            ],
-            "cause": [
-                "porque",
-                "pois",
-                "já que",
-                "como resultado",
-                "em razão de",
-                "devido a",
-            ],
-            "elaboration": [
-                "ademais",
-                "além disso",
-                "outro aspecto",
-                "adicionalmente",
-                "somado a isso",
-            ],
-            "example": [
-                "por exemplo",
-                "como exemplo",
-                "para ilustrar",
-                "nomeadamente",
-                "a saber",
-            ],
-            "conclusion": [
-                "portanto",
-                "logo",
-                "assim",
-                "consequentemente",
-                "conclui-se",
-                "em suma",
-            ],
+        # Count relation categories present in text
+        markers = get_marker_matches(features)
+        relation_counts = {
+            relation: markers.count(("retorica", relation))
+            for relation in RHETORICAL_MARKERS
         }
+        _record_evidence(
+            features, "calculate_rhetorical_structure", relation_counts=relation_counts
+        )
 
-        # Count relation categories present in text
-        relation_counts = {}
-        for relation, markers in relation_markers.items():
-            relation_counts[relation] = 0
-            for marker in markers:
-                relation_counts[relation] += sum(
-                    1 for _ in re.finditer(r"\b" + re.escape(marker) + r"\b", text)
-                )
+        # If very short text, return default score
+        if sentence_count < 3:
+            return 70.0
 
         # Calculate variety of relations (how many different categories are used)
         relations_used = sum(1 for count in relation_counts.values() if count > 0)
-        relation_variety = min(relations_used / len(relation_markers), 1)
+        relation_variety = min(relations_used / len(RHETORICAL_MARKERS), 1)
 
         # Calculate relation density (markers per sentence)
         total_markers = sum(relation_counts.values())
         relation_density = (
-            min(total_markers / len(sentences), 2) / 2
+            min(total_markers / sentence_count, 2) / 2
         )  # Cap at 2 per sentence
 
-        # Check for presence of key discourse sections
+        # Check for presence of key discourse sections (thesis markers in the
+        # first third of the text, conclusion markers in the last third)
+        text_length = len(features.text)
         has_introduction = any(
-            marker in text[: len(text) // 3] for marker in relation_markers["thesis"]
+            end <= text_length // 3
+            for _, end, _ in markers.get_spans(("retorica", "thesis"))
         )
         has_conclusion = any(
-            marker in text[len(text) * 2 // 3 :]
-            for marker in relation_markers["conclusion"]
+            start >= text_length * 2 // 3
+            for start, _, _ in markers.get_spans(("retorica", "conclusion"))
         )
 
         structure_score = 50
@@ -834,135 +1292,56 @@ def calculate_rhetorical_structure(doc: spacy.tokens.Doc) -> float:
         return 65.0  # Return a reasonable default
 
 
-def calculate_genre_conformity(doc: spacy.tokens.Doc, genre: str) -> float:
+@profiled("metric")
+def calculate_genre_conformity(
+    doc: spacy.tokens.Doc, genre: str, features: Optional[DocFeatures] = None
+) -> float:
     """
     Calculate genre conformity score.
 
     Args:
         doc (spacy.tokens.Doc): Processed document
         genre (str): Text genre
+        features (Optional[DocFeatures]): Precomputed feature table
 
     Returns:
         float: Genre conformity score (0-100)
     """
     try:
-        # Define genre-specific features
-        genre_features = {
-            "Artigo Científico": {
-                "patterns": [
-                    r"\b(objetivo|propósito|finalidade)\b",
-                    r"\b(metodologia|método|procedimento)\b",
-                    r"\b(resultado|resultados)\b",
-                    r"\b(conclusão|conclusões)\b",
-                ],
-                "section_markers": [
-                    "introdução",
-                    "metodologia",
-                    "resultados",
-                    "discussão",
-                    "conclusão",
-                ],
-                "citation_patterns": [
-                    r"\b\(\w+,\s+\d{4}\)",
-                    r"\b\w+\s+et\s+al\.",
-                    r"\bcitado\s+por\b",
-                ],
-            },
-            "Tese/Dissertação": {
-                "patterns": [
-                    r"\b(objetivo|propósito|finalidade)\b",
-                    r"\b(metodologia|método|procedimento)\b",
-                    r"\b(resultado|resultados)\b",
-                    r"\b(conclusão|conclusões)\b",
-                    r"\b(capítulo|seção)\b",
-                ],
-                "section_markers": [
-                    "introdução",
-                    "revisão",
-                    "metodologia",
-                    "resultados",
-                    "discussão",
-                    "conclusão",
-                ],
-                "citation_patterns": [
-                    r"\b\(\w+,\s+\d{4}\)",
-                    r"\b\w+\s+et\s+al\.",
-                    r"\bcitado\s+por\b",
-                ],
-            },
-            "Resumo/Abstract": {
-                "patterns": [
-                    r"\b(objetivo|propósito|finalidade)\b",
-                    r"\b(metodologia|método|procedimento)\b",
-                    r"\b(resultado|resultados)\b",
-                    r"\b(conclusão|conclusões)\b",
-                ],
-                "section_markers": [],
-                "citation_patterns": [],
-            },
-            "Notícia": {
-                "patterns": [
-                    r"\bquem\b",
-                    r"\bonde\b",
-                    r"\bquando\b",
-                    r"\bcomo\b",
-                    r"\bporque\b",
-                    r"\b(afirmou|declarou|disse)\b",
-                ],
-                "section_markers": [],
-                "citation_patterns": [
-                    r"\bdisse\b",
-                    r"\bdeclarou\b",
-                    r"\bafirmou\b",
-                    r"\bsegundo\b",
-                ],
-            },
-            "Editorial": {
-                "patterns": [
-                    r"\b(posição|posicionamento|opinião|defende)\b",
-                    r"\b(necessário|devemos|é preciso)\b",
-                ],
-                "section_markers": [],
-                "citation_patterns": [],
-            },
-        }
-
         # If genre not in defined list, use default scoring
-        if genre not in genre_features:
+        if genre not in GENRE_FEATURES:
             return 70.0
 
-        # Get text
-        text = doc.text.lower()
+        conventions = GENRE_FEATURES[genre]
+        features = get_doc_features(doc, features)
+        markers = get_marker_matches(features)
 
-        # Check for pattern matches
-        pattern_matches = 0
-        for pattern in genre_features[genre].get("patterns", []):
-            if re.search(pattern, text):
-                pattern_matches += 1
-
-        pattern_score = pattern_matches / max(
-            1, len(genre_features[genre].get("patterns", []))
+        # Check for cue matches
+        cues = conventions["cues"]
+        cue_matches = sum(
+            1
+            for cue_idx in range(len(cues))
+            if markers.found(("genero", genre, "cue", cue_idx))
         )
+        pattern_score = cue_matches / max(1, len(cues))
 
         # Check for section markers
-        section_matches = 0
-        for marker in genre_features[genre].get("section_markers", []):
-            if re.search(r"\b" + re.escape(marker) + r"\b", text):
-                section_matches += 1
-
-        section_score = section_matches / max(
-            1, len(genre_features[genre].get("section_markers", []))
+        section_markers = conventions["section_markers"]
+        section_matches = sum(
+            1
+            for marker in section_markers
+            if markers.found(("genero", genre, "secao", marker))
         )
+        section_score = section_matches / max(1, len(section_markers))
 
         # Check for citation patterns if applicable
         citation_score = 0
-        citation_patterns = genre_features[genre].get("citation_patterns", [])
+        citation_patterns = conventions["citation_patterns"]
         if citation_patterns:
-            citation_matches = 0
-            for pattern in citation_patterns:
-                if re.search(pattern, text):
-                    citation_matches += 1
-
+            text = features.text_lower
+            citation_matches = sum(
+                1 for pattern in citation_patterns if pattern.search(text)
+            )
             citation_score = citation_matches / len(citation_patterns)
 
         # Combine scores
@@ -981,8 +1360,12 @@ def calculate_genre_conformity(doc: spacy.tokens.Doc, genre: str) -> float:
         return 70.0  # Return a reasonable default
 
 
+@profiled("metric")
 def calculate_register_adequacy(
-    doc: spacy.tokens.Doc, domain: str, audience: str
+    doc: spacy.tokens.Doc,
+    domain: str,
+    audience: str,
+    features: Optional[DocFeatures] = None,
 ) -> float:
     """
     Calculate register adequacy score.
@@ -991,11 +1374,14 @@ def calculate_register_adequacy(
         doc (spacy.tokens.Doc): Processed document
         domain (str): Text domain
         audience (str): Target audience
+        features (Optional[DocFeatures]): Precomputed feature table
 
     Returns:
         float: Register adequacy score (0-100)
     """
     try:
+        features = get_doc_features(doc, features)
+
         # Define expected formality by domain and audience
         formality_expectations = {
             "Acadêmico": {
@@ -1052,88 +1438,25 @@ def calculate_register_adequacy(
         # Get expected formality
         expected_formality = formality_expectations.get(domain, {}).get(audience, 0.7)
 
-        # Define formality markers
-        formality_indicators = {
-            "formal": [
-                # Formal connectives
-                "portanto",
-                "assim",
-                "consequentemente",
-                "ademais",
-                "entretanto",
-                "todavia",
-                "outrossim",
-                "conforme",
-                "mediante",
-                "conquanto",
-                # Academic vocabulary
-                "metodologia",
-                "análise",
-                "pesquisa",
-                "estudo",
-                "evidência",
-                "investigação",
-                "paradigma",
-                "abordagem",
-                "hipótese",
-                "conceito",
-            ],
-            "informal": [
-                # Informal markers
-                "né",
-                "daí",
-                "tipo",
-                "tá",
-                "beleza",
-                "cara",
-                "aí",
-                "massa",
-                "pra",
-                "pro",
-                "numa",
-                "num",
-                "tranquilo",
-                "ó",
-                "olha",
-                "viu",
-                # Contractions and informal expressions
-                "tô",
-                "tá",
-                "vamo",
-                "cadê",
-                "a gente",
-                "legal",
-                "bacana",
-                "valeu",
-            ],
-        }
-
         # Count formal and informal markers
-        formal_count = 0
-        informal_count = 0
-
-        text = doc.text.lower()
-
-        for marker in formality_indicators["formal"]:
-            formal_count += sum(
-                1 for _ in re.finditer(r"\b" + re.escape(marker) + r"\b", text)
-            )
-
-        for marker in formality_indicators["informal"]:
-            informal_count += sum(
-                1 for _ in re.finditer(r"\b" + re.escape(marker) + r"\b", text)
-            )
+        markers = get_marker_matches(features)
+        formal_count = markers.count(("registro", "formal"))
+        informal_count = markers.count(("registro", "informal"))
+        _record_evidence(
+            features,
+            "calculate_register_adequacy",
+            domain,
+            audience,
+            formal=formal_count,
+            informal=informal_count,
+        )
 
         # Check for first-person usage (less formal)
-        first_person = 0
-        for token in doc:
-            if token.text.lower() in ["eu", "minha", "meu", "nós", "nossa", "nosso"]:
-                first_person += 1
+        first_person_forms = {"eu", "minha", "meu", "nós", "nossa", "nosso"}
+        first_person = sum(1 for word in features.lower if word in first_person_forms)
 
         # Check for imperative verbs (can be less formal)
-        imperatives = sum(
-            1 for token in doc if token.mood == "Imp" if hasattr(token, "mood")
-        )
+        imperatives = sum(1 for mood in features.mood if mood == "Imp")
 
         # Calculate actual formality
         total_markers = max(
@@ -1154,39 +1477,33 @@ def calculate_register_adequacy(
         return 70.0  # Return a reasonable default
 
 
-def calculate_terminological_precision(doc: spacy.tokens.Doc, domain: str) -> float:
+@profiled("metric")
+def calculate_terminological_precision(
+    doc: spacy.tokens.Doc, domain: str, features: Optional[DocFeatures] = None
+) -> float:
     """
     Calculate terminological precision score.
 
     Args:
         doc (spacy.tokens.Doc): Processed document
         domain (str): Text domain
+        features (Optional[DocFeatures]): Precomputed feature table
 
     Returns:
         float: Terminological precision score (0-100)
     """
     try:
-        # Get all nouns and proper nouns that might be terms
-        terms = [
-            token
-            for token in doc
-            if token.pos_ in ("NOUN", "PROPN") and len(token.text) > 2
-        ]
-
-        if len(terms) < 5:
-            return 65.0  # Default for very short texts
-
-        # Check for consistent usage (term-lemma consistency)
-        term_forms = {}
-        for term in terms:
-            lemma = term.lemma_.lower()
-            if lemma not in term_forms:
-                term_forms[lemma] = set()
-            term_forms[lemma].add(term.text.lower())
+        features = get_doc_features(doc, features)
+        pos, length = features.pos, features.length
+        window_size = 50  # tokens
 
-        # Check how many terms have inconsistent forms
-        inconsistent_terms = sum(1 for forms in term_forms.values() if len(forms) > 1)
-        consistency_score = 1 - (inconsistent_terms / max(1, len(term_forms)))
+        # Walk the lemma index once; every check below is per lemma group
+        term_count = 0
+        term_lemmas = 0
+        inconsistent_terms = 0
+        inconsistent_examples = []
+        domain_term_count = 0
+        repetition_issues = 0
 
         # Check for domain-specific terminology
         domain_terms = {
@@ -1194,34 +1511,59 @@ def calculate_terminological_precision(doc: spacy.tokens.Doc, domain: str) -> fl
             "Científico": RECURSOS_LINGUISTICOS.get("lexico_academico", []),
             # Add other domains as needed
         }
+        domain_lexicon = set(domain_terms.get(domain, []))
 
-        # Count domain-specific terms used
-        domain_term_count = 0
-        if domain in domain_terms:
-            for term in terms:
-                if term.lemma_.lower() in domain_terms[domain]:
-                    domain_term_count += 1
+        for positions in features.lemma_positions.values():
+            nouns = [i for i in positions if pos[i] in NOUN_POS]
+            if not nouns:
+                continue
+
+            # Nouns and proper nouns that might be terms
+            terms = [i for i in nouns if length[i] > 2]
+            if terms:
+                term_count += len(terms)
+                term_lemmas += 1
+
+                # Check for consistent usage (term-lemma consistency)
+                variants = list(dict.fromkeys(features.lower[i] for i in terms))
+                if len(variants) > 1:
+                    inconsistent_terms += 1
+                    inconsistent_examples.append(
+                        {"lemma": features.lemma[terms[0]], "variants": variants}
+                    )
+
+                # Count domain-specific terms used
+                if features.lemma_lower[terms[0]] in domain_lexicon:
+                    domain_term_count += len(terms)
+
+            # Check for term repetitions within close proximity (potential
+            # precision issue): the next occurrence is the next position
+            repetition_issues += sum(
+                1
+                for i, j in zip(nouns, nouns[1:])
+                if j - i < window_size and i < features.n_tokens - window_size
+            )
+
+        _record_evidence(
+            features,
+            "calculate_terminological_precision",
+            domain,
+            inconsistent_terms=inconsistent_examples,
+        )
+
+        if term_count < 5:
+            return 65.0  # Default for very short texts
+
+        consistency_score = 1 - (inconsistent_terms / max(1, term_lemmas))
 
         # Calculate domain terminology ratio
-        if domain in domain_terms and domain_terms[domain]:
-            domain_ratio = min(domain_term_count / len(terms), 0.4)  # Cap at 40%
+        if domain_lexicon:
+            domain_ratio = min(domain_term_count / term_count, 0.4)  # Cap at 40%
             domain_score = domain_ratio / 0.4  # Normalize to 0-1
         else:
             domain_score = 0.7  # Default if no domain terms defined
 
-        # Check for term repetitions within close proximity (potential precision issue)
-        repetition_issues = 0
-        window_size = 50  # tokens
-
-        for i, token in enumerate(doc):
-            if token.pos_ in ("NOUN", "PROPN") and i + window_size < len(doc):
-                window = doc[i + 1 : i + window_size]
-                for t in window:
-                    if t.lemma_ == token.lemma_ and t.pos_ in ("NOUN", "PROPN"):
-                        repetition_issues += 1
-                        break
-
-        repetition_score = 1 - min(repetition_issues / max(1, len(terms)), 0.5)
+        repetition_score = 1 - min(repetition_issues / max(1, term_count), 0.5)
 
         # Combine metrics
         score = (
@@ -1236,50 +1578,59 @@ def calculate_terminological_precision(doc: spacy.tokens.Doc, domain: str) -> fl
         return 65.0  # Return a reasonable default
 
 
-def calculate_structural_clarity(doc: spacy.tokens.Doc) -> float:
+@profiled("metric")
+def calculate_structural_clarity(
+    doc: spacy.tokens.Doc, features: Optional[DocFeatures] = None
+) -> float:
     """
     Calculate structural clarity score.
 
     Args:
         doc (spacy.tokens.Doc): Processed document
+        features (Optional[DocFeatures]): Precomputed feature table
 
     Returns:
         float: Structural clarity score (0-100)
     """
     try:
-        # Get sentences
-        sentences = list(doc.sents)
-
-        if len(sentences) < 3:
-            return 70.0  # Default for very short texts
+        features = get_doc_features(doc, features)
 
         # Analyze sentence complexity
         sentence_lengths = []
         clause_counts = []
-        dependency_distances = []
 
-        for sent in sentences:
+        for sent_idx in range(features.n_sents):
+            sent = features.sentence_range(sent_idx)
+
             # Count words (excluding punctuation)
-            words = [
-                token for token in sent if not token.is_punct and not token.is_space
-            ]
-            sentence_lengths.append(len(words))
+            sentence_lengths.append(
+                sum(
+                    1
+                    for i in sent
+                    if not features.is_punct[i] and not features.is_space[i]
+                )
+            )
 
             # Count clauses (using verbs as proxy)
-            verbs = [token for token in sent if token.pos_ == "VERB"]
-            clause_counts.append(len(verbs))
-
-            # Calculate average dependency distance
-            distances = []
-            for token in sent:
-                if token.head != token:  # Skip root
-                    distance = abs(token.i - token.head.i)
-                    distances.append(distance)
-
-            if distances:
-                dependency_distances.append(sum(distances) / len(distances))
-            else:
-                dependency_distances.append(0)
+            clause_counts.append(sum(1 for i in sent if features.pos[i] == "VERB"))
+
+        # Long sentences with many clauses, or deeply nested clauses
+        clause_nesting = get_syntax_profile(doc, features).sent_max_clause_depth
+        long_sentences = [
+            i
+            for i in range(features.n_sents)
+            if clause_counts[i] > 3 and sentence_lengths[i] > 25
+        ]
+        nested = {i for i in range(features.n_sents) if clause_nesting[i] > 2}
+        _record_evidence(
+            features,
+            "calculate_structural_clarity",
+            long_sentences=long_sentences,
+            complex_sentences=sorted(nested.union(long_sentences)),
+        )
+
+        if features.n_sents < 3:
+            return 70.0  # Default for very short texts
 
         # Calculate average sentence length and variance
         avg_length = sum(sentence_lengths) / len(sentence_lengths)
@@ -1290,11 +1641,9 @@ def calculate_structural_clarity(doc: spacy.tokens.Doc) -> float:
         # Calculate average clause count
         avg_clauses = sum(clause_counts) / len(clause_counts)
 
-        # Calculate average dependency distance
-        avg_dependency = (
-            sum(dependency_distances) / len(dependency_distances)
-            if dependency_distances
-            else 0
+        # Calculate average dependency distance (per-sentence means, roots skipped)
+        avg_dependency = float(
+            get_syntax_profile(doc, features).sent_mean_distance.mean()
         )
 
         # Evaluate sentence length (optimal around 15-25 words)
@@ -1335,54 +1684,43 @@ def calculate_structural_clarity(doc: spacy.tokens.Doc) -> float:
         return 65.0  # Return a reasonable default
 
 
-def calculate_lexical_complexity(doc: spacy.tokens.Doc) -> float:
+@profiled("metric")
+def calculate_lexical_complexity(
+    doc: spacy.tokens.Doc, features: Optional[DocFeatures] = None
+) -> float:
     """
     Calculate lexical complexity score.
 
     Args:
         doc (spacy.tokens.Doc): Processed document
+        features (Optional[DocFeatures]): Precomputed feature table
 
     Returns:
         float: Lexical complexity score (0-100)
     """
     try:
+        features = get_doc_features(doc, features)
+
         # Get content words
-        content_words = [
-            token
-            for token in doc
-            if token.pos_ in ("NOUN", "VERB", "ADJ", "ADV")
-            and not token.is_stop
-            and len(token.text) > 1
-        ]
+        content_words = features.content_words
 
         if len(content_words) < 10:
             return 60.0  # Default for very short texts
 
         # Calculate average word length
-        avg_word_length = sum(len(token.text) for token in content_words) / len(
-            content_words
-        )
-
-        # Calculate lexical diversity (TTR with window approach to account for text length)
-        windows = []
-        window_size = min(100, len(content_words))
-
-        for i in range(0, len(content_words) - window_size + 1, 20):
-            window = content_words[i : i + window_size]
-            unique_lemmas = set(token.lemma_.lower() for token in window)
-            windows.append(len(unique_lemmas) / window_size)
+        word_lengths = [features.length[i] for i in content_words]
+        avg_word_length = sum(word_lengths) / len(content_words)
 
-        lexical_diversity = sum(windows) / len(windows) if windows else 0.6
+        # Calculate lexical diversity (MATTR, to account for text length)
+        lexical_diversity = features.content_diversity.mattr
 
         # Check for rare/sophisticated words
         # Simple heuristic: longer words tend to be more sophisticated
-        sophisticated_words = [token for token in content_words if len(token.text) > 8]
-        sophistication_ratio = len(sophisticated_words) / len(content_words)
+        sophisticated_words = sum(1 for length in word_lengths if length > 8)
+        sophistication_ratio = sophisticated_words / len(content_words)
 
         # Calculate lexical density
-        total_tokens = len(
-            [token for token in doc if not token.is_punct and not token.is_space]
-        )
+        total_tokens = len(features.words)
         lexical_density = len(content_words) / total_tokens
 
         # Combine metrics
@@ -1410,84 +1748,66 @@ def calculate_lexical_complexity(doc: spacy.tokens.Doc) -> float:
         return 60.0  # Return a reasonable default
 
 
-def calculate_syntactic_complexity(doc: spacy.tokens.Doc) -> float:
+@profiled("metric")
+def calculate_syntactic_complexity(
+    doc: spacy.tokens.Doc, features: Optional[DocFeatures] = None
+) -> float:
     """
     Calculate syntactic complexity score.
 
     Args:
         doc (spacy.tokens.Doc): Processed document
+        features (Optional[DocFeatures]): Precomputed feature table
 
     Returns:
         float: Syntactic complexity score (0-100)
     """
     try:
-        # Get sentences
-        sentences = list(doc.sents)
+        features = get_doc_features(doc, features)
+        dep, head = features.dep, features.head
+        sentence_count = features.n_sents
 
-        if len(sentences) < 3:
+        if sentence_count < 3:
             return 65.0  # Default for very short texts
 
         # Count clauses per sentence
-        clause_counts = []
-        for sent in sentences:
-            verbs = [token for token in sent if token.pos_ == "VERB"]
-            clause_counts.append(len(verbs))
+        clause_counts = [
+            sum(1 for i in features.sentence_range(s) if features.pos[i] == "VERB")
+            for s in range(sentence_count)
+        ]
 
         # Calculate subordination (simplified as dependency depth)
-        max_depths = []
-        for sent in sentences:
-            depths = {}
-
-            # Calculate depth for each token
-            for token in sent:
-                if token.dep_ == "ROOT":
-                    depths[token.i] = 0
-                    continue
-
-                depth = 1
-                head = token.head
-                while head.dep_ != "ROOT":
-                    depth += 1
-                    head = head.head
-                depths[token.i] = depth
-
-            max_depths.append(max(depths.values()) if depths else 0)
+        max_depths = get_syntax_profile(doc, features).sent_max_depth
 
         # Calculate average clause count and max depth
         avg_clauses = sum(clause_counts) / len(clause_counts)
-        avg_depth = sum(max_depths) / len(max_depths)
+        avg_depth = float(max_depths.mean())
 
         # Calculate sentence length
         sentence_lengths = [
-            len([token for token in sent if not token.is_punct]) for sent in sentences
+            sum(1 for i in features.sentence_range(s) if not features.is_punct[i])
+            for s in range(sentence_count)
         ]
         avg_length = sum(sentence_lengths) / len(sentence_lengths)
 
         # Check for complex constructions
-        complex_constructions = 0
-        for sent in sentences:
-            # Count subordinate clauses
-            subordinate = sum(
-                1 for token in sent if token.dep_ in ("ccomp", "xcomp", "advcl", "acl")
-            )
+        # Count subordinate clauses
+        subordinate = sum(1 for d in dep if d in ("ccomp", "xcomp", "advcl", "acl"))
 
-            # Count passive constructions
-            passive = sum(1 for token in sent if "pass" in token.dep_)
+        # Count passive constructions
+        passive = sum(1 for d in dep if "pass" in d)
 
-            # Count preposition chains
-            prep_chains = 0
-            for token in sent:
-                if token.dep_ == "prep":
-                    chain = 1
-                    for child in token.children:
-                        if child.dep_ == "prep":
-                            chain += 1
-                    prep_chains += chain - 1 if chain > 1 else 0
+        # Count preposition chains (prepositions attached to another preposition)
+        prep_chains = sum(
+            1
+            for i in range(features.n_tokens)
+            if dep[i] == "prep" and head[i] != i and dep[head[i]] == "prep"
+        )
 
-            complex_constructions += subordinate + passive + prep_chains
+        complex_constructions = subordinate + passive + prep_chains
 
         # Normalize complex constructions per sentence
-        complex_per_sentence = complex_constructions / len(sentences)
+        complex_per_sentence = complex_constructions / sentence_count
 
         # Convert to scores (higher means more complex)
         clause_score = min(avg_clauses / 3, 1)  # Cap at 3 clauses per sentence
@@ -1513,47 +1833,49 @@ def calculate_syntactic_complexity(doc: spacy.tokens.Doc) -> float:
         return 65.0  # Return a reasonable default
 
 
-def calculate_informational_density(doc: spacy.tokens.Doc) -> float:
+@profiled("metric")
+def calculate_informational_density(
+    doc: spacy.tokens.Doc, features: Optional[DocFeatures] = None
+) -> float:
     """
     Calculate informational density score.
 
     Args:
         doc (spacy.tokens.Doc): Processed document
+        features (Optional[DocFeatures]): Precomputed feature table
 
     Returns:
         float: Informational density score (0-100)
     """
     try:
+        features = get_doc_features(doc, features)
+        pos = features.pos
+
         # Count content words vs. functional words
         content_tokens = [
-            token
-            for token in doc
-            if token.pos_ in ("NOUN", "VERB", "ADJ", "ADV") and not token.is_stop
-        ]
-        function_tokens = [
-            token
-            for token in doc
-            if token.pos_ in ("ADP", "AUX", "CCONJ", "DET", "PART", "PRON", "SCONJ")
+            i
+            for i in range(features.n_tokens)
+            if pos[i] in CONTENT_POS and not features.is_stop[i]
         ]
+        function_count = sum(1 for p in pos if p in FUNCTION_POS)
 
-        if len(content_tokens) + len(function_tokens) < 20:
+        if len(content_tokens) + function_count < 20:
             return 60.0  # Default for very short texts
 
         # Calculate content-function ratio
-        cf_ratio = len(content_tokens) / max(1, len(function_tokens))
+        cf_ratio = len(content_tokens) / max(1, function_count)
 
         # Count unique content lemmas (information richness)
-        unique_lemmas = set(token.lemma_.lower() for token in content_tokens)
+        unique_lemmas = set(features.lemma_id[i] for i in content_tokens)
 
         # Calculate type-token ratio for content words
         content_ttr = len(unique_lemmas) / max(1, len(content_tokens))
 
         # Count named entities (indication of specific information)
-        entities = list(doc.ents)
-        entity_density = len(entities) / max(1, len(list(doc.sents)))
+        entity_density = features.entity_count / max(1, features.n_sents)
 
         # Check for nominalization (often increases information density)
-        nominal_endings = [
+        nominal_endings = (
             "ção",
             "são",
             "mento",
@@ -1562,11 +1884,9 @@ def calculate_informational_density(doc: spacy.tokens.Doc) -> float:
             "idade",
             "ismo",
             "itude",
-        ]
+        )
         nominalizations = sum(
-            1
-            for token in doc
-            if any(token.text.lower().endswith(ending) for ending in nominal_endings)
+            1 for word in features.lower if word.endswith(nominal_endings)
         )
         nominalization_density = nominalizations / max(1, len(content_tokens))
 
@@ -0,0 +1,57 @@
+"""
+Process-wide registry of loaded spaCy pipelines.
+
+Large pipelines such as ``pt_core_news_lg`` take around 1 GB of memory
+with their vectors, so every module of the process shares one instance
+per model name instead of calling ``spacy.load`` on its own. Loading is
+thread-safe: concurrent callers asking for the same model wait for a
+single load, while lookups of models already loaded (or being loaded
+under another name) never block on it.
+"""
+
+import threading
+from typing import Dict
+
+import spacy
+
+_models: Dict[str, spacy.language.Language] = {}
+_load_locks: Dict[str, threading.Lock] = {}
+_lock = threading.Lock()
+
+
+def get_model(name: str) -> spacy.language.Language:
+    """
+    Return the shared pipeline ``name``, loading it on first use.
+
+    Args:
+        name (str): Package name or path accepted by ``spacy.load``
+
+    Returns:
+        spacy.language.Language: Loaded pipeline (the same object for
+        every caller of the process)
+
+    Raises:
+        OSError: If the model cannot be found; nothing is registered, so a
+            later call tries again
+    """
+    nlp = _models.get(name)
+    if nlp is not None:
+        return nlp
+
+    with _lock:
+        load_lock = _load_locks.setdefault(name, threading.Lock())
+
+    with load_lock:
+        nlp = _models.get(name)
+        if nlp is None:
+            nlp = spacy.load(name)
+            with _lock:
+                _models[name] = nlp
+    return nlp
+
+
+def clear_models() -> None:
+    """Drop every registered pipeline (they are freed once unreferenced)."""
+    with _lock:
+        _models.clear()
+        _load_locks.clear()
@@ -1,15 +1,35 @@
 import spacy
 import numpy as np
 import streamlit as st
-from typing import Dict, List, Any
+from typing import Dict, Iterable, Iterator, List, Any, Optional
 
 # Import NLP model configuration
 from config import NLP_MODELS
 from config.env_config import ProductionNLPConfig
+from spacy.tokens import Doc
+
+from utils.chunking import parse_in_chunks, split_into_paragraphs
+from utils.doc_cache import DocCache
+from utils.doc_index import get_doc_index
+from utils.models import get_model
+from utils.profiling import profiled
 
 # Load environment configuration once
 _env_config = ProductionNLPConfig()
 
+# Cache of parsed documents shared by every session of the process
+_doc_cache = DocCache(
+    max_entries=_env_config.doc_cache_size,
+    cache_dir=_env_config.doc_cache_dir,
+    max_disk_bytes=_env_config.doc_cache_max_mb * 1024 * 1024,
+)
+
+# Parsed paragraphs for incremental re-analysis (memory only)
+_paragraph_cache = DocCache(max_entries=_env_config.paragraph_cache_size)
+
+# Key of the incremental parse statistics in ``Doc.user_data``
+INCREMENTAL_KEY = "lexa_incremental"
+
 
 def ensure_nltk_data() -> None:
     """Ensure required NLTK resources are available."""
@@ -27,9 +47,42 @@ def ensure_nltk_data() -> None:
             nltk.download(name, quiet=True)
 
 
-# Initialize and cache NLP models
+# Pipeline used for each language (shared through ``utils.models``)
 _nlp_models = {}
 
+# Pipeline components providing each annotation a metric can request.
+# Components outside this mapping (custom pipes) are never disabled.
+ANNOTATION_COMPONENTS = {
+    "tagger": ("tok2vec", "tagger", "morphologizer", "attribute_ruler"),
+    "parser": ("tok2vec", "parser", "senter", "sentencizer"),
+    # The rule-based lemmatizer reads the POS tags assigned upstream
+    "lemmatizer": (
+        "tok2vec",
+        "tagger",
+        "morphologizer",
+        "attribute_ruler",
+        "lemmatizer",
+    ),
+    "ner": ("tok2vec", "ner", "entity_ruler"),
+    # Static vectors live in the vocab and need no component
+    "vectors": (),
+}
+
+
+# Token attributes exported by ``extract_linguistic_features``
+_FEATURE_ATTRS = [
+    "POS",
+    "DEP",
+    "HEAD",
+    "IS_STOP",
+    "IS_PUNCT",
+    "IS_SPACE",
+    "LEMMA",
+    "SENT_START",
+    "ENT_IOB",
+    "ENT_TYPE",
+]
+
 
 def get_nlp_model(language: str) -> spacy.language.Language:
     """
@@ -47,7 +100,7 @@ def get_nlp_model(language: str) -> spacy.language.Language:
         else:
             model_name = NLP_MODELS.get(language, NLP_MODELS["en"])
         try:
-            _nlp_models[language] = spacy.load(model_name)
+            _nlp_models[language] = get_model(model_name)
         except OSError:
             # If model not found, use a small model instead of downloading
             # (downloading large models can time out in this environment)
@@ -69,135 +122,373 @@ def get_nlp_model(language: str) -> spacy.language.Language:
     return _nlp_models[language]
 
 
-def process_text(text: str, language: str = "pt") -> spacy.tokens.Doc:
+def get_active_components(
+    nlp: spacy.language.Language, annotations: Optional[Iterable[str]] = None
+) -> List[str]:
+    """
+    Select the pipeline components needed to produce a set of annotations.
+
+    Args:
+        nlp (spacy.language.Language): Loaded spaCy model
+        annotations (Optional[Iterable[str]]): Required annotations (see
+            ``utils.metrics.get_required_annotations``); the full pipeline
+            when omitted
+
+    Returns:
+        List[str]: Names of the components to run, in pipeline order
+    """
+    if annotations is None:
+        return list(nlp.pipe_names)
+
+    known = set()
+    for components in ANNOTATION_COMPONENTS.values():
+        known.update(components)
+
+    wanted = set()
+    for annotation in annotations:
+        wanted.update(ANNOTATION_COMPONENTS.get(annotation, ()))
+
+    return [name for name in nlp.pipe_names if name not in known or name in wanted]
+
+
+@profiled("parsing")
+def process_text(
+    text: str,
+    language: str = "pt",
+    use_cache: bool = True,
+    annotations: Optional[Iterable[str]] = None,
+    incremental: bool = False,
+) -> spacy.tokens.Doc:
     """
     Process the input text using spaCy's NLP pipeline.
 
+    Only the components producing ``annotations`` are run, so e.g. a fast
+    analysis without named entities skips the NER component. Parsed
+    documents are cached by text hash, language, model, active
+    components and parse mode (full or incremental), so re-analysing the same text (e.g. with other sidebar
+    parameters) skips the pipeline entirely. Texts longer than
+    ``CHUNK_CHARS`` are parsed in chunks (see :func:`process_long_text`).
+
+    In incremental mode the text is parsed paragraph by paragraph and the
+    parsed paragraphs are cached by content hash, so resubmitting an edited
+    draft only re-parses the paragraphs that changed (see
+    :func:`_parse_incremental`).
+
     Args:
         text (str): Input text for analysis
         language (str): Language code
+        use_cache (bool): Whether to read from and write to the parse cache
+        annotations (Optional[Iterable[str]]): Annotations required by the
+            requested metrics; the full pipeline runs when omitted
+        incremental (bool): Reuse the parses of unchanged paragraphs
 
     Returns:
         spacy.tokens.Doc: Processed document
     """
     # Get the appropriate NLP model
     nlp = get_nlp_model(language)
+    active = get_active_components(nlp, annotations)
+    disable = [name for name in nlp.pipe_names if name not in active]
+
+    if not use_cache:
+        return _parse(nlp, text, disable)
+
+    # Paragraph-wise parses differ from full ones at paragraph boundaries
+    mode = "incremental" if incremental else "full"
+    key = _doc_cache.make_key(text, language, nlp, active, mode)
+    doc = _doc_cache.get(key, nlp.vocab)
+    if doc is None and disable:
+        # A document parsed by the full pipeline carries every annotation
+        doc = _doc_cache.get(
+            _doc_cache.make_key(text, language, nlp, nlp.pipe_names, mode),
+            nlp.vocab,
+        )
+    if doc is None:
+        # Process the text; ``disable`` leaves the shared model untouched
+        if incremental:
+            doc = _parse_incremental(nlp, text, language, active, disable)
+        else:
+            doc = _parse(nlp, text, disable)
+        _doc_cache.put(key, doc)
+
+    return doc
+
 
-    # Process the text
-    doc = nlp(text)
+def process_long_text(
+    text: str,
+    language: str = "pt",
+    chunk_chars: Optional[int] = None,
+    memory_mb: Optional[int] = None,
+    n_process: int = 1,
+    annotations: Optional[Iterable[str]] = None,
+) -> spacy.tokens.Doc:
+    """
+    Parse a long text in paragraph-aligned chunks and merge the result.
+
+    The text is split on line breaks into chunks of about ``chunk_chars``
+    characters, which are streamed through ``nlp.pipe`` and joined back with
+    ``Doc.from_docs``. The chunks concatenate to the original string, so
+    ``token.idx``, ``sent.start_char`` and entity offsets refer to ``text``
+    exactly as with a single ``nlp(text)`` call. Chunk size and the number
+    of chunks parsed at once are bounded so the estimated parser memory
+    stays below ``memory_mb``.
 
+    Args:
+        text (str): Input text for analysis
+        language (str): Language code
+        chunk_chars (Optional[int]): Maximum characters per chunk
+            (``CHUNK_CHARS`` by default)
+        memory_mb (Optional[int]): Parser memory ceiling in megabytes
+            (``CHUNK_MEMORY_MB`` by default)
+        n_process (int): Number of worker processes used by ``nlp.pipe``
+        annotations (Optional[Iterable[str]]): Annotations required by the
+            requested metrics; the full pipeline runs when omitted
+
+    Returns:
+        spacy.tokens.Doc: Processed document covering the whole text
+    """
+    nlp = get_nlp_model(language)
+    active = get_active_components(nlp, annotations)
+    disable = [name for name in nlp.pipe_names if name not in active]
+
+    return parse_in_chunks(
+        nlp,
+        text,
+        chunk_chars=chunk_chars or _env_config.chunk_chars,
+        memory_mb=memory_mb or _env_config.chunk_memory_mb,
+        n_process=n_process,
+        disable=disable,
+    )
+
+
+@profiled("parsing", name="parse")
+def _parse(nlp, text: str, disable: List[str]) -> spacy.tokens.Doc:
+    """Parse ``text`` in one call, or in chunks when it exceeds ``CHUNK_CHARS``."""
+    if len(text) > _env_config.chunk_chars:
+        return parse_in_chunks(
+            nlp,
+            text,
+            chunk_chars=_env_config.chunk_chars,
+            memory_mb=_env_config.chunk_memory_mb,
+            disable=disable,
+        )
+    return nlp(text, disable=disable)
+
+
+@profiled("parsing", name="parse_incremental")
+def _parse_incremental(
+    nlp, text: str, language: str, active: List[str], disable: List[str]
+) -> spacy.tokens.Doc:
+    """
+    Parse ``text`` paragraph by paragraph, reusing cached paragraph parses.
+
+    Paragraphs are looked up in the paragraph cache by content hash; only
+    the missing ones go through the pipeline (batched with ``nlp.pipe``).
+    The paragraph Docs are then merged with ``Doc.from_docs``; they
+    concatenate to ``text``, so every character offset refers to it.
+    Paragraph boundaries always start a new sentence. The number of
+    paragraphs and of re-parsed ones is recorded in
+    ``doc.user_data[INCREMENTAL_KEY]``.
+
+    The returned Doc is never a cached paragraph Doc, so the per-document
+    data later stored in its ``user_data`` does not leak into the cache.
+    """
+    segments = split_into_paragraphs(text)
+    keys = [
+        _paragraph_cache.make_key(segment, language, nlp, active)
+        for segment in segments
+    ]
+    docs = [_paragraph_cache.get(key, nlp.vocab) for key in keys]
+
+    missing = [i for i, doc in enumerate(docs) if doc is None]
+    short = [i for i in missing if len(segments[i]) <= _env_config.chunk_chars]
+    parsed = nlp.pipe((segments[i] for i in short), disable=disable)
+    for i, doc in zip(short, parsed):
+        docs[i] = doc
+    for i in missing:
+        if docs[i] is None:
+            # A paragraph longer than CHUNK_CHARS is itself parsed in chunks
+            docs[i] = _parse(nlp, segments[i], disable)
+    for i in missing:
+        _paragraph_cache.put(keys[i], docs[i])
+
+    if len(docs) == 1:
+        doc = docs[0].copy()
+    else:
+        doc = Doc.from_docs(docs, ensure_whitespace=False)
+    doc.user_data[INCREMENTAL_KEY] = {
+        "paragraphs": len(segments),
+        "reparsed": len(missing),
+    }
     return doc
 
 
+def process_texts(
+    texts: Iterable[str],
+    language: str = "pt",
+    batch_size: int = 32,
+    n_process: int = 1,
+    annotations: Optional[Iterable[str]] = None,
+) -> Iterator[spacy.tokens.Doc]:
+    """
+    Stream several texts through spaCy's NLP pipeline with ``nlp.pipe``.
+
+    Args:
+        texts (Iterable[str]): Input texts, consumed lazily
+        language (str): Language code
+        batch_size (int): Number of texts buffered per pipeline batch
+        n_process (int): Number of worker processes used by ``nlp.pipe``
+        annotations (Optional[Iterable[str]]): Annotations required by the
+            requested metrics; the full pipeline runs when omitted
+
+    Returns:
+        Iterator[spacy.tokens.Doc]: Processed documents, in input order
+    """
+    nlp = get_nlp_model(language)
+    active = get_active_components(nlp, annotations)
+    disable = [name for name in nlp.pipe_names if name not in active]
+
+    yield from nlp.pipe(
+        texts, batch_size=batch_size, n_process=n_process, disable=disable
+    )
+
+
 def segment_text(doc: spacy.tokens.Doc) -> List[Dict[str, Any]]:
     """
     Segment the text into logical units (sentences, paragraphs).
 
+    Sentences are assigned to paragraphs by character offset through the
+    document's paragraph index (see ``utils.doc_index``), in linear time.
+
     Args:
         doc (spacy.tokens.Doc): Processed spaCy document
 
     Returns:
         List[Dict[str, Any]]: List of text segments with metadata
     """
-    # Split text into paragraphs
-    paragraphs = [p for p in doc.text.split("\n") if p.strip()]
+    index = get_doc_index(doc)
 
     segments = []
     sent_idx = 0
 
-    for p_idx, paragraph in enumerate(paragraphs):
-        # Process paragraph sentences
-        sentences = [s for s in doc.sents if s.text in paragraph]
-
-        if not sentences:
+    for sentence, p_idx in zip(index.sentences, index.sent_paragraph):
+        # Whitespace-only sentences between paragraphs carry no content
+        if p_idx < 0:
             continue
 
-        for sentence in sentences:
-            segments.append(
-                {
-                    "id": f"s{sent_idx}",
-                    "paragraph_id": f"p{p_idx}",
-                    "text": sentence.text,
-                    "start_char": sentence.start_char,
-                    "end_char": sentence.end_char,
-                    "tokens": [token.text for token in sentence],
-                    "pos_tags": [token.pos_ for token in sentence],
-                    "dependencies": [
-                        (token.text, token.dep_, token.head.text) for token in sentence
-                    ],
-                    "entities": [(ent.text, ent.label_) for ent in sentence.ents],
-                }
-            )
-            sent_idx += 1
+        segments.append(
+            {
+                "id": f"s{sent_idx}",
+                "paragraph_id": f"p{p_idx}",
+                "text": sentence.text,
+                "start_char": sentence.start_char,
+                "end_char": sentence.end_char,
+                "tokens": [token.text for token in sentence],
+                "pos_tags": [token.pos_ for token in sentence],
+                "dependencies": [
+                    (token.text, token.dep_, token.head.text) for token in sentence
+                ],
+                "entities": [(ent.text, ent.label_) for ent in sentence.ents],
+            }
+        )
+        sent_idx += 1
 
     return segments
 
 
-def extract_linguistic_features(doc: spacy.tokens.Doc) -> Dict[str, Any]:
+def extract_linguistic_features(
+    doc: spacy.tokens.Doc, return_arrays: bool = False
+) -> Dict[str, Any]:
     """
     Extract linguistic features from the processed document.
 
+    Token attributes are exported once with ``Doc.to_array`` and aggregated
+    with NumPy (``np.bincount``/``np.unique``), so the cost stays linear in
+    the number of tokens.
+
     Args:
         doc (spacy.tokens.Doc): Processed spaCy document
+        return_arrays (bool): Also return the raw per-token attribute arrays
+            under the ``arrays`` key (for batch consumers)
 
     Returns:
         Dict[str, Any]: Dictionary containing linguistic features
     """
+    strings = doc.vocab.strings
+    values = doc.to_array(_FEATURE_ATTRS)
+    columns = {name.lower(): values[:, col] for col, name in enumerate(_FEATURE_ATTRS)}
+    # HEAD is a relative offset stored as unsigned; reinterpret it as signed
+    columns["head"] = columns["head"].view(np.int64)
+    is_stop = columns["is_stop"].astype(bool)
+    is_punct = columns["is_punct"].astype(bool)
+    is_space = columns["is_space"].astype(bool)
+
     # Tokenization statistics
-    tokens = [token for token in doc if not token.is_punct and not token.is_space]
-    content_tokens = [token for token in tokens if not token.is_stop]
+    is_token = ~is_punct & ~is_space
+    is_content = is_token & ~is_stop
+    token_count = int(is_token.sum())
+    content_token_count = int(is_content.sum())
 
     # Lexical features
-    unique_lemmas = set(token.lemma_ for token in content_tokens)
+    unique_lemma_count = int(np.unique(columns["lemma"][is_content]).size)
 
     # Syntactic features
-    sentences = list(doc.sents)
-    sentence_lengths = [
-        len([token for token in sent if not token.is_punct]) for sent in sentences
-    ]
-
-    # Dependency features
-    dep_distances = []
-    for token in doc:
-        if token.head != token:  # Exclude root
-            distance = abs(token.i - token.head.i)
-            dep_distances.append(distance)
-
-    # Entity recognition
-    entities = list(doc.ents)
-    entity_labels = [ent.label_ for ent in entities]
+    # SENT_START is 1 on the first token of each sentence (the first token of
+    # the document always opens one)
+    sent_starts = np.flatnonzero(columns["sent_start"].view(np.int64) == 1)
+    if len(doc) and (not sent_starts.size or sent_starts[0] != 0):
+        sent_starts = np.concatenate(([0], sent_starts))
+    sentence_count = len(sent_starts)
+    sent_id = np.searchsorted(sent_starts, np.arange(len(doc)), side="right") - 1
+    sentence_lengths = np.bincount(sent_id[~is_punct], minlength=sentence_count)
+
+    # Dependency features (roots have a relative head offset of 0)
+    dep_distances = np.abs(columns["head"][columns["head"] != 0])
+
+    # Entity recognition (ENT_IOB 3 marks the first token of an entity)
+    entity_labels = columns["ent_type"][columns["ent_iob"] == 3]
+    label_ids, label_counts = np.unique(entity_labels, return_counts=True)
+    entity_count = len(entity_labels)
 
     # Named entity density
-    entity_density = len(entities) / len(sentences) if sentences else 0
+    entity_density = entity_count / sentence_count if sentence_count else 0
 
     # Part of speech statistics
-    pos_counts = {}
-    for token in doc:
-        pos = token.pos_
-        pos_counts[pos] = pos_counts.get(pos, 0) + 1
+    pos_ids, pos_counts = np.unique(columns["pos"], return_counts=True)
 
     # Compilation of features
     features = {
-        "token_count": len(tokens),
-        "content_token_count": len(content_tokens),
-        "unique_lemma_count": len(unique_lemmas),
+        "token_count": token_count,
+        "content_token_count": content_token_count,
+        "unique_lemma_count": unique_lemma_count,
         "lexical_diversity": (
-            len(unique_lemmas) / len(content_tokens) if content_tokens else 0
+            unique_lemma_count / content_token_count if content_token_count else 0
         ),
-        "sentence_count": len(sentences),
-        "avg_sentence_length": np.mean(sentence_lengths) if sentence_lengths else 0,
+        "sentence_count": sentence_count,
+        "avg_sentence_length": np.mean(sentence_lengths) if sentence_count else 0,
         "median_sentence_length": (
-            np.median(sentence_lengths) if sentence_lengths else 0
+            np.median(sentence_lengths) if sentence_count else 0
         ),
-        "sentence_length_std": np.std(sentence_lengths) if sentence_lengths else 0,
-        "avg_dependency_distance": np.mean(dep_distances) if dep_distances else 0,
-        "max_dependency_distance": max(dep_distances) if dep_distances else 0,
-        "entity_count": len(entities),
-        "entity_density": entity_density,
-        "entity_types": dict(
-            [(label, entity_labels.count(label)) for label in set(entity_labels)]
+        "sentence_length_std": np.std(sentence_lengths) if sentence_count else 0,
+        "avg_dependency_distance": (
+            np.mean(dep_distances) if dep_distances.size else 0
         ),
-        "pos_distribution": pos_counts,
+        "max_dependency_distance": (
+            int(dep_distances.max()) if dep_distances.size else 0
+        ),
+        "entity_count": entity_count,
+        "entity_density": entity_density,
+        "entity_types": {
+            strings[int(label)]: int(count)
+            for label, count in zip(label_ids, label_counts)
+        },
+        "pos_distribution": {
+            strings[int(pos)]: int(count) for pos, count in zip(pos_ids, pos_counts)
+        },
     }
 
+    if return_arrays:
+        columns["sent_id"] = sent_id
+        features["arrays"] = columns
+
     return features
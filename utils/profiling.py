@@ -0,0 +1,276 @@
+"""
+Lightweight instrumentation of the analysis pipeline.
+
+A ``Profiler`` records the wall time, call count and (optionally) peak
+Python allocation of named sections: parsing, every ``calculate_*``
+metric, every ``recommend_*`` function and annotation generation. Code
+marks its sections with the ``profiled`` decorator or the
+``profile_section`` context manager; both are no-ops unless a profiler
+is active, so the instrumented functions cost one context-variable
+lookup when nobody is measuring.
+
+Usage::
+
+    with Profiler(trace_memory=True) as profiler:
+        metrics = calculate_metrics(doc)
+    results["profile"] = profiler.summary()
+    profiler.dump_chrome_trace("trace.json")  # chrome://tracing, Perfetto
+"""
+
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+# Profiler receiving the sections of the current context (None: disabled)
+_ACTIVE: ContextVar[Optional["Profiler"]] = ContextVar("lexa_profiler", default=None)
+
+
+class Profiler:
+    """Collects timing (and memory) statistics of instrumented sections."""
+
+    def __init__(self, trace_memory: bool = False):
+        """
+        Args:
+            trace_memory (bool): Also record the peak allocation of every
+                section with ``tracemalloc`` (slows the measured code down)
+        """
+        self.trace_memory = trace_memory
+        self.events: List[Dict[str, Any]] = []
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._origin = time.perf_counter()
+        self._started_tracing = False
+        self._token = None
+
+    # -- activation -------------------------------------------------------
+
+    def __enter__(self) -> "Profiler":
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._token = _ACTIVE.set(self)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        _ACTIVE.reset(self._token)
+        self._token = None
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    # -- recording --------------------------------------------------------
+
+    @contextmanager
+    def section(self, name: str, category: str = "analysis") -> Iterator[None]:
+        """
+        Measure the enclosed block as one call of section ``name``.
+
+        Args:
+            name (str): Section name (e.g. the function name)
+            category (str): Section group (parsing, metric, recommendation...)
+        """
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        if tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            if stack:
+                # Keep the enclosing section's peak before resetting it
+                stack[-1]["floor"] = max(stack[-1]["floor"], peak)
+            tracemalloc.reset_peak()
+            frame = {"base": current, "floor": current}
+        else:
+            frame = {}
+        stack.append(frame)
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            stack.pop()
+            peak_bytes = None
+            if tracing:
+                peak = max(tracemalloc.get_traced_memory()[1], frame["floor"])
+                peak_bytes = peak - frame["base"]
+                if stack:
+                    stack[-1]["floor"] = max(stack[-1]["floor"], peak)
+            self._record(name, category, start, duration, peak_bytes)
+
+    def _record(
+        self,
+        name: str,
+        category: str,
+        start: float,
+        duration: float,
+        peak_bytes: Optional[int],
+    ) -> None:
+        event = {
+            "name": name,
+            "cat": category,
+            "start": start - self._origin,
+            "duration": duration,
+            "tid": threading.get_ident(),
+        }
+        if peak_bytes is not None:
+            event["peak_bytes"] = peak_bytes
+
+        with self._lock:
+            self.events.append(event)
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = {
+                    "category": category,
+                    "calls": 0,
+                    "total": 0.0,
+                    "max": 0.0,
+                }
+            stats["calls"] += 1
+            stats["total"] += duration
+            stats["max"] = max(stats["max"], duration)
+            if peak_bytes is not None:
+                stats["peak_bytes"] = max(stats.get("peak_bytes", 0), peak_bytes)
+
+    # -- reporting --------------------------------------------------------
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Aggregate statistics per section, slowest first.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Per section: category, calls, total,
+            mean and max wall time in seconds and, when memory is traced,
+            peak_bytes
+        """
+        with self._lock:
+            items = [(name, dict(stats)) for name, stats in self._stats.items()]
+
+        items.sort(key=lambda item: item[1]["total"], reverse=True)
+        for _, stats in items:
+            stats["mean"] = stats["total"] / stats["calls"]
+        return dict(items)
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """
+        Convert the recorded sections to the Chrome trace event format.
+
+        Returns:
+            Dict[str, Any]: ``{"traceEvents": [...]}`` with one complete
+            ("X") event per section call, timestamps in microseconds
+        """
+        pid = os.getpid()
+        with self._lock:
+            events = list(self.events)
+
+        trace_events = []
+        for event in events:
+            trace_event = {
+                "name": event["name"],
+                "cat": event["cat"],
+                "ph": "X",
+                "ts": event["start"] * 1e6,
+                "dur": event["duration"] * 1e6,
+                "pid": pid,
+                "tid": event["tid"],
+            }
+            if "peak_bytes" in event:
+                trace_event["args"] = {"peak_bytes": event["peak_bytes"]}
+            trace_events.append(trace_event)
+
+        return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+    def dump_chrome_trace(self, path: str) -> None:
+        """
+        Write the Chrome trace JSON to ``path``.
+
+        Args:
+            path (str): Output file (parent directories are created)
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(self.to_chrome_trace(), handle)
+
+
+def get_active_profiler() -> Optional[Profiler]:
+    """Return the profiler of the current context, if any."""
+    return _ACTIVE.get()
+
+
+@contextmanager
+def profile_section(name: str, category: str = "analysis") -> Iterator[None]:
+    """
+    Measure the enclosed block with the active profiler (no-op without one).
+
+    Args:
+        name (str): Section name
+        category (str): Section group
+    """
+    profiler = _ACTIVE.get()
+    if profiler is None:
+        yield
+        return
+
+    with profiler.section(name, category):
+        yield
+
+
+def profiled(category: str, name: str = None) -> Callable:
+    """
+    Decorator recording every call of a function as a profiler section.
+
+    Args:
+        category (str): Section group (e.g. "metric")
+        name (str): Section name (defaults to the function name)
+
+    Returns:
+        Callable: Decorator
+    """
+
+    def decorator(func: Callable) -> Callable:
+        section_name = name or func.__name__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            profiler = _ACTIVE.get()
+            if profiler is None:
+                return func(*args, **kwargs)
+            with profiler.section(section_name, category):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def save_chrome_trace(
+    profiler: Profiler, directory: Optional[str], prefix: str = "analysis"
+) -> Optional[str]:
+    """
+    Dump the profiler's Chrome trace to a timestamped file in ``directory``.
+
+    Args:
+        profiler (Profiler): Profiler holding the recorded sections
+        directory (Optional[str]): Output directory; nothing is written
+            when it is empty or ``None``
+        prefix (str): File name prefix
+
+    Returns:
+        Optional[str]: Path of the written file, if any
+    """
+    if not directory:
+        return None
+
+    path = os.path.join(directory, f"{prefix}-{time.time_ns()}.json")
+    profiler.dump_chrome_trace(path)
+    return path
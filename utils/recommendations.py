@@ -1,47 +1,72 @@
+import time
+
 import spacy
 import numpy as np
 from typing import Dict, List, Any, Optional
 
+from utils.features import get_doc_features
+from utils.lazy_results import PARAMETERS_KEY, memoized
+from utils.metrics import get_metric_evidence
+from utils.profiling import profiled
+
 
 def generate_recommendations(
     doc: spacy.tokens.Doc,
     metrics: Dict[str, Any],
     domain: str = "Acadêmico",
     genre: str = "Artigo Científico",
+    audience: str = "Acadêmico",
+    time_budget: float = None,
 ) -> List[Dict[str, Any]]:
     """
     Generate text improvement recommendations based on metrics.
 
+    Metrics marked as pending (skipped by a time-bounded
+    ``calculate_metrics``) get no recommendation, since their score is
+    only a placeholder. Recommendations are built from the evidence the
+    metrics recorded, so the Doc is not walked again.
+
     Args:
         doc (spacy.tokens.Doc): Processed spaCy document
         metrics (Dict[str, Any]): Calculated metrics
         domain (str): Text domain
         genre (str): Text genre
+        audience (str): Target audience level
+        time_budget (float): Seconds available (unbounded when omitted);
+            once spent, the remaining recommendations are skipped
 
     Returns:
         List[Dict[str, Any]]: List of recommendations
     """
     recommendations = []
+    deadline = time.perf_counter() + time_budget if time_budget is not None else None
 
     # Check for low-scoring metrics
     for dim_key, dim_metrics in metrics["dimensions"].items():
         for metric_key, metric_info in dim_metrics.items():
             if isinstance(metric_info, dict) and "score" in metric_info:
+                if metric_info.get("pending"):
+                    continue
+
                 score = metric_info["score"]
                 expected_range = metric_info.get("expected_range", (70, 90))
                 expected_min = expected_range[0]
 
                 if score < expected_min:
+                    if deadline is not None and time.perf_counter() >= deadline:
+                        break
+
                     # Generate recommendation for this low-scoring metric
                     recommendation = generate_metric_recommendation(
-                        doc, dim_key, metric_key, metric_info, domain, genre
+                        doc, dim_key, metric_key, metric_info, domain, genre, audience
                     )
 
                     if recommendation is not None:
                         recommendations.append(recommendation)
 
     # Add general improvement recommendations if needed
-    if metrics["overall_score"] < 70 and len(recommendations) < 3:
+    within_budget = deadline is None or time.perf_counter() < deadline
+    if within_budget and metrics["overall_score"] < 70 and len(recommendations) < 3:
         general_recs = generate_general_recommendations(doc, metrics, domain, genre)
         recommendations.extend(general_recs)
 
@@ -51,6 +76,37 @@ def generate_recommendations(
     return recommendations
 
 
+def get_recommendations(analysis_results: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Return the recommendations of an analysis, generating them on first use.
+
+    They are memoized in ``analysis_results`` for its analysis id (see
+    ``utils.lazy_results``), so reruns of the page reuse them. Generation
+    is bounded by the ``time_budget`` of the analysis parameters: what
+    the metrics left of the plan's budget.
+
+    Args:
+        analysis_results (Dict[str, Any]): Results of the analysis, with
+            the ``doc``, the ``metrics`` and the analysis ``parameters``
+
+    Returns:
+        List[Dict[str, Any]]: List of recommendations
+    """
+    parameters = analysis_results.get(PARAMETERS_KEY, {})
+    return memoized(
+        analysis_results,
+        "recommendations",
+        lambda: generate_recommendations(
+            analysis_results["doc"],
+            analysis_results["metrics"],
+            domain=parameters.get("domain", "Acadêmico"),
+            genre=parameters.get("genre", "Artigo Científico"),
+            audience=parameters.get("audience", "Acadêmico"),
+            time_budget=parameters.get("time_budget"),
+        ),
+    )
+
+
 def generate_metric_recommendation(
     doc: spacy.tokens.Doc,
     dimension: str,
@@ -58,6 +114,7 @@ def generate_metric_recommendation(
     metric_info: Dict[str, Any],
     domain: str,
     genre: str,
+    audience: str = "Acadêmico",
 ) -> Dict[str, Any]:
     """
     Generate a recommendation for a specific metric.
@@ -69,6 +126,7 @@ def generate_metric_recommendation(
         metric_info (Dict[str, Any]): Metric information
         domain (str): Text domain
         genre (str): Text genre
+        audience (str): Target audience level
 
     Returns:
         Dict[str, Any]: Recommendation dictionary
@@ -106,7 +164,7 @@ def generate_metric_recommendation(
         and metric in recommendation_strategies[dimension]
     ):
         recommendation_func = recommendation_strategies[dimension][metric]
-        return recommendation_func(doc, metric_info, domain, genre)
+        return recommendation_func(doc, metric_info, domain, genre, audience)
 
     # Fallback to generic recommendation
     return {
@@ -121,6 +179,7 @@ def generate_metric_recommendation(
     }
 
 
+@profiled("recommendation")
 def generate_general_recommendations(
     doc: spacy.tokens.Doc, metrics: Dict[str, Any], domain: str, genre: str
 ) -> List[Dict[str, Any]]:
@@ -197,50 +256,67 @@ def generate_general_recommendations(
     return general_recommendations
 
 
+def _metric_evidence(
+    doc: spacy.tokens.Doc,
+    key: tuple,
+    metric_info: Dict[str, Any],
+    domain: str,
+    genre: str,
+    audience: str,
+) -> Dict[str, Any]:
+    """
+    Return the evidence of a metric, from its result when present.
+
+    Args:
+        doc (spacy.tokens.Doc): Processed document
+        key (tuple): (dimension, metric) of the metric
+        metric_info (Dict[str, Any]): Metric information
+        domain (str): Text domain
+        genre (str): Text genre
+        audience (str): Target audience level
+
+    Returns:
+        Dict[str, Any]: Evidence recorded by the metric
+    """
+    evidence = metric_info.get("evidence")
+    if evidence is None:
+        evidence = get_metric_evidence(
+            doc, key, domain=domain, genre=genre, audience=audience
+        )
+    return evidence
+
+
 # Specific recommendation functions
 
 
+@profiled("recommendation")
 def recommend_referential_cohesion(
-    doc: spacy.tokens.Doc, metric_info: Dict[str, Any], domain: str, genre: str
+    doc: spacy.tokens.Doc,
+    metric_info: Dict[str, Any],
+    domain: str,
+    genre: str,
+    audience: str = "Acadêmico",
 ) -> Dict[str, Any]:
     """Generate recommendation for improving referential cohesion"""
-    # Identify problematic references
-    sentences = list(doc.sents)
-    reference_tokens = [
-        token
-        for token in doc
-        if token.pos_ in ("PRON", "DET") and token.dep_ not in ("ROOT")
-    ]
-
-    problematic_refs = []
-    for token in reference_tokens:
-        # Simple heuristic: check if token has no obvious referent
-        potential_referents = [
-            t for t in token.ancestors if t.pos_ in ("NOUN", "PROPN")
-        ]
-        if not potential_referents:
-            sent_idx = -1
-            for i, sent in enumerate(sentences):
-                if token.i >= sent.start and token.i < sent.end:
-                    sent_idx = i
-                    break
-
-            if sent_idx >= 0:
-                problematic_refs.append(
-                    {
-                        "token": token.text,
-                        "sentence_idx": sent_idx,
-                        "sentence": sentences[sent_idx].text,
-                    }
-                )
+    # References without an obvious referent, as found by the metric
+    evidence = _metric_evidence(
+        doc, ("coesao", "referencial"), metric_info, domain, genre, audience
+    )
+    features = get_doc_features(doc)
 
     # Create recommendation
     affected_segments = []
     examples = []
 
-    for i, ref in enumerate(problematic_refs[:3]):  # Limit to 3 examples
-        affected_segments.append(ref["sentence_idx"])
-        examples.append(f"'{ref['token']}' em: \"{ref['sentence']}\"")
+    # Limit to 3 examples
+    for token_id, sent_idx in list(
+        zip(evidence.get("token_ids", []), evidence.get("sentence_ids", []))
+    )[:3]:
+        affected_segments.append(sent_idx)
+        examples.append(
+            f"'{features.tokens[token_id].text}' em: "
+            f"\"{features.sentences[sent_idx].text}\""
+        )
 
     description = f"""A coesão referencial do texto pode ser melhorada. Foram encontradas referências potencialmente ambíguas ou vagas, como:
     
@@ -263,24 +339,19 @@ Recomendações:
     }
 
 
+@profiled("recommendation")
 def recommend_lexical_cohesion(
-    doc: spacy.tokens.Doc, metric_info: Dict[str, Any], domain: str, genre: str
+    doc: spacy.tokens.Doc,
+    metric_info: Dict[str, Any],
+    domain: str,
+    genre: str,
+    audience: str = "Acadêmico",
 ) -> Dict[str, Any]:
     """Generate recommendation for improving lexical cohesion"""
-    # Identify potential lexical cohesion issues
-    content_words = [
-        token
-        for token in doc
-        if token.pos_ in ("NOUN", "VERB", "ADJ", "ADV") and not token.is_stop
-    ]
-
-    # Check for potential synonym overuse
-    lemma_counts = {}
-    for token in content_words:
-        lemma_counts[token.lemma_] = lemma_counts.get(token.lemma_, 0) + 1
-
-    # Get words with high frequency that might need variation
-    repeated_lemmas = [lemma for lemma, count in lemma_counts.items() if count > 5]
+    # Words with high frequency that might need variation
+    repeated_lemmas = _metric_evidence(
+        doc, ("coesao", "lexical"), metric_info, domain, genre, audience
+    ).get("repeated_lemmas", [])
 
     # Create recommendation
     if repeated_lemmas:
@@ -315,23 +386,23 @@ Recomendações:
     }
 
 
+@profiled("recommendation")
 def recommend_structural_cohesion(
-    doc: spacy.tokens.Doc, metric_info: Dict[str, Any], domain: str, genre: str
+    doc: spacy.tokens.Doc,
+    metric_info: Dict[str, Any],
+    domain: str,
+    genre: str,
+    audience: str = "Acadêmico",
 ) -> Dict[str, Any]:
     """Generate recommendation for improving structural cohesion"""
-    # Identify connecting words
-    connectives = [
-        token
-        for token in doc
-        if token.pos_ in ("CCONJ", "SCONJ")
-        or (token.pos_ == "ADV" and token.dep_ == "advmod")
-    ]
-
-    sentences = list(doc.sents)
-    connective_types = set(token.lemma_ for token in connectives)
+    # Connecting words counted by the metric
+    evidence = _metric_evidence(
+        doc, ("coesao", "estrutural"), metric_info, domain, genre, audience
+    )
+    sentences = evidence.get("sentences", 0)
 
-    low_variety = len(connective_types) < 5
-    low_density = len(connectives) / len(sentences) < 0.5 if sentences else True
+    low_variety = evidence.get("connective_types", 0) < 5
+    low_density = evidence.get("connectives", 0) / sentences < 0.5 if sentences else True
 
     # Create recommendation
     if low_density:
@@ -371,41 +442,29 @@ Recomendações:
     }
 
 
+@profiled("recommendation")
 def recommend_topic_continuity(
     doc: spacy.tokens.Doc,
     metric_info: Dict[str, Any],
     domain: str,
     genre: str,
+    audience: str = "Acadêmico",
 ) -> Optional[Dict[str, Any]]:
     """Generate recommendation for improving topic continuity.
 
     Returns ``None`` when there are not enough sentences to analyse.
     """
-    sentences = list(doc.sents)
+    evidence = _metric_evidence(
+        doc, ("coerencia", "continuidade"), metric_info, domain, genre, audience
+    )
 
-    if len(sentences) < 3:
+    if evidence.get("sentences", 0) < 3:
         # Not enough sentences to analyze
         return None
 
-    # Calculate semantic similarity between adjacent sentences
-    sentence_embeddings = [sent.vector for sent in sentences]
-
-    # Find potential topic shifts
-    shifts = []
-    for i in range(len(sentence_embeddings) - 1):
-        # Calculate cosine similarity
-        vec1 = sentence_embeddings[i]
-        vec2 = sentence_embeddings[i + 1]
-
-        # Normalize vectors
-        norm1 = np.linalg.norm(vec1)
-        norm2 = np.linalg.norm(vec2)
-
-        if norm1 > 0 and norm2 > 0:
-            sim = np.dot(vec1, vec2) / (norm1 * norm2)
-
-            if sim < 0.3:  # Threshold for potential topic shift
-                shifts.append(i)
+    # Potential topic shifts between adjacent sentences, found by the metric
+    shifts = evidence.get("topic_shifts", [])
+    sentences = get_doc_features(doc).sentences
 
     # Create recommendation
     affected_segments = []
@@ -451,43 +510,28 @@ Recomendações:
     }
 
 
+@profiled("recommendation")
 def recommend_thematic_progression(
     doc: spacy.tokens.Doc,
     metric_info: Dict[str, Any],
     domain: str,
     genre: str,
+    audience: str = "Acadêmico",
 ) -> Optional[Dict[str, Any]]:
     """Generate recommendation for improving thematic progression.
 
     Returns ``None`` when there are not enough sentences to analyse.
     """
-    sentences = list(doc.sents)
+    evidence = _metric_evidence(
+        doc, ("coerencia", "progressao"), metric_info, domain, genre, audience
+    )
 
-    if len(sentences) < 3:
+    if evidence.get("sentences", 0) < 3:
         # Not enough sentences to analyze
         return None
 
-    # Extract sentence subjects (simplified)
-    sentence_subjects = []
-    for sent in sentences:
-        subjects = [token for token in sent if token.dep_ in ("nsubj", "nsubjpass")]
-        if subjects:
-            sentence_subjects.append(subjects[0])
-        else:
-            # Fallback to first noun or first token
-            nouns = [token for token in sent if token.pos_ in ("NOUN", "PROPN")]
-            if nouns:
-                sentence_subjects.append(nouns[0])
-            else:
-                sentence_subjects.append(sent[0])
-
-    # Check for thematic patterns
-    constant_theme = 0
-    for i in range(len(sentence_subjects) - 1):
-        if sentence_subjects[i].lemma_ == sentence_subjects[i + 1].lemma_:
-            constant_theme += 1
-
-    constant_rate = constant_theme / (len(sentences) - 1)
+    # Rate of consecutive sentences sharing their theme
+    constant_rate = evidence.get("constant_rate", 0)
 
     # Create recommendation
     if constant_rate > 0.7:
@@ -527,30 +571,19 @@ Recomendações:
     }
 
 
+@profiled("recommendation")
 def recommend_rhetorical_structure(
-    doc: spacy.tokens.Doc, metric_info: Dict[str, Any], domain: str, genre: str
+    doc: spacy.tokens.Doc,
+    metric_info: Dict[str, Any],
+    domain: str,
+    genre: str,
+    audience: str = "Acadêmico",
 ) -> Dict[str, Any]:
     """Generate recommendation for improving rhetorical structure"""
-    sentences = list(doc.sents)
-
-    # Simple check for discourse markers
-    relation_markers = {
-        "contrast": ["but", "however", "yet", "although", "though", "while", "whereas"],
-        "cause": ["because", "since", "as", "therefore", "thus", "consequently", "so"],
-        "elaboration": ["furthermore", "moreover", "in addition", "additionally"],
-        "example": ["for example", "for instance", "such as", "including"],
-        "conclusion": ["in conclusion", "to summarize", "finally", "in summary"],
-    }
-
-    # Count relation types in text
-    relation_counts = {relation: 0 for relation in relation_markers}
-
-    for sent in sentences:
-        sent_text = sent.text.lower()
-        for relation, markers in relation_markers.items():
-            for marker in markers:
-                if marker in sent_text:
-                    relation_counts[relation] += 1
+    # Relation types marked in the text, counted by the metric
+    relation_counts = _metric_evidence(
+        doc, ("coerencia", "retorica"), metric_info, domain, genre, audience
+    ).get("relation_counts", {})
 
     # Identify missing or underrepresented relations
     missing_relations = [rel for rel, count in relation_counts.items() if count == 0]
@@ -580,7 +613,7 @@ Recomendações específicas:"""
             description += (
                 "\n- Inclua exemplos concretos para ilustrar conceitos abstratos"
             )
-        if "conclusion" in missing_relations or relation_counts["conclusion"] < 2:
+        if relation_counts.get("conclusion", 0) < 2:
             description += (
                 "\n- Fortaleça a conclusão com marcadores de síntese e implicações"
             )
@@ -620,8 +653,13 @@ Recomendações:
     }
 
 
+@profiled("recommendation")
 def recommend_genre_conformity(
-    doc: spacy.tokens.Doc, metric_info: Dict[str, Any], domain: str, genre: str
+    doc: spacy.tokens.Doc,
+    metric_info: Dict[str, Any],
+    domain: str,
+    genre: str,
+    audience: str = "Acadêmico",
 ) -> Dict[str, Any]:
     """Generate recommendation for improving genre conformity"""
     # Create genre-specific recommendations
@@ -693,53 +731,21 @@ def recommend_genre_conformity(
     }
 
 
+@profiled("recommendation")
 def recommend_register_adequacy(
-    doc: spacy.tokens.Doc, metric_info: Dict[str, Any], domain: str, genre: str
+    doc: spacy.tokens.Doc,
+    metric_info: Dict[str, Any],
+    domain: str,
+    genre: str,
+    audience: str = "Acadêmico",
 ) -> Dict[str, Any]:
     """Generate recommendation for improving register adequacy"""
-    # Check formality markers
-    formality_indicators = {
-        "formal": [
-            "would",
-            "shall",
-            "may",
-            "might",
-            "could",
-            "therefore",
-            "thus",
-            "consequently",
-            "moreover",
-            "furthermore",
-            "accordingly",
-            "hence",
-        ],
-        "informal": [
-            "well",
-            "anyway",
-            "actually",
-            "basically",
-            "really",
-            "sort of",
-            "kind of",
-            "you know",
-            "i mean",
-            "like",
-            "so",
-            "pretty",
-            "stuff",
-            "things",
-        ],
-    }
-
-    formal_count = 0
-    informal_count = 0
-
-    for token in doc:
-        token_lower = token.text.lower()
-        if token_lower in formality_indicators["formal"]:
-            formal_count += 1
-        if token_lower in formality_indicators["informal"]:
-            informal_count += 1
+    # Formality markers counted by the metric
+    evidence = _metric_evidence(
+        doc, ("adequacao", "registro"), metric_info, domain, genre, audience
+    )
+    formal_count = evidence.get("formal", 0)
+    informal_count = evidence.get("informal", 0)
 
     total_markers = formal_count + informal_count
     formality_ratio = formal_count / total_markers if total_markers > 0 else 0.5
@@ -813,32 +819,19 @@ Recomendações:
     }
 
 
+@profiled("recommendation")
 def recommend_terminological_precision(
-    doc: spacy.tokens.Doc, metric_info: Dict[str, Any], domain: str, genre: str
+    doc: spacy.tokens.Doc,
+    metric_info: Dict[str, Any],
+    domain: str,
+    genre: str,
+    audience: str = "Acadêmico",
 ) -> Dict[str, Any]:
     """Generate recommendation for improving terminological precision"""
-    # Identify potential terminology issues
-    nouns = [
-        token
-        for token in doc
-        if token.pos_ in ("NOUN", "PROPN") and len(token.text) > 3
-    ]
-
-    # Count unique lemmas and their text variations
-    lemma_variations = {}
-    for token in nouns:
-        lemma = token.lemma_
-        if lemma not in lemma_variations:
-            lemma_variations[lemma] = set()
-        lemma_variations[lemma].add(token.text.lower())
-
-    # Find terms with inconsistent usage
-    inconsistent_terms = []
-    for lemma, variants in lemma_variations.items():
-        if len(variants) > 1:
-            variants_list = list(variants)
-            if len(variants_list) > 1:
-                inconsistent_terms.append({"lemma": lemma, "variants": variants_list})
+    # Terms used in more than one form, found by the metric
+    inconsistent_terms = _metric_evidence(
+        doc, ("precisao", "terminologica"), metric_info, domain, genre, audience
+    ).get("inconsistent_terms", [])
 
     # Create recommendation
     if inconsistent_terms:
@@ -880,53 +873,25 @@ Recomendações:
     }
 
 
+@profiled("recommendation")
 def recommend_structural_clarity(
-    doc: spacy.tokens.Doc, metric_info: Dict[str, Any], domain: str, genre: str
+    doc: spacy.tokens.Doc,
+    metric_info: Dict[str, Any],
+    domain: str,
+    genre: str,
+    audience: str = "Acadêmico",
 ) -> Dict[str, Any]:
     """Generate recommendation for improving structural clarity"""
-    sentences = list(doc.sents)
-
-    # Identify long and complex sentences
-    complex_sentences = []
-    for i, sent in enumerate(sentences):
-        # Count clauses (using verbs as proxy)
-        verbs = [token for token in sent if token.pos_ == "VERB"]
-        clause_count = len(verbs)
-
-        # Count words
-        words = [token for token in sent if not token.is_punct and not token.is_space]
-        word_count = len(words)
-
-        # Count nested structures
-        nested_depth = 0
-        for token in sent:
-            if token.dep_ in ("ccomp", "xcomp", "advcl", "acl"):
-                depth = 1
-                parent = token.head
-                while parent.i < len(doc) and parent.dep_ != "ROOT":
-                    if parent.dep_ in ("ccomp", "xcomp", "advcl", "acl"):
-                        depth += 1
-                    parent = parent.head
-                nested_depth = max(nested_depth, depth)
-
-        # Identify potentially complex sentences
-        if (clause_count > 3 and word_count > 25) or nested_depth > 2:
-            complex_sentences.append(
-                {
-                    "index": i,
-                    "text": sent.text,
-                    "clauses": clause_count,
-                    "words": word_count,
-                    "nesting": nested_depth,
-                }
-            )
+    # Long and complex sentences, found by the metric
+    complex_sentences = _metric_evidence(
+        doc, ("precisao", "estrutural"), metric_info, domain, genre, audience
+    ).get("complex_sentences", [])
 
     # Create recommendation
     if complex_sentences:
-        examples = [
-            cs["text"][:100] + "..." if len(cs["text"]) > 100 else cs["text"]
-            for cs in complex_sentences[:2]
-        ]
+        sentences = get_doc_features(doc).sentences
+        texts = [sentences[i].text for i in complex_sentences[:2]]
+        examples = [text[:100] + "..." if len(text) > 100 else text for text in texts]
         examples_str = "\n".join([f'- "{ex}"' for ex in examples])
 
         description = f"""A clareza estrutural do texto pode ser aprimorada simplificando estruturas sintáticas complexas.
@@ -960,14 +925,17 @@ Recomendações:
         "description": description,
         "priority": "high" if metric_info["score"] < 65 else "medium",
         "potential_improvement": min(10, 80 - metric_info["score"]) / 2 + 5,
-        "affected_segments": [
-            cs["index"] for cs in complex_sentences[:5]
-        ],  # Limit to first 5
+        "affected_segments": complex_sentences[:5],  # Limit to first 5
     }
 
 
+@profiled("recommendation")
 def recommend_lexical_complexity(
-    doc: spacy.tokens.Doc, metric_info: Dict[str, Any], domain: str, audience: str
+    doc: spacy.tokens.Doc,
+    metric_info: Dict[str, Any],
+    domain: str,
+    genre: str,
+    audience: str = "Acadêmico",
 ) -> Dict[str, Any]:
     """Generate recommendation for improving lexical complexity"""
     # Determine if complexity is too high or too low for audience
@@ -1040,8 +1008,13 @@ Recomendações para otimização:
     }
 
 
+@profiled("recommendation")
 def recommend_syntactic_complexity(
-    doc: spacy.tokens.Doc, metric_info: Dict[str, Any], domain: str, genre: str
+    doc: spacy.tokens.Doc,
+    metric_info: Dict[str, Any],
+    domain: str,
+    genre: str,
+    audience: str = "Acadêmico",
 ) -> Dict[str, Any]:
     """Generate recommendation for improving syntactic complexity"""
     score = metric_info["score"]
@@ -1127,8 +1100,13 @@ Recomendações para otimização:
     }
 
 
+@profiled("recommendation")
 def recommend_informational_density(
-    doc: spacy.tokens.Doc, metric_info: Dict[str, Any], domain: str, genre: str
+    doc: spacy.tokens.Doc,
+    metric_info: Dict[str, Any],
+    domain: str,
+    genre: str,
+    audience: str = "Acadêmico",
 ) -> Dict[str, Any]:
     """Generate recommendation for improving informational density"""
     score = metric_info["score"]
@@ -0,0 +1,239 @@
+"""
+Per-sentence quality scores of a processed document.
+
+The sentence-level counterparts of the document metrics are computed as
+arrays from the same cached inputs (feature table, syntax profile,
+sentence embeddings and marker matches), so after ``calculate_metrics``
+they cost a handful of ``reduceat`` calls. Each measure is mapped to a
+0-100 score with the thresholds of the matching document metric:
+
+* length: words per sentence (structural clarity: 8-30 words is optimal)
+* depth: maximum dependency depth (syntactic complexity: up to 5)
+* connectives: discourse connectives in the sentence (structural cohesion)
+* similarity: cosine similarity to the previous sentence (topic
+  continuity: optimal around 0.65)
+* references: share of pronouns/determiners with a nominal antecedent
+  among their ancestors (referential cohesion)
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from utils.embeddings import get_sentence_embeddings
+from utils.features import NOUN_POS, DocFeatures, get_doc_features
+from utils.syntax import get_syntax_profile
+
+# Key under which the scores are cached in ``Doc.user_data``
+SENTENCE_SCORES_KEY = "lexa_sentence_scores"
+
+# Score columns in display order, with their labels
+SENTENCE_MEASURES = (
+    ("length", "Comprimento"),
+    ("depth", "Profundidade"),
+    ("connectives", "Conectivos"),
+    ("similarity", "Continuidade"),
+    ("references", "Referência"),
+)
+
+
+@dataclass
+class SentenceScores:
+    """Raw per-sentence measures and their 0-100 scores."""
+
+    starts: np.ndarray
+    words: np.ndarray
+    max_depth: np.ndarray
+    connectives: np.ndarray
+    similarity: np.ndarray
+    references: np.ndarray
+    clear_references: np.ndarray
+    scores: np.ndarray
+
+    @property
+    def n_sents(self) -> int:
+        """Number of sentences."""
+        return len(self.words)
+
+    def downsample(self, max_rows: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Average the scores of consecutive sentences into at most ``max_rows`` bins.
+
+        Args:
+            max_rows (int): Maximum number of rows
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: First sentence of every bin and
+            the (bins x measures) matrix of mean scores (NaN where no
+            sentence of the bin has a score)
+        """
+        if self.n_sents <= max_rows:
+            return np.arange(self.n_sents), self.scores
+
+        bin_starts = np.unique(
+            np.linspace(0, self.n_sents, max(1, max_rows), endpoint=False).astype(
+                np.int64
+            )
+        )
+        defined = ~np.isnan(self.scores)
+        totals = np.add.reduceat(np.where(defined, self.scores, 0.0), bin_starts)
+        counts = np.add.reduceat(defined.astype(np.int64), bin_starts)
+        means = np.divide(
+            totals, counts, out=np.full(totals.shape, np.nan), where=counts > 0
+        )
+        return bin_starts, means
+
+
+def _length_scores(words: np.ndarray) -> np.ndarray:
+    """Sentence length score: optimal between 8 and 30 words."""
+    words = words.astype(np.float64)
+    return 100 * np.where(
+        words < 8,
+        words / 8,
+        np.where(words > 30, np.clip(1 - (words - 30) / 30, 0, 1), 1.0),
+    )
+
+
+def _depth_scores(max_depth: np.ndarray) -> np.ndarray:
+    """Parse depth score: full up to depth 5, zero from depth 10."""
+    return 100 * np.clip(1 - (max_depth - 5) / 5, 0, 1)
+
+
+def build_sentence_scores(doc, features: DocFeatures) -> SentenceScores:
+    """
+    Compute the per-sentence measures and scores of a document.
+
+    Args:
+        doc (spacy.tokens.Doc): Processed spaCy document
+        features (DocFeatures): Feature table of the document
+
+    Returns:
+        SentenceScores: One row per sentence
+    """
+    # Imported here: the metrics module owns the compiled marker matcher
+    from utils.metrics import get_marker_matches
+
+    profile = get_syntax_profile(doc, features)
+    starts = profile.sent_starts
+    # The profile has no sentence rows for a document without tokens
+    n_sents = len(profile.sent_max_depth)
+
+    pos = np.asarray(features.pos, dtype=object)
+    dep = np.asarray(features.dep, dtype=object)
+    is_word = ~(
+        np.asarray(features.is_punct, dtype=bool)
+        | np.asarray(features.is_space, dtype=bool)
+    )
+
+    # Pronouns/determiners and whether a noun is among their ancestors
+    is_reference = np.isin(pos, ("PRON", "DET")) & ~np.isin(dep, ("ROOT", ""))
+    has_antecedent = profile.ancestor_counts(np.isin(pos, NOUN_POS)) > 0
+
+    if n_sents:
+        words = np.add.reduceat(is_word.astype(np.int64), starts)
+        references = np.add.reduceat(is_reference.astype(np.int64), starts)
+        clear_references = np.add.reduceat(
+            (is_reference & has_antecedent).astype(np.int64), starts
+        )
+    else:
+        words = references = clear_references = np.zeros(0, dtype=np.int64)
+
+    # Connectives, assigned to sentences by character offset
+    sent_start_chars = np.asarray(
+        [getattr(sent, "start_char", 0) for sent in features.sentences[:n_sents]],
+        dtype=np.int64,
+    )
+    matches = get_marker_matches(features)
+    connective_starts = [
+        start
+        for category, spans in matches.spans.items()
+        if category[0] == "conectivos"
+        for start, _, _ in spans
+    ]
+    connective_sents = np.searchsorted(
+        sent_start_chars, np.asarray(connective_starts, dtype=np.int64), side="right"
+    )
+    connectives = np.bincount(
+        np.maximum(connective_sents - 1, 0),
+        minlength=n_sents,
+    ).astype(np.int64)[:n_sents]
+
+    # Similarity to the previous sentence (NaN without vectors)
+    similarity = np.full(n_sents, np.nan)
+    embeddings = get_sentence_embeddings(doc, features)
+    if embeddings is not None and n_sents > 1:
+        similarity[1:] = embeddings.adjacent_similarity(default=np.nan)
+
+    scores = np.column_stack(
+        [
+            _length_scores(words),
+            _depth_scores(profile.sent_max_depth),
+            100 * np.minimum(1.0, 0.5 + 0.5 * connectives),
+            np.clip(100 - np.abs(similarity - 0.65) * 150, 0, 100),
+            # Sentences without references have nothing ambiguous
+            100
+            * np.divide(
+                clear_references,
+                references,
+                out=np.ones(n_sents),
+                where=references > 0,
+            ),
+        ]
+    ).reshape(n_sents, len(SENTENCE_MEASURES))
+
+    return SentenceScores(
+        starts=starts,
+        words=words,
+        max_depth=profile.sent_max_depth,
+        connectives=connectives,
+        similarity=similarity,
+        references=references,
+        clear_references=clear_references,
+        scores=scores,
+    )
+
+
+def get_sentence_scores(
+    doc, features: Optional[DocFeatures] = None
+) -> SentenceScores:
+    """
+    Return the per-sentence scores of ``doc``, computing them at most once.
+
+    The scores are cached in ``doc.user_data`` when the document supports it.
+
+    Args:
+        doc (spacy.tokens.Doc): Processed spaCy document
+        features (Optional[DocFeatures]): Precomputed feature table
+
+    Returns:
+        SentenceScores: One row per sentence
+    """
+    user_data = getattr(doc, "user_data", None)
+    if isinstance(user_data, dict) and SENTENCE_SCORES_KEY in user_data:
+        return user_data[SENTENCE_SCORES_KEY]
+
+    scores = build_sentence_scores(doc, get_doc_features(doc, features))
+    if isinstance(user_data, dict):
+        user_data[SENTENCE_SCORES_KEY] = scores
+    return scores
+
+
+def sentence_labels(bin_starts: np.ndarray, n_sents: int) -> List[str]:
+    """
+    Row labels for (possibly downsampled) sentence scores.
+
+    Args:
+        bin_starts (np.ndarray): First sentence of every row
+        n_sents (int): Total number of sentences
+
+    Returns:
+        List[str]: "S12" for single sentences, "S12-S40" for bins
+    """
+    ends = np.append(bin_starts[1:], n_sents)
+    return [
+        f"S{start + 1}" if end - start == 1 else f"S{start + 1}-S{end}"
+        for start, end in zip(bin_starts.tolist(), ends.tolist())
+    ]
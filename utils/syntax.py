@@ -0,0 +1,164 @@
+"""
+Memoized syntactic measures of a processed document.
+
+Token depths, clausal nesting and dependency distances are derived from
+the head column of the shared feature table with vectorized pointer
+jumping (O(n log depth) array operations instead of walking every head
+chain in Python), then reduced per sentence. The resulting
+``SyntaxProfile`` is cached in ``Doc.user_data`` so every syntactic
+metric and recommendation reuses it.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from utils.features import DocFeatures, get_doc_features
+
+# Dependency labels that open a subordinate clause
+CLAUSAL_DEPS = ("ccomp", "xcomp", "advcl", "acl")
+
+# Key under which the profile is cached in ``Doc.user_data``
+SYNTAX_KEY = "lexa_syntax"
+
+
+@dataclass
+class SyntaxProfile:
+    """Per-token and per-sentence syntactic arrays of a document."""
+
+    # Head of every token, ``n_tokens`` for sentence roots
+    parent: np.ndarray
+    depth: np.ndarray
+    clause_depth: np.ndarray
+    dep_distance: np.ndarray
+    has_head: np.ndarray
+    sent_starts: np.ndarray
+    sent_max_depth: np.ndarray
+    sent_mean_depth: np.ndarray
+    sent_mean_distance: np.ndarray
+    sent_max_clause_depth: np.ndarray
+
+    @property
+    def distances(self) -> np.ndarray:
+        """Dependency distances of the tokens attached to a head."""
+        return self.dep_distance[self.has_head]
+
+    def ancestor_counts(self, mask: np.ndarray) -> np.ndarray:
+        """
+        Count, for every token, the ancestors for which ``mask`` is true.
+
+        Args:
+            mask (np.ndarray): Boolean value per token
+
+        Returns:
+            np.ndarray: Number of matching tokens on each token's head chain
+        """
+        mask = np.asarray(mask, dtype=np.int64)
+        return _path_sums(self.parent, mask) - mask
+
+
+def _path_sums(parent: np.ndarray, weight: np.ndarray) -> np.ndarray:
+    """
+    Sum ``weight`` along each token's path to its root by pointer jumping.
+
+    ``parent`` holds the parent index of every token, or ``len(parent)``
+    for roots.
+    """
+    n = len(parent)
+    # A sentinel node (index n) with zero weight absorbs the roots
+    nxt = np.append(parent, n)
+    total = np.append(weight, 0).astype(np.int64)
+
+    # Each round doubles the covered path length; malformed (cyclic) head
+    # chains cannot loop forever
+    for _ in range(max(1, n).bit_length() + 1):
+        if np.all(nxt == n):
+            break
+        total = total + total[nxt]
+        nxt = nxt[nxt]
+
+    return total[:n]
+
+
+def build_syntax_profile(features: DocFeatures) -> SyntaxProfile:
+    """
+    Compute the syntactic arrays of a document from its feature table.
+
+    Args:
+        features (DocFeatures): Columnar feature table
+
+    Returns:
+        SyntaxProfile: Depths, clausal nesting and dependency distances
+    """
+    n = features.n_tokens
+    positions = np.arange(n, dtype=np.int64)
+    head = np.asarray(features.head, dtype=np.int64).reshape(n)
+    dep = np.asarray(features.dep, dtype=object).reshape(n)
+
+    has_head = head != positions
+    is_root = ~has_head | (dep == "ROOT")
+    parent = np.where(is_root, n, head)
+
+    depth = _path_sums(parent, ~is_root)
+    clause_depth = _path_sums(parent, np.isin(dep, CLAUSAL_DEPS) & ~is_root)
+    dep_distance = np.where(has_head, np.abs(positions - head), 0)
+
+    sent_starts = np.asarray(
+        [start for start, _ in features.sent_bounds], dtype=np.int64
+    )
+    if n and sent_starts.size:
+        sent_lengths = np.diff(np.append(sent_starts, n))
+        sent_max_depth = np.maximum.reduceat(depth, sent_starts)
+        sent_mean_depth = np.add.reduceat(depth, sent_starts) / sent_lengths
+        sent_max_clause_depth = np.maximum.reduceat(clause_depth, sent_starts)
+        with_head = np.add.reduceat(has_head.astype(np.int64), sent_starts)
+        sent_mean_distance = np.divide(
+            np.add.reduceat(dep_distance, sent_starts),
+            with_head,
+            out=np.zeros(len(sent_starts)),
+            where=with_head > 0,
+        )
+    else:
+        sent_max_depth = sent_max_clause_depth = np.zeros(0, dtype=np.int64)
+        sent_mean_depth = sent_mean_distance = np.zeros(0)
+
+    return SyntaxProfile(
+        parent=parent,
+        depth=depth,
+        clause_depth=clause_depth,
+        dep_distance=dep_distance,
+        has_head=has_head,
+        sent_starts=sent_starts,
+        sent_max_depth=sent_max_depth,
+        sent_mean_depth=sent_mean_depth,
+        sent_mean_distance=sent_mean_distance,
+        sent_max_clause_depth=sent_max_clause_depth,
+    )
+
+
+def get_syntax_profile(
+    doc, features: Optional[DocFeatures] = None
+) -> SyntaxProfile:
+    """
+    Return the syntactic profile of ``doc``, computing it at most once.
+
+    The profile is cached in ``doc.user_data`` when the document supports it.
+
+    Args:
+        doc (spacy.tokens.Doc): Processed spaCy document
+        features (Optional[DocFeatures]): Precomputed feature table
+
+    Returns:
+        SyntaxProfile: Depths, clausal nesting and dependency distances
+    """
+    user_data = getattr(doc, "user_data", None)
+    if isinstance(user_data, dict) and SYNTAX_KEY in user_data:
+        return user_data[SYNTAX_KEY]
+
+    profile = build_syntax_profile(get_doc_features(doc, features))
+    if isinstance(user_data, dict):
+        user_data[SYNTAX_KEY] = profile
+    return profile
@@ -0,0 +1,137 @@
+"""
+Pre-tokenized view of a raw text for the regex-based metric paths.
+
+``TextView.build`` scans the text once and keeps its marker tokens,
+lowercase words, sentence and paragraph offsets. Metrics that work
+without a spaCy ``Doc`` read these instead of re-running
+``re.findall``/``re.split``/``str.lower`` on the whole text, and count
+marker phrases on whole-word boundaries with a compiled
+:class:`~utils.markers.MarkerMatcher` rather than substring ``in``
+checks (so "assim" no longer matches inside "assimilar").
+"""
+
+import re
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+from utils.markers import MarkerMatcher, MarkerMatches, tokenize
+
+# Sentence bodies between terminal punctuation, as ``re.split(r"[.!?]+")``
+_SENTENCE_RE = re.compile(r"[^.!?]+")
+
+# Paragraph separator, as ``text.split("\n\n")``
+_PARAGRAPH_SEP = "\n\n"
+
+
+@dataclass
+class TextView:
+    """Tokens, words, sentences and paragraphs of a text, computed once."""
+
+    text: str
+    tokens: List[Tuple[str, int, int]]
+    words: List[str]
+    word_starts: List[int]
+    sentence_spans: List[Tuple[int, int]]
+    paragraph_spans: List[Tuple[int, int]]
+    _matches: Dict[int, MarkerMatches] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def build(cls, text: str) -> "TextView":
+        """
+        Tokenize ``text`` once.
+
+        Args:
+            text (str): Input text
+
+        Returns:
+            TextView: View of the text
+        """
+        tokens = tokenize(text)
+        # Word tokens are exactly the ``\b\w+\b`` matches of the text
+        word_tokens = [
+            (token, start)
+            for token, start, end in tokens
+            if end - start > 1 or token.isalnum() or token == "_"
+        ]
+
+        return cls(
+            text=text,
+            tokens=tokens,
+            words=[token for token, _ in word_tokens],
+            word_starts=[start for _, start in word_tokens],
+            sentence_spans=_stripped_spans(
+                text, ((m.start(), m.end()) for m in _SENTENCE_RE.finditer(text))
+            ),
+            paragraph_spans=_stripped_spans(text, _split_spans(text, _PARAGRAPH_SEP)),
+        )
+
+    @property
+    def word_count(self) -> int:
+        """Number of ``\\w+`` words."""
+        return len(self.words)
+
+    @property
+    def sentences(self) -> List[str]:
+        """Non-empty sentences, stripped."""
+        return [self.text[start:end] for start, end in self.sentence_spans]
+
+    @property
+    def paragraphs(self) -> List[str]:
+        """Non-empty paragraphs (blank-line separated), stripped."""
+        return [self.text[start:end] for start, end in self.paragraph_spans]
+
+    def paragraph_words(self, index: int) -> List[str]:
+        """
+        Lowercase words of paragraph ``index``.
+
+        Args:
+            index (int): Paragraph position in ``paragraphs``
+
+        Returns:
+            List[str]: Slice of ``words`` inside the paragraph
+        """
+        start, end = self.paragraph_spans[index]
+        return self.words[
+            bisect_left(self.word_starts, start) : bisect_left(self.word_starts, end)
+        ]
+
+    def match(self, matcher: MarkerMatcher) -> MarkerMatches:
+        """
+        Match ``matcher`` against the text, once per matcher.
+
+        Args:
+            matcher (MarkerMatcher): Compiled marker lexicons
+
+        Returns:
+            MarkerMatches: Whole-word, case-insensitive matches
+        """
+        matches = self._matches.get(id(matcher))
+        if matches is None:
+            matches = self._matches[id(matcher)] = matcher.match_tokens(self.tokens)
+        return matches
+
+
+def _split_spans(text: str, separator: str):
+    """Yield the (start, end) spans of ``text.split(separator)``."""
+    start = 0
+    while True:
+        end = text.find(separator, start)
+        if end < 0:
+            yield start, len(text)
+            return
+        yield start, end
+        start = end + len(separator)
+
+
+def _stripped_spans(text: str, spans) -> List[Tuple[int, int]]:
+    """Strip whitespace from every span and drop the empty ones."""
+    stripped = []
+    for start, end in spans:
+        while start < end and text[start].isspace():
+            start += 1
+        while end > start and text[end - 1].isspace():
+            end -= 1
+        if start < end:
+            stripped.append((start, end))
+    return stripped
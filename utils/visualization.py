@@ -7,6 +7,13 @@ from typing import Dict, List, Any
 from streamlit_elements import elements, dashboard, mui, nivo
 
 from config import METRIC_DIMENSIONS
+from utils.features import get_doc_features
+from utils.highlight import render_highlighted_html
+from utils.sentence_scores import (
+    SENTENCE_MEASURES,
+    get_sentence_scores,
+    sentence_labels,
+)
 
 
 def create_radar_chart(
@@ -499,58 +506,24 @@ def create_dimension_bar_chart(dimension_scores: Dict[str, float]):
     return fig
 
 
-def highlight_text(text: str, annotations: List[Dict[str, Any]]):
+def highlight_text(text: str, annotations, start: int = 0, end: int = None):
     """
     Create HTML with highlighted text based on annotations.
 
+    Overlapping annotations are merged into stacked segments (see
+    ``utils.highlight``); text and tooltips are escaped.
+
     Args:
         text: Original text
-        annotations: List of annotation dictionaries
+        annotations: Annotation table, or list of annotation dictionaries
+        start: Start offset of the window to render
+        end: End offset of the window to render (end of the text when
+            omitted)
 
     Returns:
         str: HTML string with highlighted text
     """
-    if not annotations:
-        return text
-
-    # Sort annotations by start position
-    sorted_annotations = sorted(annotations, key=lambda x: x["span_start"])
-
-    # Build HTML with highlights
-    html_parts = []
-    last_pos = 0
-
-    for annotation in sorted_annotations:
-        start = annotation["span_start"]
-        end = annotation["span_end"]
-
-        # Text before the annotation
-        if start > last_pos:
-            html_parts.append(text[last_pos:start])
-
-        # Severity color mapping
-        severity = annotation.get("severity", "low")
-        color_map = {
-            "high": "#b91c1c",  # Dark red for better contrast
-            "medium": "#b45309",  # Dark orange for better contrast
-            "low": "#047857",  # Dark green for better contrast
-        }
-        bg_color = color_map.get(severity, "#f3f4f6")
-
-        # Highlighted text with tooltip
-        tooltip = annotation.get("description", "")
-
-        html_parts.append(
-            f'<span style="background-color: {bg_color}; padding: 0 2px; border-radius: 2px;" title="{tooltip}">{text[start:end]}</span>'
-        )
-
-        last_pos = end
-
-    # Add remaining text
-    if last_pos < len(text):
-        html_parts.append(text[last_pos:])
-
-    return "".join(html_parts)
+    return render_highlighted_html(text, annotations, start, end)
 
 
 def create_timeline_chart(metrics_history: List[Dict[str, Any]]):
@@ -1236,81 +1209,64 @@ def create_comparison_heatmap(
     return fig
 
 
-def create_text_heatmap(doc, metrics: Dict[str, Any]):
+def create_text_heatmap(doc, max_rows: int = 60):
     """
-    Create a heatmap visualization of the text by sentences, highlighting areas needing improvement.
+    Create a heatmap of the sentence-level quality scores of the text.
+
+    Every column is one sentence-level measure (see
+    ``utils.sentence_scores``) and every row a sentence. Long texts are
+    not truncated: consecutive sentences are averaged into at most
+    ``max_rows`` rows, labelled with the sentence range they cover.
 
     Args:
         doc: spaCy document containing the processed text
-        metrics: Dictionary containing the metrics results
+        max_rows: Maximum number of heatmap rows
 
     Returns:
-        plotly.graph_objects.Figure: Text heatmap figure
+        plotly.graph_objects.Figure: Text heatmap figure (an empty figure
+        with a notice when the document has no sentences)
     """
-    # Get sentences from the document
-    sentences = [sent.text for sent in doc.sents]
-
-    # Limit to a maximum of 50 sentences for better visualization
-    if len(sentences) > 50:
-        sentences = sentences[:50]
-
-    # Find the 3 dimensions with lowest scores
-    dim_scores = {}
-    for dim_key, dim_data in metrics.get("dimensions", {}).items():
-        if isinstance(dim_data, dict) and "score" in dim_data:
-            score = dim_data["score"]
-        else:
-            # Calculate average if the dimension contains multiple metrics
-            scores = [
-                m.get("score", 0) for m in dim_data.values() if isinstance(m, dict)
-            ]
-            score = sum(scores) / len(scores) if scores else 0
-
-        dim_scores[dim_key] = score
-
-    # Sort dimensions by score and get the 3 lowest
-    problem_dimensions = sorted(dim_scores.items(), key=lambda x: x[1])[:3]
-    problem_dim_keys = [d[0] for d in problem_dimensions]
-
-    # Simulate sentence-level evaluations for the problem dimensions
-    # In a real system, this would use actual sentence-level metrics
-    sentence_scores = []
-
-    for i, sent in enumerate(sentences):
-        # Create a score for each problem dimension
-        # This is a simulation - real implementation would use actual metrics
-        sent_scores = {}
-        for dim_key in problem_dim_keys:
-            # Base the score on the overall dimension score
-            base_score = dim_scores[dim_key]
-
-            # Add some variation based on sentence index (just for demonstration)
-            variation = np.sin(i * 0.5) * 15
-
-            # Ensure the score stays within 0-100 range
-            score = max(0, min(100, base_score + variation))
-            sent_scores[dim_key] = score
-
-        sentence_scores.append(sent_scores)
-
-    # Create a DataFrame for the heatmap
-    df_data = []
-    for i, sent_scores in enumerate(sentence_scores):
-        for dim_key, score in sent_scores.items():
-            dim_name = METRIC_DIMENSIONS[dim_key]["name"]
-            df_data.append(
-                {"Sentença": f"S{i+1}", "Dimensão": dim_name, "Pontuação": score}
-            )
+    sentence_scores = get_sentence_scores(doc)
+    if not sentence_scores.n_sents:
+        fig = go.Figure()
+        fig.add_annotation(
+            text="Nenhuma sentença disponível para análise",
+            xref="paper",
+            yref="paper",
+            x=0.5,
+            y=0.5,
+            showarrow=False,
+            font=dict(color="white", size=16),
+        )
+        fig.update_layout(
+            paper_bgcolor="rgba(0, 0, 0, 0)",
+            plot_bgcolor="rgba(0, 0, 0, 0)",
+            xaxis=dict(visible=False),
+            yaxis=dict(visible=False),
+            height=300,
+        )
+        return fig
 
-    df = pd.DataFrame(df_data)
+    sentences = get_doc_features(doc).sentences
+    row_starts, matrix = sentence_scores.downsample(max_rows)
+    row_labels = sentence_labels(row_starts, sentence_scores.n_sents)
+    measure_names = [name for _, name in SENTENCE_MEASURES]
 
-    # Pivot the DataFrame for the heatmap
-    df_pivot = df.pivot(index="Sentença", columns="Dimensão", values="Pontuação")
+    # Hover: the sentence itself, or the first sentence of a bin
+    hover = []
+    for row, start in enumerate(row_starts.tolist()):
+        sent = sentences[start].text
+        display_sent = sent[:100] + "..." if len(sent) > 100 else sent
+        hover.append(
+            [f"<b>{row_labels[row]}:</b><br>{display_sent}"] * len(measure_names)
+        )
 
     # Create the heatmap
     fig = px.imshow(
-        df_pivot,
-        labels=dict(x="Dimensão", y="Sentença", color="Pontuação"),
+        matrix,
+        x=measure_names,
+        y=row_labels,
+        labels=dict(x="Medida", y="Sentença", color="Pontuação"),
         color_continuous_scale=[
             [0, "rgba(255, 127, 127, 0.8)"],  # Red for low scores
             [0.4, "rgba(255, 235, 133, 0.8)"],  # Yellow for medium scores
@@ -1321,23 +1277,21 @@ def create_text_heatmap(doc, metrics: Dict[str, Any]):
         zmax=100,
         aspect="auto",
     )
+    fig.update_traces(
+        customdata=hover,
+        hovertemplate="%{customdata}<br>%{x}: %{z:.0f}<extra></extra>",
+    )
 
     # Add text annotations for scores
-    for i in range(len(df_pivot.index)):
-        for j in range(len(df_pivot.columns)):
-            try:
-                value = df_pivot.iloc[i, j]
-                if not pd.isna(value):
-                    fig.add_annotation(
-                        x=j,
-                        y=i,
-                        text=f"{value:.0f}",
-                        showarrow=False,
-                        font=dict(color="white" if value < 70 else "black", size=9),
-                    )
-            except IndexError:
-                # Skip if indices are out of range
-                continue
+    for i, j in zip(*np.nonzero(~np.isnan(matrix))):
+        value = matrix[i, j]
+        fig.add_annotation(
+            x=measure_names[j],
+            y=row_labels[i],
+            text=f"{value:.0f}",
+            showarrow=False,
+            font=dict(color="white" if value < 70 else "black", size=9),
+        )
 
     # Update layout
     fig.update_layout(
@@ -1364,37 +1318,17 @@ def create_text_heatmap(doc, metrics: Dict[str, Any]):
         xaxis=dict(tickfont=dict(color="white")),
         yaxis=dict(tickfont=dict(color="white"), title="Índice da Sentença"),
         height=max(
-            400, min(800, len(sentences) * 15 + 200)
-        ),  # Dynamic height based on number of sentences
+            400, min(800, len(row_labels) * 15 + 200)
+        ),  # Dynamic height based on number of rows
     )
 
-    # Add sentence tooltip information
-    for i, sent in enumerate(sentences):
-        # Truncate sentences for hover display
-        display_sent = sent[:100] + "..." if len(sent) > 100 else sent
-        row = df_pivot.index[i] if i < len(df_pivot.index) else None
-
-        if row:
-            # Add hover information for each sentence
-            fig.add_trace(
-                go.Scatter(
-                    x=[None],
-                    y=[None],
-                    mode="markers",
-                    marker=dict(size=0),
-                    hoverinfo="text",
-                    text=f"<b>Sentença {i+1}:</b><br>{display_sent}",
-                    showlegend=False,
-                )
-            )
-
     # Add explanation annotation
     fig.add_annotation(
         x=0.5,
         y=-0.15,
         xref="paper",
         yref="paper",
-        text="Esta visualização mostra as pontuações para as três dimensões mais problemáticas identificadas no texto.<br>Vermelho indica áreas que precisam de melhorias, verde indica pontos fortes.",
+        text="Esta visualização mostra as pontuações de cada sentença (ou grupo de sentenças) em cinco medidas de qualidade.<br>Vermelho indica áreas que precisam de melhorias, verde indica pontos fortes.",
         showarrow=False,
         font=dict(color="white", size=12),
         align="center",